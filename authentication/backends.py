@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import users_cache
+
+User = get_user_model()
+
+
+def get_user_by_id(user_id):
+    user = users_cache.get(user_id)
+
+    if user is None:
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}).first()
+
+        if user is not None:
+            users_cache.set(user)
+
+    return user
+
+
+class RequestCachedJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates a request once, the result is stored on the Django
+    request and reused by the middleware stack and DRF views
+    """
+
+    result_attribute = "_jwt_authentication_result"
+
+    def authenticate(self, request):
+        django_request = getattr(request, "_request", request)
+
+        if not hasattr(django_request, self.result_attribute):
+            try:
+                result = super().authenticate(request)
+            except Exception as e:
+                result = e
+
+            setattr(django_request, self.result_attribute, result)
+
+        result = getattr(django_request, self.result_attribute)
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification")
+
+        user = get_user_by_id(user_id)
+
+        if user is None:
+            raise AuthenticationFailed("User not found",
+                                       code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive",
+                                       code="user_inactive")
+
+        return user
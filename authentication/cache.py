@@ -0,0 +1,24 @@
+from utils.cache import CacheNamespace
+
+
+class UsersCache(CacheNamespace):
+    """
+    Authenticated users rows by ids. Entries are deleted when the users
+    are saved or deleted and expire after JWT_USERS_CACHE_TTL seconds
+    (0 disables the cache)
+    """
+
+    def get(self, user_id):
+        if self.ttl <= 0:
+            return None
+
+        return super().get(user_id)
+
+    def set(self, user):
+        if self.ttl <= 0:
+            return
+
+        super().set((user.id,), user)
+
+
+users_cache = UsersCache("users:id", "JWT_USERS_CACHE_TTL")
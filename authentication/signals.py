@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import users_cache
+
+User = get_user_model()
+
+
+@receiver((post_save, post_delete), sender=User)
+def change_user(sender, instance, **kwargs):
+    users_cache.delete(instance.id)
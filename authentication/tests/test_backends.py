@@ -0,0 +1,66 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bans.cache import banned_users
+from bans.services import ban_user
+from utils.tests import APIViewTestCase
+
+
+class RequestCachedJWTAuthenticationTestCase(APIViewTestCase):
+    url = reverse("profile")
+
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.generate_jwt_auth_credentials(self.user)
+        )
+
+        banned_users.invalidate()
+
+    def count_queries_by_table(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+
+        queries = [q["sql"] for q in context.captured_queries]
+        return {
+            "users": len([q for q in queries if 'FROM "users"' in q]),
+            "bans": len([q for q in queries if 'FROM "bans"' in q])
+        }
+
+    @override_settings(BANS_VERSION_CHECK_INTERVAL=60, JWT_USERS_CACHE_TTL=0)
+    def test_user_is_loaded_once_per_request(self):
+        """
+        The middleware stack and DRF should share one authentication,
+        the ban check uses the banned users set
+        """
+        self.count_queries_by_table()
+        self.assertEqual(self.count_queries_by_table(),
+                         {"users": 1, "bans": 0})
+
+    def test_users_cache(self):
+        self.assertEqual(self.count_queries_by_table()["users"], 1)
+        self.assertEqual(self.count_queries_by_table()["users"], 0)
+
+        self.user.save()
+        self.assertEqual(self.count_queries_by_table()["users"], 1)
+
+    def test_ban_takes_effect_for_cached_user(self):
+        admin = self.UserModel.objects.create_superuser(
+            login="Admin", email="admin@gmail.com", password="pass")
+        self.count_queries_by_table()
+
+        ban_user(self.user, admin)
+        response = self.client.get(self.url)
+
+        self.unauthorized_client_error_response_test(response)
+
+    def test_request_with_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = self.client.get(self.url)
+
+        self.unauthorized_client_error_response_test(response)
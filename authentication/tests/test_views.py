@@ -1,6 +1,8 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from bans.cache import banned_users
 from bans.services import ban_user
 from utils.tests import APIViewTestCase
 
@@ -42,6 +44,19 @@ class CustomObtainTokenPairAPIViewTestCase(BaseTestCase):
         self.assertIn("access", response.data)
         self.assertIn("refresh", response.data)
 
+    @override_settings(BANS_VERSION_CHECK_INTERVAL=60)
+    def test_token_obtaining_number_of_queries(self):
+        """
+        Logging in reads the user and writes nothing
+        """
+        banned_users.invalidate()
+        banned_users.refresh()
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, self.credentials)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+
     def test_token_obtaining_by_inactive_user(self):
         """
         Token obtaining by inactive users should return a 403 error
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BansConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "bans"
+
+    def ready(self):
+        import bans.signals
@@ -0,0 +1,64 @@
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+
+from .models import Ban, BansVersion
+
+
+def get_bans_version():
+    return BansVersion.objects.filter(id=1).values_list(
+        "version", flat=True).first()
+
+
+class BannedUsersSet:
+    """
+    Process-local set of banned users ids. The set is reloaded when the
+    bans version changes, the version is checked at most once per
+    BANS_VERSION_CHECK_INTERVAL seconds, so bans made by other processes
+    take effect within this delay
+    """
+
+    def __init__(self):
+        self._ids = frozenset()
+        self._version = None
+        self._checked_at = None
+        self._lock = Lock()
+
+    @property
+    def check_interval(self):
+        return settings.BANS_VERSION_CHECK_INTERVAL
+
+    def _is_fresh(self):
+        return (self._checked_at is not None and
+                monotonic() - self._checked_at < self.check_interval)
+
+    def refresh(self):
+        if self._is_fresh():
+            return
+
+        with self._lock:
+            if self._is_fresh():
+                return
+
+            checked_at = monotonic()
+            # The version is read before the ids, so a change made in
+            # between is picked up again by the next check
+            version = get_bans_version()
+            if version is None or version != self._version:
+                self._ids = frozenset(
+                    Ban.objects.values_list("receiver_id", flat=True))
+                self._version = version
+
+            self._checked_at = checked_at
+
+    def contains(self, user_id):
+        self.refresh()
+        return user_id in self._ids
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = None
+
+
+banned_users = BannedUsersSet()
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:35
+
+from uuid import uuid4
+
+from django.db import migrations, models
+
+
+def create_version(apps, schema_editor):
+    BansVersion = apps.get_model("bans", "BansVersion")
+    BansVersion.objects.create(id=1, version=uuid4().hex)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bans', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BansVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=32)),
+            ],
+            options={
+                'db_table': 'bans_version',
+            },
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+    ]
@@ -31,3 +31,16 @@ class Ban(models.Model):
             raise Error("Admins cannot be banned")
 
         super(Ban, self).save(*args, **kwargs)
+
+
+class BansVersion(models.Model):
+    """
+    Single row, the version is replaced with a new random value whenever
+    the set of banned users changes. Unlike a counter it can't return to
+    a value a process has already seen after a rolled back transaction
+    """
+
+    version = models.CharField(max_length=32)
+
+    class Meta:
+        db_table = "bans_version"
@@ -1,14 +1,29 @@
-from .models import Ban
+from uuid import uuid4
 
+from django.db import transaction
 
+from .cache import banned_users
+from .models import Ban, BansVersion
+
+
+def bump_bans_version():
+    BansVersion.objects.update_or_create(
+        id=1, defaults={"version": uuid4().hex})
+    # Changes made by this process take effect immediately
+    transaction.on_commit(banned_users.invalidate)
+
+
+@transaction.atomic
 def ban_user(receiver, creator, reason=""):
+    # The bans version is bumped by the signals, in the same transaction
     return Ban.objects.create(receiver=receiver, creator=creator,
                               reason=reason)
 
 
+@transaction.atomic
 def unban_user(user):
     Ban.objects.get(receiver=user).delete()
 
 
 def check_if_user_is_banned(user):
-    return Ban.objects.all().filter(receiver=user).exists()
+    return banned_users.contains(user.id)
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Ban
+from .services import bump_bans_version
+
+
+@receiver(post_save, sender=Ban)
+def create_ban(sender, instance, created, **kwargs):
+    if created:
+        bump_bans_version()
+
+
+@receiver(post_delete, sender=Ban)
+def delete_ban(sender, instance, **kwargs):
+    bump_bans_version()
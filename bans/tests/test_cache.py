@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from utils.tests import ExtendedTestCase
+
+from ..cache import banned_users
+from ..models import Ban, BansVersion
+from ..services import ban_user, check_if_user_is_banned, unban_user
+
+
+@override_settings(BANS_VERSION_CHECK_INTERVAL=5)
+class BannedUsersSetTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.admin = self.UserModel.objects.create_superuser(
+            login="Admin", email="admin@gmail.com", password="pass")
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+
+        self.now = 1000
+        monotonic_patcher = patch("bans.cache.monotonic",
+                                  side_effect=lambda: self.now)
+        monotonic_patcher.start()
+        self.addCleanup(monotonic_patcher.stop)
+
+        banned_users.invalidate()
+
+    def ban_by_other_process(self):
+        """
+        Creates the ban and bumps the version without
+        notifying the banned users set of this process
+        """
+        Ban.objects.bulk_create(
+            [Ban(receiver=self.user, creator=self.admin)])
+        BansVersion.objects.filter(id=1).update(version="other")
+
+    def test_ban_takes_effect_within_check_interval(self):
+        self.assertFalse(check_if_user_is_banned(self.user))
+
+        self.ban_by_other_process()
+        self.now += 4
+        self.assertFalse(check_if_user_is_banned(self.user))
+
+        self.now += 1
+        self.assertTrue(check_if_user_is_banned(self.user))
+
+    def test_checks_are_served_from_memory(self):
+        check_if_user_is_banned(self.user)
+
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                check_if_user_is_banned(self.user)
+
+    def test_unchanged_version_does_not_reload_set(self):
+        check_if_user_is_banned(self.user)
+        self.now += 5
+
+        # Only the version is read
+        with self.assertNumQueries(1):
+            check_if_user_is_banned(self.user)
+
+    def test_ban_and_unban_by_this_process(self):
+        check_if_user_is_banned(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ban_user(self.user, self.admin)
+        self.assertTrue(check_if_user_is_banned(self.user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            unban_user(self.user)
+        self.assertFalse(check_if_user_is_banned(self.user))
+
+    def test_deleting_banned_user_bumps_version(self):
+        ban_user(self.user, self.admin)
+        version = BansVersion.objects.get(id=1).version
+
+        self.user.delete()
+        self.assertNotEqual(BansVersion.objects.get(id=1).version, version)
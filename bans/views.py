@@ -1,8 +1,10 @@
+from django.db.models import Q
 from rest_framework.response import Response
 from rest_framework.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
 from rest_framework.views import APIView
 
-from profiles.selectors import get_profile_by_user_login_or_404
+from users.search import get_users_by_login_substring
+from users.selectors import get_user_by_login_or_404
 from utils.exceptions import Forbidden403
 from utils.shortcuts import raise_400_based_on_serializer
 from utils.views import AdminRequiredAPIView, ListAPIViewMixin
@@ -10,7 +12,7 @@ from utils.views import AdminRequiredAPIView, ListAPIViewMixin
 from .models import Ban
 from .selectors import get_ban_object_by_login_or_404
 from .serializers import BannedUserSerializer, BanSerializer
-from .services import ban_user, check_if_user_is_banned, unban_user
+from .services import ban_user, unban_user
 
 
 class ListBannedUsersAPIView(AdminRequiredAPIView, ListAPIViewMixin):
@@ -22,12 +24,14 @@ class ListBannedUsersAPIView(AdminRequiredAPIView, ListAPIViewMixin):
     queryset = Ban.objects.all()
 
     def filter_queryset(self, queryset, kwargs):
+        if not kwargs["q"]:
+            return queryset
+
+        users_ids = get_users_by_login_substring(kwargs["q"]).values("id")
         return queryset.filter(
-            receiver__login__contains=kwargs["q"]
-        ) | queryset.filter(
-            creator__login__contains=kwargs["q"]
-        ) | queryset.filter(
-            reason__icontains=kwargs["q"]
+            Q(receiver_id__in=users_ids) |
+            Q(creator_id__in=users_ids) |
+            Q(reason__icontains=kwargs["q"])
         )
 
 
@@ -41,9 +45,11 @@ class BanAPIView(AdminRequiredAPIView, APIView):
         return Response(BannedUserSerializer(instance).data)
 
     def put(self, request, login):
-        receiver = get_profile_by_user_login_or_404(login).user
+        receiver = get_user_by_login_or_404(login)
 
-        if check_if_user_is_banned(receiver):
+        # Checked against the database, the banned users set
+        # can lag behind the bans made by other processes
+        if Ban.objects.filter(receiver=receiver).exists():
             instance = get_ban_object_by_login_or_404(login)
             serializer = BanSerializer(instance, request.data)
 
@@ -0,0 +1,4 @@
+# Processes check if the set of banned users has changed at most once
+# per interval(in seconds), so a ban takes effect within this delay
+BANS_VERSION_CHECK_INTERVAL = int(
+    environ.get("BANS_VERSION_CHECK_INTERVAL", 5))
@@ -0,0 +1,51 @@
+# Cache of the selectors, the authenticated users and the profile
+# responses, one of
+# locmem - memory of each process, for a single process, changes made
+# by the other processes(e.g. the image worker) are visible only after
+# the entries have expired
+# memcached - memcached server(s), requires pymemcache
+# redis - redis server, requires django-redis
+# or the dotted path of another cache backend. The workers invalidate the
+# entries of the web server, so deployments with workers need memcached
+# or redis, docker-compose runs a memcached container. The backend must
+# support atomic add(), which the recompute locks rely on
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+    "redis": "django_redis.cache.RedisCache",
+}
+
+CACHE_BACKEND = environ.get("CACHE_BACKEND", "locmem")
+
+# "host:port" of memcached, "redis://host:port/db" of redis
+CACHE_LOCATION = environ.get("CACHE_LOCATION", "")
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        "LOCATION": CACHE_LOCATION,
+        "KEY_PREFIX": environ.get("CACHE_KEY_PREFIX", "blog"),
+        "TIMEOUT": 300,
+    }
+}
+
+if CACHE_BACKEND == "locmem":
+    # When the limit is reached locmem evicts a third of the entries,
+    # versions of the namespaces included
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(environ.get("CACHE_MAX_ENTRIES", 10000))
+    }
+
+# Seconds to cache the results of the selectors(users ids by login, posts by
+# id, followers ids), the changes made through the models are visible at once
+SELECTORS_CACHE_TTL = int(environ.get("SELECTORS_CACHE_TTL", 60))
+
+# Expiration times are reduced by a random share of up to this fraction,
+# so entries cached together don't expire together
+CACHE_TTL_JITTER = 0.1
+
+# While an expired entry is recomputed by one process, the others wait for
+# it(at most this number of seconds) instead of querying the database too
+CACHE_RECOMPUTE_LOCK_TIMEOUT = 5
+
+CACHE_RECOMPUTE_POLL_INTERVAL = 0.05
@@ -11,3 +11,37 @@ EMAIL_HOST_USER = environ["EMAIL_HOST_USER"]
 EMAIL_HOST_PASSWORD = environ["EMAIL_HOST_PASSWORD"]
 
 EMAIL_VERIFICATION_CODE_LIFETIME = timedelta(minutes=15)
+
+# Emails are queued in the outbox and sent by the send_emails worker,
+# each batch is sent through one SMTP connection
+EMAIL_OUTBOX_BATCH_SIZE = 50
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# Delay before the first retry of a failed email, doubled after each attempt
+EMAIL_OUTBOX_RETRY_DELAY = timedelta(minutes=1)
+
+# Emails being sent longer than this are considered
+# abandoned by a crashed worker and sent again
+EMAIL_OUTBOX_TIMEOUT = timedelta(minutes=5)
+
+EMAIL_OUTBOX_WORKER_POLL_INTERVAL = 1
+
+# Timeout(in seconds) of the blocking SMTP operations
+EMAIL_TIMEOUT = 30
+
+# Interval(in seconds) between the removals of the expired
+# verification codes by the sweep_verification_codes command
+EMAIL_VERIFICATION_CODES_SWEEP_INTERVAL = 15 * 60
+
+EMAIL_VERIFICATION_CODES_SWEEP_BATCH_SIZE = 1000
+
+# Whether the verification codes are signed with SECRET_KEY instead of
+# being stored in the verification codes table(1-True, 0-False).
+# The stored codes are accepted in both modes
+EMAIL_VERIFICATION_STATELESS_CODES = bool(int(
+    environ.get("EMAIL_VERIFICATION_STATELESS_CODES", 0)))
+
+# Stateless codes are valid for EMAIL_VERIFICATION_CODE_LIFETIME
+# rounded up to a whole number of these windows
+EMAIL_VERIFICATION_CODE_WINDOW = timedelta(minutes=5)
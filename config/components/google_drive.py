@@ -1 +1,5 @@
 GOOGLE_DRIVE_STORAGE_JSON_KEY_FILE = BASE_DIR / "config" / "google_drive_api.json"
+
+# Address of a Drive API emulator, requests to it are not authorized.
+# Used by the benchmarks to run against a local fake server
+GOOGLE_DRIVE_API_ROOT_URL = environ.get("GOOGLE_DRIVE_API_ROOT_URL")
@@ -0,0 +1,49 @@
+# Uploaded images are processed by the process_image_jobs worker
+IMAGE_UPLOAD_JOB_MAX_ATTEMPTS = 3
+
+# Running jobs not finished within the timeout(in seconds)
+# are considered abandoned by a crashed worker and retried
+IMAGE_UPLOAD_JOB_TIMEOUT = 300
+
+IMAGE_UPLOAD_WORKER_POLL_INTERVAL = 1
+
+# Maximum number of images encoded, uploaded or deleted concurrently
+# by the worker and when the attachments of a post are deleted
+IMAGE_THREAD_POOL_SIZE = 5
+
+# Where the images files are stored, one of
+# profiles.services.storages.GoogleDriveStorage
+# profiles.services.storages.LocalStorage
+IMAGE_STORAGE_BACKEND = environ.get(
+    "IMAGE_STORAGE_BACKEND", "profiles.services.storages.GoogleDriveStorage")
+
+IMAGE_STORAGE_LOCAL_ROOT = Path(environ.get(
+    "IMAGE_STORAGE_LOCAL_ROOT", BASE_DIR / "media" / "images"))
+IMAGE_STORAGE_LOCAL_URL = environ.get(
+    "IMAGE_STORAGE_LOCAL_URL", "http://localhost:8000/api/v1/images/")
+
+# How the local files are sent: "" - by Django(sendfile is used
+# by the WSGI server if it supports it), "x-accel-redirect" - by nginx,
+# "x-sendfile" - by Apache or lighttpd
+IMAGE_STORAGE_LOCAL_SENDFILE = environ.get("IMAGE_STORAGE_LOCAL_SENDFILE", "")
+# The internal nginx location aliased to IMAGE_STORAGE_LOCAL_ROOT
+IMAGE_STORAGE_LOCAL_ACCEL_PREFIX = "/protected/images/"
+
+# Encoded images larger than this(in bytes) are
+# spooled to a temporary file instead of memory
+IMAGE_SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
+# Every uploaded image(except GIFs) is stored resized to fit into
+# a square with these sides(in pixels) in each of the formats.
+# The full size JPEG is used as the link of the image
+IMAGE_VARIANTS = {
+    "thumbnail": 96,
+    "medium": 480,
+    "full": 2048
+}
+IMAGE_VARIANTS_FORMATS = ("jpeg", "webp")
+
+# Uploaded files are accepted only if their header is one of these
+# formats and they don't have more pixels than IMAGE_MAX_PIXELS
+IMAGE_UPLOAD_FORMATS = ("JPEG", "PNG", "GIF", "WEBP")
+IMAGE_MAX_PIXELS = 50_000_000
@@ -12,3 +12,6 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
     "TOKEN_TYPE_CLAIM": "tokenType",
 }
+
+# Seconds to keep authenticated users in the cache(0 disables it)
+JWT_USERS_CACHE_TTL = int(environ.get("JWT_USERS_CACHE_TTL", 60))
@@ -0,0 +1,5 @@
+# Posts of authors with more followers than this limit are not copied
+# into the followers timelines, but pulled when the news are requested
+NEWS_TIMELINE_FAN_OUT_LIMIT = 5000
+
+NEWS_TIMELINE_BATCH_SIZE = 1000
@@ -0,0 +1,4 @@
+# Seconds to keep the rendered public profiles, entries of the previous
+# versions of a profile are never read and expire after this delay
+PROFILE_RESPONSES_CACHE_TTL = int(
+    environ.get("PROFILE_RESPONSES_CACHE_TTL", 300))
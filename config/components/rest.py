@@ -3,7 +3,7 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
     ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.backends.RequestCachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication"
     ),
     "EXCEPTION_HANDLER": "utils.exceptions.custom_exception_handler",
@@ -2,7 +2,8 @@ from django.contrib.auth.middleware import get_user
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.functional import SimpleLazyObject
 from rest_framework.request import Request
-from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from authentication.backends import RequestCachedJWTAuthentication
 
 
 def get_user_user_from_request(request):
@@ -11,7 +12,8 @@ def get_user_user_from_request(request):
     if user.is_authenticated:
         return user
     try:
-        user, _ = JWTAuthentication().authenticate(Request(request))
+        user, _ = RequestCachedJWTAuthentication().authenticate(
+            Request(request))
         if user is not None:
             return user
     except Exception:
@@ -9,11 +9,16 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 base_settings = (
     "components/common.py",
     "components/database.py",
+    "components/cache.py",
     "components/cors.py",
     "components/google_drive.py",
+    "components/images.py",
     "components/rest.py",
     "components/email.py",
-    "components/jwt.py"
+    "components/jwt.py",
+    "components/news.py",
+    "components/bans.py",
+    "components/profiles.py"
 )
 
 include(*base_settings)
@@ -5,6 +5,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/token/", include("authentication.urls")),
     path("api/v1/profile/", include("profiles.urls")),
+    path("api/v1/images/", include("profiles.images_urls")),
     path("api/v1/profile/followers/", include("followers.followers_urls")),
     path("api/v1/profile/following/", include("followers.following_urls")),
     path("api/v1/users/", include("users.urls")),
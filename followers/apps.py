@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class FollowingConfig(AppConfig):
     name = "followers"
+
+    def ready(self):
+        import followers.signals
@@ -0,0 +1,4 @@
+from utils.cache import CacheNamespace
+
+# Lists of the followers and followings ids by the users ids
+followers_ids = CacheNamespace("followers:ids", "SELECTORS_CACHE_TTL")
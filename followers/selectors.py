@@ -1,12 +1,16 @@
-def get_user_followers_ids_list(user):
-    followers = user.followers.only("follower_user")
-    followers_ids = [i.follower_user.id for i in list(followers)]
+from .cache import followers_ids
+from .models import Follower
 
-    return followers_ids
 
+def get_user_followers_ids_list(user_id):
+    return followers_ids.get_or_set(
+        ("followers", user_id), lambda: list(Follower.objects.filter(
+            following_user_id=user_id).values_list(
+            "follower_user_id", flat=True)))
 
-def get_user_followings_ids_list(user):
-    followings = user.following.only("following_user")
-    followings_ids = [i.following_user.id for i in list(followings)]
 
-    return followings_ids
+def get_user_followings_ids_list(user_id):
+    return followers_ids.get_or_set(
+        ("followings", user_id), lambda: list(Follower.objects.filter(
+            follower_user_id=user_id).values_list(
+            "following_user_id", flat=True)))
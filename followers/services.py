@@ -1,3 +1,7 @@
+from django.db import transaction
+
+from profiles.services.counters import decrement_profile_counter
+
 from .models import Follower
 
 
@@ -7,12 +11,20 @@ def is_following(user, target):
 
 
 def follow(user, target):
-    obj = Follower.objects.create(follower_user=user, following_user=target)
-    obj.save()
+    with transaction.atomic():
+        obj = Follower.objects.create(follower_user=user,
+                                      following_user=target)
 
     return obj
 
 
 def unfollow(user, target):
-    Follower.objects.filter(follower_user=user,
-                            following_user=target).delete()
+    with transaction.atomic():
+        # Only the request whose DELETE removed the row decrements
+        # the counters, a concurrent unfollow deletes nothing
+        deleted, _ = Follower.objects.filter(
+            follower_user=user, following_user=target).delete()
+
+        if deleted:
+            decrement_profile_counter(target.id, "followers_count")
+            decrement_profile_counter(user.id, "following_count")
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from profiles.models import Profile
+from profiles.services.counters import increment_profile_counter
+
+from .cache import followers_ids
+from .models import Follower
+
+User = get_user_model()
+
+
+def delete_cached_followers_ids(follower):
+    followers_ids.delete("followers", follower.following_user_id)
+    followers_ids.delete("followings", follower.follower_user_id)
+
+
+@receiver(post_save, sender=Follower)
+def create_follower(sender, instance, created, **kwargs):
+    if created:
+        increment_profile_counter(instance.following_user_id,
+                                  "followers_count")
+        increment_profile_counter(instance.follower_user_id,
+                                  "following_count")
+        delete_cached_followers_ids(instance)
+
+
+@receiver(post_delete, sender=Follower)
+def delete_follower(sender, instance, **kwargs):
+    delete_cached_followers_ids(instance)
+
+
+@receiver(pre_delete, sender=User)
+def delete_user_followers(sender, instance, **kwargs):
+    """
+    Followers of a deleted user are removed by the cascade,
+    unfollow decrements the counters of the other followers
+    """
+    Profile.objects.filter(
+        user__in=Follower.objects.filter(
+            follower_user=instance).values("following_user"),
+        followers_count__gt=0
+    ).update(followers_count=F("followers_count") - 1)
+    Profile.objects.filter(
+        user__in=Follower.objects.filter(
+            following_user=instance).values("follower_user"),
+        following_count__gt=0
+    ).update(following_count=F("following_count") - 1)
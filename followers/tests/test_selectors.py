@@ -0,0 +1,33 @@
+from utils.tests import ExtendedTestCase
+
+from ..selectors import (get_user_followers_ids_list,
+                         get_user_followings_ids_list)
+from ..services import follow, unfollow
+
+
+class FollowersIdsCacheTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.target = self.UserModel.objects.create_user(
+            login="Target", email="target@gmail.com", password="pass")
+
+    def test_ids_lists_are_cached(self):
+        get_user_followers_ids_list(self.target.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_followers_ids_list(self.target.id), [])
+
+    def test_ids_lists_are_invalidated(self):
+        self.assertEqual(get_user_followers_ids_list(self.target.id), [])
+        self.assertEqual(get_user_followings_ids_list(self.user.id), [])
+
+        follow(self.user, self.target)
+        self.assertEqual(get_user_followers_ids_list(self.target.id),
+                         [self.user.id])
+        self.assertEqual(get_user_followings_ids_list(self.user.id),
+                         [self.target.id])
+
+        unfollow(self.user, self.target)
+        self.assertEqual(get_user_followers_ids_list(self.target.id), [])
+        self.assertEqual(get_user_followings_ids_list(self.user.id), [])
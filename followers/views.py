@@ -1,8 +1,8 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from profiles.selectors import get_profile_by_user_login_or_404
 from users.mixins import ListUsersAPIViewMixin
+from users.selectors import get_user_by_login_or_404
 from utils.exceptions import BadRequest400, NotFound404
 from utils.views import LoginRequiredAPIView
 
@@ -17,7 +17,7 @@ class FollowersListAPIView(LoginRequiredAPIView, ListUsersAPIViewMixin):
     """
 
     def filter_queryset(self, queryset, kwargs):
-        followers_ids = get_user_followers_ids_list(self.request.user)
+        followers_ids = get_user_followers_ids_list(self.request.user.id)
         queryset_of_followers = queryset.filter(id__in=followers_ids)
 
         return super().filter_queryset(queryset_of_followers, kwargs)
@@ -29,7 +29,7 @@ class FollowingListAPIView(LoginRequiredAPIView, ListUsersAPIViewMixin):
     """
 
     def filter_queryset(self, queryset, kwargs):
-        followings_ids = get_user_followings_ids_list(self.request.user)
+        followings_ids = get_user_followings_ids_list(self.request.user.id)
         queryset_of_followings = queryset.filter(id__in=followings_ids)
 
         return super().filter_queryset(queryset_of_followings, kwargs)
@@ -43,13 +43,13 @@ class FollowingAPIView(LoginRequiredAPIView, APIView):
     """
 
     def get(self, request, login):
-        target = get_profile_by_user_login_or_404(login).user
+        target = get_user_by_login_or_404(login)
         return Response(data={
             "isFollowed": is_following(request.user, target)
         })
 
     def put(self, request, login):
-        target = get_profile_by_user_login_or_404(login).user
+        target = get_user_by_login_or_404(login)
 
         if login == request.user.login:
             raise BadRequest400("You cannot follow yourself")
@@ -62,7 +62,7 @@ class FollowingAPIView(LoginRequiredAPIView, APIView):
         })
 
     def delete(self, request, login):
-        target = get_profile_by_user_login_or_404(login).user
+        target = get_user_by_login_or_404(login)
 
         if not is_following(request.user, target):
             raise NotFound404("You are not yet followed this user")
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def backfill_timelines(apps, schema_editor):
+    Follower = apps.get_model("followers", "Follower")
+    Post = apps.get_model("posts", "Post")
+    TimelineEntry = apps.get_model("news", "TimelineEntry")
+
+    for follower in Follower.objects.all().iterator():
+        posts = Post.objects.filter(
+            author_id=follower.following_user_id
+        ).values_list("id", "created_at")
+
+        TimelineEntry.objects.bulk_create(
+            (TimelineEntry(user_id=follower.follower_user_id, post_id=post_id,
+                           author_id=follower.following_user_id,
+                           created_at=created_at)
+             for post_id, created_at in posts.iterator()),
+            batch_size=1000,
+            ignore_conflicts=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("followers", "0002_initial"),
+        ("news", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
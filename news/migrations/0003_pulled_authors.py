@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def mark_pulled_authors(apps, schema_editor):
+    """
+    Posts of the authors over the limit may be missing from the timelines
+    """
+    Profile = apps.get_model("profiles", "Profile")
+    PulledAuthor = apps.get_model("news", "PulledAuthor")
+
+    authors_ids = Profile.objects.filter(
+        followers_count__gt=settings.NEWS_TIMELINE_FAN_OUT_LIMIT
+    ).values_list("user_id", flat=True)
+
+    PulledAuthor.objects.bulk_create(
+        (PulledAuthor(author_id=author_id)
+         for author_id in authors_ids.iterator()),
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_login_trigrams'),
+        ('news', '0002_backfill_timeline'),
+        ('profiles', '0003_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PulledAuthor',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='users.user')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'pulled author',
+                'verbose_name_plural': 'pulled authors',
+                'db_table': 'news_pulled_authors',
+            },
+        ),
+        migrations.RunPython(mark_pulled_authors, migrations.RunPython.noop),
+    ]
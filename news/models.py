@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class TimelineEntry(models.Model):
+    """
+    A post delivered to the news timeline of a user.
+    Author id and creation date are copied from the post,
+    so a news page is a range scan over (user, created_at)
+    """
+
+    user = models.ForeignKey(
+        User, related_name="timeline", on_delete=models.CASCADE)
+    post = models.ForeignKey(
+        Post, related_name="timeline_entries", on_delete=models.CASCADE)
+    author = models.ForeignKey(
+        User, related_name="+", on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "post")
+        verbose_name = "timeline entry"
+        verbose_name_plural = "timeline entries"
+        db_table = "news_timeline"
+        ordering = ("-created_at",)
+        indexes = (
+            models.Index(fields=("user", "-created_at"),
+                         name="news_timeline_user_created"),
+            models.Index(fields=("user", "author"),
+                         name="news_timeline_user_author"),
+        )
+
+    def __str__(self):
+        return f"Post #{self.post_id} in {self.user_id} timeline"
+
+
+class PulledAuthor(models.Model):
+    """
+    An author whose posts are not copied into the timelines on creation,
+    they are copied into the timeline of a follower when he requests the
+    news. An author stays pulled when his followers count drops back under
+    the limit, so the posts that were not copied are never lost
+    """
+
+    author = models.OneToOneField(
+        User, primary_key=True, related_name="+", on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "pulled author"
+        verbose_name_plural = "pulled authors"
+        db_table = "news_pulled_authors"
+
+    def __str__(self):
+        return f"Pulled author {self.author_id}"
@@ -0,0 +1,25 @@
+from django.db.models import F
+
+from posts.models import Post
+
+from .models import PulledAuthor
+
+
+def get_pulled_authors_ids(user):
+    """
+    Returns the ids of the followed authors whose posts
+    are not copied into the timelines on creation
+    """
+    return user.following.filter(
+        following_user__in=PulledAuthor.objects.values("author")
+    ).values_list("following_user", flat=True)
+
+
+def get_news_posts(user):
+    """
+    Posts of the user timeline ordered by the timeline entries,
+    so a page is a range scan over the (user, created_at) index
+    """
+    return Post.objects.filter(timeline_entries__user=user).annotate(
+        timeline_created_at=F("timeline_entries__created_at")
+    ).order_by("-timeline_created_at", "-pk")
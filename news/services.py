@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.db.models import Max, Q
+
+from followers.models import Follower
+from posts.models import Post
+from profiles.models import Profile
+
+from .models import PulledAuthor, TimelineEntry
+from .selectors import get_pulled_authors_ids
+
+
+def is_fan_out_author(author):
+    """
+    Posts of authors with too many followers are not copied into
+    the timelines, they are pulled when the news are requested.
+    An author over the limit is marked as pulled for good
+    """
+    if PulledAuthor.objects.filter(author=author).exists():
+        return False
+
+    if Profile.objects.filter(
+        user=author,
+        followers_count__lte=settings.NEWS_TIMELINE_FAN_OUT_LIMIT
+    ).exists():
+        return True
+
+    PulledAuthor.objects.bulk_create(
+        [PulledAuthor(author=author)], ignore_conflicts=True)
+    return False
+
+
+def fan_out_post(post):
+    if not is_fan_out_author(post.author):
+        return
+
+    followers_ids = Follower.objects.filter(
+        following_user=post.author
+    ).values_list("follower_user_id", flat=True)
+
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user_id=follower_id, post=post,
+                       author_id=post.author_id, created_at=post.created_at)
+         for follower_id in followers_ids.iterator()),
+        batch_size=settings.NEWS_TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def backfill_timeline(user, author):
+    if not is_fan_out_author(author):
+        return
+
+    posts = Post.objects.filter(author=author).values_list("id", "created_at")
+
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user=user, post_id=post_id, author=author,
+                       created_at=created_at)
+         for post_id, created_at in posts.iterator()),
+        batch_size=settings.NEWS_TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def remove_author_from_timeline(user, author):
+    TimelineEntry.objects.filter(user=user, author=author).delete()
+
+
+def pull_posts_into_timeline(user):
+    """
+    Copies the posts of the followed pulled authors into the user timeline.
+    Posts older than the latest copied post of an author are already there
+    """
+    authors_ids = list(get_pulled_authors_ids(user))
+    if not authors_ids:
+        return
+
+    latest_copied = dict(TimelineEntry.objects.filter(
+        user=user, author_id__in=authors_ids
+    ).values_list("author").annotate(Max("created_at")).order_by())
+
+    posts_filter = Q()
+    for author_id in authors_ids:
+        if author_id in latest_copied:
+            posts_filter |= Q(author_id=author_id,
+                              created_at__gte=latest_copied[author_id])
+        else:
+            posts_filter |= Q(author_id=author_id)
+
+    posts = Post.objects.filter(posts_filter).values_list(
+        "id", "author_id", "created_at")
+
+    TimelineEntry.objects.bulk_create(
+        (TimelineEntry(user=user, post_id=post_id, author_id=author_id,
+                       created_at=created_at)
+         for post_id, author_id, created_at in posts.iterator()),
+        batch_size=settings.NEWS_TIMELINE_BATCH_SIZE,
+        ignore_conflicts=True
+    )
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from followers.models import Follower
+from posts.models import Post
+
+from .services import (backfill_timeline, fan_out_post,
+                       remove_author_from_timeline)
+
+
+@receiver(post_save, sender=Post)
+def create_post(sender, instance, created, **kwargs):
+    if created:
+        fan_out_post(instance)
+
+
+@receiver(post_save, sender=Follower)
+def create_follower(sender, instance, created, **kwargs):
+    if created:
+        backfill_timeline(instance.follower_user, instance.following_user)
+
+
+@receiver(post_delete, sender=Follower)
+def delete_follower(sender, instance, **kwargs):
+    remove_author_from_timeline(instance.follower_user,
+                                instance.following_user)
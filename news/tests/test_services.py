@@ -0,0 +1,107 @@
+from django.test import override_settings
+
+from followers.services import follow, unfollow
+from posts.models import Post
+from utils.tests import ExtendedTestCase
+
+from ..models import PulledAuthor, TimelineEntry
+from ..services import pull_posts_into_timeline
+
+
+class TimelineTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.author = self.UserModel.objects.create_user(
+            login="Author", email="author@gmail.com", password="pass")
+
+        self.old_post = Post.objects.create(author=self.author, body="Old")
+
+    def test_backfill_timeline_on_follow(self):
+        """
+        Following a user should copy his posts into the follower timeline
+        """
+        follow(self.user, self.author)
+
+        entry = TimelineEntry.objects.get(user=self.user)
+        self.assertEqual(entry.post, self.old_post)
+        self.assertEqual(entry.author, self.author)
+        self.assertEqual(entry.created_at, self.old_post.created_at)
+
+    def test_fan_out_post_on_creation(self):
+        """
+        A new post should be copied into the timelines of author followers
+        """
+        follow(self.user, self.author)
+        post = Post.objects.create(author=self.author, body="New")
+
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.user, post=post).exists())
+        self.assertFalse(TimelineEntry.objects.filter(
+            user=self.author).exists())
+
+    def test_remove_author_from_timeline_on_unfollow(self):
+        follow(self.user, self.author)
+        unfollow(self.user, self.author)
+
+        self.assertFalse(TimelineEntry.objects.filter(
+            user=self.user).exists())
+
+    def test_remove_post_from_timeline_on_deletion(self):
+        follow(self.user, self.author)
+        self.old_post.delete()
+
+        self.assertFalse(TimelineEntry.objects.filter(
+            user=self.user).exists())
+
+    @override_settings(NEWS_TIMELINE_FAN_OUT_LIMIT=0)
+    def test_no_fan_out_for_authors_over_the_limit(self):
+        """
+        Posts of authors with more followers than the limit
+        should not be copied into the timelines
+        """
+        follow(self.user, self.author)
+        Post.objects.create(author=self.author, body="New")
+
+        self.assertFalse(TimelineEntry.objects.filter(
+            user=self.user).exists())
+
+    @override_settings(NEWS_TIMELINE_FAN_OUT_LIMIT=0)
+    def test_mark_authors_over_the_limit_as_pulled(self):
+        follow(self.user, self.author)
+        Post.objects.create(author=self.author, body="New")
+
+        self.assertTrue(PulledAuthor.objects.filter(
+            author=self.author).exists())
+
+    def test_pull_posts_into_timeline(self):
+        """
+        Posts of the pulled authors should be copied
+        into the timeline when the news are requested
+        """
+        with override_settings(NEWS_TIMELINE_FAN_OUT_LIMIT=0):
+            follow(self.user, self.author)
+            post = Post.objects.create(author=self.author, body="New")
+
+        pull_posts_into_timeline(self.user)
+
+        self.assertQuerysetEqual(
+            TimelineEntry.objects.filter(user=self.user).values_list(
+                "post_id", flat=True),
+            [post.id, self.old_post.id],
+            ordered=False
+        )
+
+    def test_pulled_author_under_the_limit(self):
+        """
+        Posts created while the author was over the limit
+        should not be lost when he drops back under it
+        """
+        follow(self.user, self.author)
+        with override_settings(NEWS_TIMELINE_FAN_OUT_LIMIT=0):
+            post = Post.objects.create(author=self.author, body="New")
+
+        pull_posts_into_timeline(self.user)
+
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.user, post=post).exists())
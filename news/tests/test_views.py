@@ -1,9 +1,10 @@
 from urllib.parse import urlencode
 
+from django.test import override_settings
 from django.urls import reverse
 
 from followers.services import follow, unfollow
-from posts.models import Post
+from posts.models import Attachment, Like, Post
 from utils.tests import ListAPIViewTestCase
 
 
@@ -99,6 +100,21 @@ class NewsAPIViewTestCase(ListAPIViewTestCase):
         self.assertEqual(response.data["items"]
                          [0]["id"], self.first_news_post.id)
 
+    def test_news_with_cursor_parameter(self):
+        response = self.client.get(self.url({"limit": 1, "cursor": ""}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.data["items"]
+                         [0]["id"], self.second_news_post.id)
+
+        response = self.client.get(
+            self.url({"limit": 1, "cursor": response.data["nextCursor"]}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.data["items"]
+                         [0]["id"], self.first_news_post.id)
+        self.assertIsNone(response.data["nextCursor"])
+
     def test_news_without_followings(self):
         """
         If the user has no followings, news should be empty
@@ -108,3 +124,57 @@ class NewsAPIViewTestCase(ListAPIViewTestCase):
 
         self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
         self.check_common_details_of_list_view_response(response)
+
+    @override_settings(NEWS_TIMELINE_FAN_OUT_LIMIT=0)
+    def test_news_of_authors_over_the_fan_out_limit(self):
+        """
+        Posts of authors with more followers than the fan-out limit
+        are not copied into the timelines, so they should be pulled
+        """
+        post = Post.objects.create(
+            author=self.second_user, body="post #3 by second user")
+        response = self.client.get(self.url())
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=3,
+            page_size=3
+        )
+
+        self.assertEqual(response.data["items"][0]["id"], post.id)
+
+    def test_news_of_authors_back_under_the_fan_out_limit(self):
+        with override_settings(NEWS_TIMELINE_FAN_OUT_LIMIT=0):
+            post = Post.objects.create(
+                author=self.second_user, body="post #3 by second user")
+        response = self.client.get(self.url())
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=3,
+            page_size=3
+        )
+
+        self.assertEqual(response.data["items"][0]["id"], post.id)
+
+    def test_news_number_of_queries(self):
+        """
+        The number of queries should not depend on the number of posts
+        """
+        for i in range(5):
+            author = self.UserModel.objects.create_user(
+                login=f"Author{i}", email=f"author{i}@gmail.com",
+                password="pass")
+            follow(self.user, author)
+
+            post = Post.objects.create(author=author, body=f"Post #{i}")
+            Like.objects.create(user=self.user, post=post)
+            Attachment.objects.create(
+                post=post, file_id=str(i), link=f"http://localhost:8000/{i}")
+
+        single_post_page_queries = self.count_list_view_queries(
+            self.url({"limit": 1}))
+        full_page_queries = self.count_list_view_queries(
+            self.url({"limit": 7}))
+
+        self.assertEqual(single_post_page_queries, full_page_queries)
@@ -1,7 +1,9 @@
-from followers.selectors import get_user_followings_ids_list
 from posts.mixins import ListPostsAPIViewMixin
 from utils.views import LoginRequiredAPIView
 
+from .selectors import get_news_posts
+from .services import pull_posts_into_timeline
+
 
 class NewsAPIView(LoginRequiredAPIView, ListPostsAPIViewMixin):
     """
@@ -9,6 +11,12 @@ class NewsAPIView(LoginRequiredAPIView, ListPostsAPIViewMixin):
     """
 
     def get_queryset(self):
-        posts = super().get_queryset()
-        return posts.filter(
-            author_id__in=get_user_followings_ids_list(self.request.user))
+        pull_posts_into_timeline(self.request.user)
+        return get_news_posts(self.request.user)
+
+    def filter_queryset(self, queryset, kwargs):
+        # Search results are ordered by relevance
+        if kwargs["q"]:
+            queryset = queryset.order_by()
+
+        return super().filter_queryset(queryset, kwargs)
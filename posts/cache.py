@@ -0,0 +1,4 @@
+from utils.cache import CacheNamespace
+
+# Posts rows by ids, the authors and attachments are not cached
+posts_by_id = CacheNamespace("posts:id", "SELECTORS_CACHE_TTL")
@@ -0,0 +1,90 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.models import Post
+from posts.search import get_search_terms, rebuild_search_index, search_posts
+
+User = get_user_model()
+
+
+class BenchmarkRollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Compares the latency of the indexed post search and "
+            "body__icontains on generated posts. "
+            "All generated data is rolled back")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000000)
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--vocabulary", type=int, default=20000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.vocabulary = [self.generate_word()
+                           for _ in range(options["vocabulary"])]
+
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def run(self, options):
+        author = User.objects.create_user(
+            login="search-benchmark", email="search@benchmark.local",
+            password=None)
+
+        self.stdout.write(f"Generating {options['posts']} posts...")
+        Post.objects.bulk_create(
+            (Post(author=author, body=self.generate_body())
+             for _ in range(options["posts"])),
+            batch_size=5000
+        )
+        rebuild_search_index()
+
+        queries = [" ".join(self.random.sample(self.vocabulary, 2))
+                   for _ in range(options["queries"])]
+
+        for name, search in (("indexed search", self.indexed_search),
+                             ("body__icontains", self.icontains_search)):
+            timings = []
+            for q in queries:
+                started_at = time.perf_counter()
+                search(q)
+                timings.append((time.perf_counter() - started_at) * 1000)
+
+            timings.sort()
+            self.stdout.write(
+                f"{name}: median {statistics.median(timings):.1f} ms, "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:.1f} ms"
+            )
+
+    def indexed_search(self, q):
+        posts = search_posts(Post.objects.all(), q).order_by(
+            "-search_rank", "-created_at")
+        return list(posts[:10].values_list("id", flat=True))
+
+    def icontains_search(self, q):
+        posts = Post.objects.all()
+        for term in get_search_terms(q):
+            posts = posts.filter(body__icontains=term)
+        return list(posts[:10].values_list("id", flat=True))
+
+    def generate_word(self):
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        return "".join(self.random.choice(letters)
+                       for _ in range(self.random.randint(3, 10)))
+
+    def generate_body(self):
+        return " ".join(self.random.choices(
+            self.vocabulary, k=self.random.randint(5, 60)))
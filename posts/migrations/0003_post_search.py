@@ -0,0 +1,53 @@
+from django.db import migrations
+
+SEARCH_CONFIG = "simple"
+
+SEARCH_INDEX_NAME = "posts_body_search"
+
+SQLITE_SEARCH_TABLE = "posts_search"
+
+
+def get_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector("body", config=SEARCH_CONFIG),
+                    name=SEARCH_INDEX_NAME)
+
+
+def create_search_index(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.add_index(Post, get_search_index())
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {SQLITE_SEARCH_TABLE} USING fts5("
+            "body, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, body) "
+            "SELECT id, body FROM posts"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.remove_index(Post, get_search_index())
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE {SQLITE_SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_likes(apps, schema_editor):
+    Like = apps.get_model("posts", "Like")
+    Post = apps.get_model("posts", "Post")
+
+    likes_count = Like.objects.filter(post=OuterRef("pk")).order_by(
+    ).values("post").annotate(count=Count("pk")).values("count")
+    Post.objects.update(likes_count=Coalesce(Subquery(likes_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_attachment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,8 +1,8 @@
-from django.db.models import Count
-
 from utils.views import ListAPIViewMixin
 
 from .models import Post
+from .search import search_posts
+from .selectors import prefetch_posts_list_data
 from .serializers import PostSerializer
 
 
@@ -11,7 +11,17 @@ class ListPostsAPIViewMixin(ListAPIViewMixin):
     serializer_class = PostSerializer
 
     def filter_queryset(self, queryset, kwargs):
-        return queryset.filter(body__icontains=kwargs["q"])
+        posts = queryset
+
+        if kwargs["q"]:
+            posts = search_posts(posts, kwargs["q"])
+
+            # Without explicit ordering the most relevant posts go first
+            if "search_rank" in posts.query.annotations and \
+                    not posts.query.order_by:
+                posts = posts.order_by("-search_rank", *Post._meta.ordering)
+
+        return prefetch_posts_list_data(posts, self.request.user)
 
 
 class ListPostsWithOrderingAPIViewMixin(ListPostsAPIViewMixin):
@@ -33,8 +43,7 @@ class ListPostsWithOrderingAPIViewMixin(ListPostsAPIViewMixin):
             if ordering_field in allowed_ordering_fields:
 
                 if ordering_field == "likes":
-                    queryset = queryset.annotate(likes=Count("like"))
-                    ordering_field = sign + ordering_field
+                    ordering_field = sign + "likes_count"
 
                 elif ordering_field == "createdAt":
                     ordering_field = sign + "created_at"
@@ -9,6 +9,7 @@ User = get_user_model()
 class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     body = models.TextField(blank=True)
+    likes_count = models.PositiveIntegerField(default=0, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -40,12 +41,13 @@ class Attachment(ImageModel):
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
 
     def save(self, *args, **kwargs):
-        attachments_count = Attachment.objects.all().filter(
-            post=self.post
-        ).count()
+        if self._state.adding:
+            attachments_count = Attachment.objects.all().filter(
+                post=self.post
+            ).count()
 
-        if attachments_count >= 5:
-            raise Error("Maximum 5 attachments per post")
+            if attachments_count >= 5:
+                raise Error("Maximum 5 attachments per post")
 
         super(Attachment, self).save(*args, **kwargs)
 
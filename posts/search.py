@@ -0,0 +1,104 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+# Both the GIN index(PostgreSQL) and the queries depend on the config,
+# so changing it requires a new migration
+SEARCH_CONFIG = "simple"
+
+SQLITE_SEARCH_TABLE = "posts_search"
+
+
+def get_search_terms(q):
+    return re.findall(r"\w+", q.lower())
+
+
+def search_posts(queryset, q):
+    """
+    Filters the posts whose words start with all the terms of
+    the search string and annotates them with search_rank
+    (the greater the value, the more relevant the post)
+    """
+    terms = get_search_terms(q)
+
+    if terms and connection.vendor == "postgresql":
+        return search_posts_postgresql(queryset, terms)
+    if terms and connection.vendor == "sqlite":
+        return search_posts_sqlite(queryset, terms)
+
+    return queryset.filter(body__icontains=q)
+
+
+def search_posts_postgresql(queryset, terms):
+    from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                SearchVector)
+
+    vector = SearchVector("body", config=SEARCH_CONFIG)
+    query = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config=SEARCH_CONFIG,
+        search_type="raw"
+    )
+
+    return queryset.annotate(search_vector=vector).filter(
+        search_vector=query
+    ).annotate(search_rank=SearchRank(vector, query))
+
+
+def search_posts_sqlite(queryset, terms):
+    match = " ".join(f"\"{term}\"*" for term in terms)
+    table = SQLITE_SEARCH_TABLE
+    posts_table = Post._meta.db_table
+
+    matched_posts_ids = RawSQL(
+        f"SELECT rowid FROM {table} WHERE {table} MATCH %s", (match,))
+    # bm25 rank of FTS5 is negative, the lower the value,
+    # the more relevant the row
+    rank = RawSQL(
+        f"SELECT -rank FROM {table} WHERE {table} MATCH %s "
+        f"AND rowid = \"{posts_table}\".\"id\"", (match,))
+
+    return queryset.filter(id__in=matched_posts_ids).annotate(
+        search_rank=rank)
+
+
+def index_post(post):
+    if connection.vendor != "sqlite":
+        # PostgreSQL GIN index is kept up to date by the database
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s", (post.id,))
+        cursor.execute(
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, body) VALUES (%s, %s)",
+            (post.id, post.body)
+        )
+
+
+def unindex_post(post):
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SQLITE_SEARCH_TABLE} WHERE rowid = %s", (post.id,))
+
+
+def rebuild_search_index():
+    """
+    Reindexes all posts, e.g. after bulk_create,
+    which does not send the signals
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SQLITE_SEARCH_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, body) "
+            f"SELECT id, body FROM {Post._meta.db_table}"
+        )
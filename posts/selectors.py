@@ -1,13 +1,15 @@
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Exists, OuterRef, Prefetch
 
 from utils.exceptions import NotFound404
 
-from .models import Like, Post
+from .cache import posts_by_id
+from .models import Attachment, Like, Post
 
 
 def get_post_by_id_or_404(id):
     try:
-        return Post.objects.get(id=id)
+        return posts_by_id.get_or_set((id,), lambda: Post.objects.get(id=id))
     except ObjectDoesNotExist:
         raise NotFound404("Invalid id, post is not found")
 
@@ -15,3 +17,20 @@ def get_post_by_id_or_404(id):
 def get_liked_posts(user):
     liked_posts_ids = Like.objects.all().filter(user=user).values_list("post")
     return Post.objects.all().filter(id__in=liked_posts_ids)
+
+
+def prefetch_posts_list_data(queryset, user):
+    """
+    Loads everything PostSerializer needs for a page of posts
+    (isLiked flag, attachments and author avatar)
+    in a constant number of queries
+    """
+    return queryset.select_related("author__profile__avatar").annotate(
+        is_liked=Exists(Like.objects.filter(post=OuterRef("pk"), user=user))
+    ).prefetch_related(Prefetch(
+        "attachment_set",
+        queryset=Attachment.objects.filter(
+            status=Attachment.Status.READY
+        ).only("post_id", "link", "variants"),
+        to_attr="prefetched_attachments"
+    ))
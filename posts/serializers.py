@@ -1,10 +1,12 @@
 from django.http import QueryDict
 from rest_framework import serializers
 
+from profiles.serializers import UploadedImageField, get_image_link
 from users.serializers import UserSerializer
 
 from .models import Like, Post
-from .services import (create_post_attachment, delete_post_attachments,
+from .services import (create_post, create_post_attachment,
+                       delete_post_attachments, get_post_attachments,
                        get_post_attachments_list)
 
 
@@ -30,7 +32,7 @@ class PostSerializer(serializers.ModelSerializer):
     author = UserSerializer()
 
     def get_likes(self, obj):
-        return Like.objects.all().filter(post=obj).count()
+        return obj.likes_count
 
     def get_createdAt(self, obj):
         return obj.created_at
@@ -39,11 +41,20 @@ class PostSerializer(serializers.ModelSerializer):
         return obj.updated_at
 
     def get_isLiked(self, obj):
+        if hasattr(obj, "is_liked"):
+            return obj.is_liked
+
         user = self.context.get("request").user
         return Like.objects.all().filter(post=obj, user=user).exists()
 
     def get_attachments(self, obj):
-        return get_post_attachments_list(obj)
+        if hasattr(obj, "prefetched_attachments"):
+            attachments = obj.prefetched_attachments
+        else:
+            attachments = get_post_attachments(obj)
+
+        return [get_image_link(a, "medium", self.context)
+                for a in attachments]
 
     class Meta:
         model = Post
@@ -61,7 +72,7 @@ class BaseCreateUpdatePostSerializer(serializers.Serializer):
     )
 
     attachments = serializers.ListField(
-        child=serializers.ImageField(
+        child=UploadedImageField(
             error_messages={
                 "invalid_image": "Invalid image in attached files"
             }
@@ -106,7 +117,7 @@ class CreatePostSerializer(BaseCreateUpdatePostSerializer):
         return data
 
     def create(self, validated_data):
-        instance = Post.objects.create(
+        instance = create_post(
             author=self.context.get("request").user,
             body=validated_data.get("body", "")
         )
@@ -144,5 +155,7 @@ class UpdatePostSerializer(BaseCreateUpdatePostSerializer):
             for attachment in validated_data["attachments"]:
                 create_post_attachment(instance, attachment)
 
-        instance.save()
+        # The instance may come from the cache, its likes_count
+        # must not overwrite the counter of the table
+        instance.save(update_fields=("body", "updated_at"))
         return instance
@@ -1,31 +1,115 @@
-from profiles.services.google_drive_api import GoogleDriveAPI
-from profiles.services.images import update_instance_image
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
-from .models import Attachment
+from profiles.services.images import (get_image_files_ids,
+                                      release_image_files,
+                                      update_instance_image)
 
-google_drive = GoogleDriveAPI()
+from .cache import posts_by_id
+from .models import Attachment, Like, Post
 
 
 def delete_post_attachments(post):
     attachments = Attachment.objects.all().filter(post=post)
+    # Attachments still being processed have no files yet,
+    # their upload jobs are deleted with them
+    files_ids = [
+        file_id
+        for attachment_file_id, variants in attachments.order_by(
+            "id").values_list("file_id", "variants")
+        for file_id in get_image_files_ids(attachment_file_id, variants)
+    ]
 
-    for attachment in attachments:
-        google_drive.delete_file(attachment.file_id)
-        attachment.delete()
+    release_image_files(files_ids)
+    attachments.delete()
 
 
 def create_post_attachment(post, file):
     attachment = Attachment.objects.create(
-        post=post, file_id="", link="")
+        post=post, file_id="", link="", status=Attachment.Status.PROCESSING)
     update_instance_image(attachment, file)
 
 
+def create_post(author, body):
+    with transaction.atomic():
+        return Post.objects.create(author=author, body=body)
+
+
 def delete_post(post):
     delete_post_attachments(post)
-    post.delete()
+
+    with transaction.atomic():
+        post.delete()
+
+
+def get_post_attachments(post):
+    return Attachment.objects.all().filter(
+        post=post, status=Attachment.Status.READY).only("link", "variants")
 
 
 def get_post_attachments_list(post):
-    return list(Attachment.objects.all().filter(
-        post=post
-    ).values_list("link", flat=True))
+    return list(get_post_attachments(post).values_list("link", flat=True))
+
+
+def is_liked(user, post):
+    return Like.objects.all().filter(user=user, post=post).exists()
+
+
+def like_post(user, post):
+    # The unique (user, post) constraint decides between concurrent likes,
+    # the counter is incremented only when the like is inserted
+    Like.objects.get_or_create(user=user, post=post)
+
+
+def unlike_post(user, post):
+    with transaction.atomic():
+        # Only the request whose DELETE removed the row decrements
+        # the counter, a concurrent unlike deletes nothing
+        deleted, _ = Like.objects.filter(user=user, post=post).delete()
+        if deleted:
+            decrement_likes_count(post.id)
+
+
+def increment_likes_count(post_id):
+    Post.objects.filter(id=post_id).update(likes_count=F("likes_count") + 1)
+
+
+def decrement_likes_count(post_id):
+    Post.objects.filter(id=post_id, likes_count__gt=0).update(
+        likes_count=F("likes_count") - 1)
+
+
+def reconcile_likes_counts(chunk_size=1000):
+    """
+    Recalculates likes_count of the posts whose counter has drifted,
+    posts are processed in chunks by primary key.
+    Returns the number of fixed posts
+    """
+    actual_likes_count = Coalesce(Subquery(
+        Like.objects.filter(post=OuterRef("pk")).order_by().values(
+            "post").annotate(count=Count("pk")).values("count")
+    ), 0)
+    fixed_posts_count = 0
+    last_id = 0
+
+    while True:
+        chunk = list(Post.objects.filter(id__gt=last_id).order_by(
+            "id"
+        ).annotate(
+            actual_likes_count=actual_likes_count
+        ).values_list("id", "likes_count", "actual_likes_count")[:chunk_size])
+
+        if not chunk:
+            # The counters of the cached posts are changed without signals
+            if fixed_posts_count:
+                posts_by_id.invalidate()
+            return fixed_posts_count
+
+        last_id = chunk[-1][0]
+        drifted_ids = [post_id for post_id, likes_count, actual in chunk
+                       if likes_count != actual]
+
+        if drifted_ids:
+            fixed_posts_count += Post.objects.filter(
+                id__in=drifted_ids).update(likes_count=actual_likes_count)
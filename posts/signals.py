@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from profiles.services.counters import (decrement_profile_counter,
+                                        increment_profile_counter)
+
+from .cache import posts_by_id
+from .models import Like, Post
+from .search import index_post, unindex_post
+from .services import increment_likes_count
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+def save_post(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        increment_profile_counter(instance.author_id, "posts_count")
+    else:
+        posts_by_id.delete(instance.id)
+
+    if update_fields is None or "body" in update_fields:
+        index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post(sender, instance, **kwargs):
+    decrement_profile_counter(instance.author_id, "posts_count")
+    unindex_post(instance)
+    posts_by_id.delete(instance.id)
+
+
+@receiver(post_save, sender=Like)
+def create_like(sender, instance, created, **kwargs):
+    if created:
+        increment_likes_count(instance.post_id)
+        posts_by_id.delete(instance.post_id)
+
+
+@receiver(post_delete, sender=Like)
+def delete_like(sender, instance, **kwargs):
+    posts_by_id.delete(instance.post_id)
+
+
+@receiver(pre_delete, sender=User)
+def delete_user_likes(sender, instance, **kwargs):
+    """
+    Likes of a deleted user are removed by the cascade,
+    unlike_post decrements the counters of the other likes
+    """
+    Post.objects.filter(
+        id__in=Like.objects.filter(user=instance).values("post"),
+        likes_count__gt=0
+    ).update(likes_count=F("likes_count") - 1)
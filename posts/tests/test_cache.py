@@ -0,0 +1,124 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.db.models import F
+from django.test import override_settings
+
+from posts.services import reconcile_likes_counts
+from utils.cache import get_jittered_ttl
+from utils.exceptions import NotFound404
+from utils.tests import ExtendedTestCase
+
+from ..cache import posts_by_id
+from ..models import Post
+from ..selectors import get_post_by_id_or_404
+from ..serializers import UpdatePostSerializer
+from ..services import create_post, delete_post, like_post
+
+
+class PostsCacheTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.post = create_post(self.user, "Post")
+
+    def test_post_is_cached(self):
+        get_post_by_id_or_404(self.post.id)
+
+        with self.assertNumQueries(0):
+            post = get_post_by_id_or_404(self.post.id)
+        self.assertEqual(post.body, "Post")
+
+    def test_cached_post_is_invalidated(self):
+        get_post_by_id_or_404(self.post.id)
+        like_post(self.user, self.post)
+        self.assertEqual(get_post_by_id_or_404(self.post.id).likes_count, 1)
+
+        self.post.body = "Edited post"
+        self.post.save()
+        self.assertEqual(get_post_by_id_or_404(self.post.id).body,
+                         "Edited post")
+
+        delete_post(self.post)
+        with self.assertRaises(NotFound404):
+            get_post_by_id_or_404(self.post.id)
+
+    def test_update_of_cached_post_keeps_likes_count(self):
+        """
+        Saving a cached post shouldn't overwrite the likes
+        counted by the other processes
+        """
+        post = get_post_by_id_or_404(self.post.id)
+        Post.objects.filter(id=self.post.id).update(
+            likes_count=F("likes_count") + 1)
+
+        serializer = UpdatePostSerializer(post, {"body": "Edited post"})
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.body, "Edited post")
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_reconciliation_invalidates_cached_posts(self):
+        get_post_by_id_or_404(self.post.id)
+        Post.objects.update(likes_count=10)
+
+        reconcile_likes_counts()
+        self.assertEqual(get_post_by_id_or_404(self.post.id).likes_count, 0)
+
+
+class CacheNamespaceTestCase(ExtendedTestCase):
+    def hold_lock(self, *parts):
+        cache.add(f"{posts_by_id.make_key(*parts)}:lock", True)
+
+    def test_value_is_computed_by_lock_holder_only(self):
+        self.hold_lock("key")
+        compute = Mock(return_value="computed")
+
+        # The lock holder caches the value while the others wait
+        def sleep(interval):
+            posts_by_id.set(("key",), "cached")
+
+        with patch("utils.cache.sleep", side_effect=sleep):
+            self.assertEqual(posts_by_id.get_or_set(("key",), compute),
+                             "cached")
+        compute.assert_not_called()
+
+    def test_value_is_computed_after_failed_computation(self):
+        self.hold_lock("key")
+        compute = Mock(return_value="computed")
+
+        def sleep(interval):
+            cache.delete(f"{posts_by_id.make_key('key')}:lock")
+
+        with patch("utils.cache.sleep", side_effect=sleep):
+            self.assertEqual(posts_by_id.get_or_set(("key",), compute),
+                             "computed")
+        # Only the successful computations are cached
+        self.assertIsNone(posts_by_id.get("key"))
+
+    def test_exception_releases_lock(self):
+        compute = Mock(side_effect=NotFound404)
+
+        with self.assertRaises(NotFound404):
+            posts_by_id.get_or_set(("key",), compute)
+        self.assertIsNone(cache.get(f"{posts_by_id.make_key('key')}:lock"))
+
+    def test_invalidation(self):
+        posts_by_id.set(("key",), "value")
+        posts_by_id.invalidate()
+
+        self.assertIsNone(posts_by_id.get("key"))
+
+    def test_unsafe_key_is_hashed(self):
+        key = posts_by_id.make_key("login with spaces\n" * 20)
+        self.assertRegex(key, r"^posts:id:[0-9a-f]{32}:[0-9a-f]{64}$")
+
+    @override_settings(CACHE_TTL_JITTER=0.1)
+    def test_ttl_jitter(self):
+        ttls = {get_jittered_ttl(1000) for _ in range(100)}
+
+        self.assertTrue(all(900 <= ttl <= 1000 for ttl in ttls))
+        self.assertGreater(len(ttls), 1)
+        self.assertIsNone(get_jittered_ttl(None))
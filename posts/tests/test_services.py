@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.models import F, QuerySet
+from django.db.models.signals import pre_delete
+
+from utils.tests import ExtendedTestCase
+
+from ..models import Like, Post
+from ..services import like_post, reconcile_likes_counts, unlike_post
+
+
+class LikesCountTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.second_user = self.UserModel.objects.create_user(
+            login="SecondUser", email="second_user@gmail.com",
+            password="pass")
+
+        self.post = Post.objects.create(author=self.user, body="Post")
+
+    def get_likes_count(self):
+        self.post.refresh_from_db()
+        return self.post.likes_count
+
+    def test_like_and_unlike_post(self):
+        like_post(self.user, self.post)
+        like_post(self.user, self.post)
+        like_post(self.second_user, self.post)
+        self.assertEqual(self.get_likes_count(), 2)
+
+        unlike_post(self.user, self.post)
+        unlike_post(self.user, self.post)
+        self.assertEqual(self.get_likes_count(), 1)
+
+    def test_concurrent_like(self):
+        """
+        A like inserted by a concurrent request after the check
+        should not raise an error or be counted twice
+        """
+        like_post(self.user, self.post)
+        get = QuerySet.get
+        calls = []
+
+        def get_after_concurrent_like(queryset, *args, **kwargs):
+            if not calls:
+                calls.append(kwargs)
+                raise Like.DoesNotExist
+            return get(queryset, *args, **kwargs)
+
+        with patch.object(QuerySet, "get", get_after_concurrent_like):
+            like_post(self.user, self.post)
+
+        self.assertTrue(calls)
+        self.assertEqual(Like.objects.filter(post=self.post).count(), 1)
+        self.assertEqual(self.get_likes_count(), 1)
+
+    def test_concurrent_unlike(self):
+        """
+        A like deleted by a concurrent request after it has been
+        read should not be subtracted from the counter again
+        """
+        like_post(self.user, self.post)
+        like_post(self.second_user, self.post)
+
+        def unlike_concurrently(sender, instance, **kwargs):
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM likes WHERE id = %s",
+                               [instance.id])
+            Post.objects.filter(id=instance.post_id).update(
+                likes_count=F("likes_count") - 1)
+
+        pre_delete.connect(unlike_concurrently, sender=Like)
+        self.addCleanup(pre_delete.disconnect, unlike_concurrently,
+                        sender=Like)
+        unlike_post(self.user, self.post)
+
+        self.assertEqual(self.get_likes_count(), 1)
+
+    def test_likes_count_after_user_deletion(self):
+        like_post(self.second_user, self.post)
+        self.second_user.delete()
+
+        self.assertEqual(self.get_likes_count(), 0)
+
+    def test_reconcile_likes_counts(self):
+        """
+        reconcile_likes_counts should fix only drifted counters
+        """
+        Like.objects.create(user=self.user, post=self.post)
+        second_post = Post.objects.create(author=self.user, body="Second")
+        Post.objects.filter(id=self.post.id).update(likes_count=7)
+
+        self.assertEqual(reconcile_likes_counts(chunk_size=1), 1)
+        self.assertEqual(self.get_likes_count(), 1)
+
+        second_post.refresh_from_db()
+        self.assertEqual(second_post.likes_count, 0)
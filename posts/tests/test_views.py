@@ -1,6 +1,9 @@
+import json
 import re
+from base64 import urlsafe_b64encode
 from urllib.parse import urlencode
 
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.utils.crypto import get_random_string
 
@@ -359,6 +362,59 @@ class ListCreatePostAPIViewTestCase(ListAPIViewTestCase):
         post = response.data["items"][0]
         self.assertEqual(post["body"], "Last post")
 
+    def test_posts_list_search_by_word_prefixes(self):
+        """
+        Search should match the posts whose words start
+        with all the terms of the q parameter
+        """
+        response = self.client.get(self.url({"q": "pos SEC"}))
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=1,
+            page_size=1
+        )
+        self.assertEqual(response.data["items"][0]["body"], "Second post")
+
+        response = self.client.get(self.url({"q": "ost"}))
+        self.check_common_details_of_list_view_response(response)
+
+    def test_posts_list_search_relevance_ordering(self):
+        """
+        Without the ordering parameter the most relevant posts go first
+        """
+        relevant_post = Post.objects.create(
+            author=self.user, body="Python, python and python")
+        Post.objects.create(author=self.user, body="Python post with words")
+
+        response = self.client.get(self.url({"q": "python"}))
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=2,
+            page_size=2
+        )
+        self.assertEqual(response.data["items"][0]["id"], relevant_post.id)
+
+    def test_posts_list_search_index_is_kept_in_sync(self):
+        post = Post.objects.get(body="First post")
+        post.body = "Updated text"
+        post.save()
+
+        response = self.client.get(self.url({"q": "first"}))
+        self.check_common_details_of_list_view_response(response)
+
+        response = self.client.get(self.url({"q": "updated"}))
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=1,
+            page_size=1
+        )
+
+        post.delete()
+        response = self.client.get(self.url({"q": "updated"}))
+        self.check_common_details_of_list_view_response(response)
+
     def test_posts_list_with_limit_parameter(self):
         """
         A request for a list of posts with the limit parameter
@@ -420,6 +476,108 @@ class ListCreatePostAPIViewTestCase(ListAPIViewTestCase):
         self.assertEqual(response.data["items"][1]["body"], "Second post")
         self.assertEqual(response.data["items"][2]["body"], "Last post")
 
+    def test_posts_list_with_cursor_parameter(self):
+        """
+        Posts inserted while the client iterates over the list
+        with the cursor parameter should not shift the pages
+        """
+        response = self.client.get(self.url({"limit": 1, "cursor": ""}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.data["items"][0]["body"], "Last post")
+
+        Post.objects.create(author=self.user, body="New post")
+
+        bodies = []
+        next_cursor = response.data["nextCursor"]
+        while next_cursor:
+            response = self.client.get(
+                self.url({"limit": 1, "cursor": next_cursor}))
+
+            self.assertEqual(response.status_code,
+                             self.http_status.HTTP_200_OK)
+            bodies.extend(item["body"] for item in response.data["items"])
+            next_cursor = response.data["nextCursor"]
+
+        self.assertEqual(bodies, ["Second post", "First post"])
+
+    def test_posts_list_with_cursor_and_ordering_by_likes(self):
+        bodies = []
+        parameters = {"limit": 2, "cursor": "", "ordering": "-likes"}
+
+        while parameters["cursor"] is not None:
+            response = self.client.get(self.url(parameters))
+
+            self.assertEqual(response.status_code,
+                             self.http_status.HTTP_200_OK)
+            bodies.extend(item["body"] for item in response.data["items"])
+            parameters["cursor"] = response.data["nextCursor"]
+
+        self.assertEqual(bodies, ["Second post", "First post", "Last post"])
+
+    def test_posts_list_with_cursor_of_another_ordering(self):
+        response = self.client.get(self.url({"limit": 1, "cursor": ""}))
+        response = self.client.get(self.url({
+            "limit": 1,
+            "cursor": response.data["nextCursor"],
+            "ordering": "likes"
+        }))
+
+        self.client_error_response_test(
+            response,
+            messages=["Invalid cursor value"]
+        )
+
+    def test_posts_list_with_tampered_cursor_values(self):
+        """
+        A cursor with values that don't match the ordering fields
+        should return a 400 error
+        """
+        invalid_values = (
+            ["garbage", 1],
+            ["2021-01-01T00:00:00", "garbage"],
+            [{"nested": "dict"}, 1],
+            ["2021-01-01T00:00:00", [1]],
+            [None, 1],
+            ["2021-01-01T00:00:00", 10 ** 30],
+            {"created_at": "2021-01-01T00:00:00", "pk": 1},
+        )
+
+        for values in invalid_values:
+            with self.subTest(values=values):
+                cursor = urlsafe_b64encode(json.dumps({
+                    "o": ["-created_at", "-pk"],
+                    "v": values,
+                    "b": False
+                }).encode()).decode()
+                response = self.client.get(self.url({"cursor": cursor}))
+
+                self.client_error_response_test(
+                    response,
+                    messages=["Invalid cursor value"]
+                )
+
+    def test_posts_list_number_of_queries(self):
+        """
+        The number of queries should not depend on the number of posts
+        """
+        for i in range(5):
+            author = self.UserModel.objects.create_user(
+                login=f"Author{i}", email=f"author{i}@gmail.com",
+                password="pass")
+            post = Post.objects.create(author=author, body=f"Post #{i}")
+            Like.objects.create(user=self.user, post=post)
+            Attachment.objects.create(
+                post=post, file_id=str(i), link=f"http://localhost:8000/{i}")
+
+        for ordering in ("", "-likes", "createdAt"):
+            single_post_page_queries = self.count_list_view_queries(
+                self.url({"limit": 1, "ordering": ordering}))
+            full_page_queries = self.count_list_view_queries(
+                self.url({"limit": 8, "ordering": ordering}))
+
+            self.assertEqual(single_post_page_queries, full_page_queries)
+
     # Create post
 
     def test_valid_post_creation(self):
@@ -466,6 +624,25 @@ class ListCreatePostAPIViewTestCase(ListAPIViewTestCase):
             fields_errors_dict_len=2
         )
 
+    def test_post_creation_with_invalid_attachment(self):
+        """
+        The content type sent by the client is not trusted,
+        the header of the attachment is checked
+        """
+        attachment = SimpleUploadedFile("image.jpg", b"text", "image/jpeg")
+        posts_count = Post.objects.count()
+        response = self.client.post(
+            self.url(), {"attachments": [attachment]}, format="multipart")
+
+        self.client_error_response_test(
+            response,
+            messages=[
+                "Invalid image in attached files"
+            ],
+            fields_errors_dict_len=1
+        )
+        self.assertEqual(Post.objects.count(), posts_count)
+
     def test_post_creation_with_empty_fields(self):
         payload = {
             "body": "",
@@ -0,0 +1,41 @@
+from hashlib import sha256
+
+from utils.cache import CacheNamespace
+
+
+class ProfileResponsesCache:
+    """
+    Rendered public profiles with their ETags keyed by the image format.
+    Each user has a namespace, its version is replaced whenever the
+    profile changes, so the responses of the previous versions are never
+    read again and expire after PROFILE_RESPONSES_CACHE_TTL seconds
+    """
+
+    def get_namespace(self, user_id):
+        return CacheNamespace(f"profiles:{user_id}",
+                              "PROFILE_RESPONSES_CACHE_TTL")
+
+    def get_version(self, user_id):
+        return self.get_namespace(user_id).get_version()
+
+    def bump_version(self, user_id):
+        self.get_namespace(user_id).invalidate()
+
+    def get(self, user_id, version, format):
+        """
+        Returns the ETag and the content of the response rendered for the
+        version, None if the response is not cached. The version is read
+        before rendering, so a response rendered while the profile changes
+        is cached for the previous version
+        """
+        return self.get_namespace(user_id).get(format, version=version)
+
+    def set(self, user_id, version, format, content):
+        # Strong ETag, the same value means the same bytes
+        response = (f'"{sha256(content).hexdigest()}"', content)
+        self.get_namespace(user_id).set((format,), response, version=version)
+
+        return response
+
+
+profile_responses = ProfileResponsesCache()
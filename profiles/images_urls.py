@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import RetrieveLocalImageView
+
+urlpatterns = [
+    path("<str:file_id>", RetrieveLocalImageView.as_view(),
+         name="local_image")
+]
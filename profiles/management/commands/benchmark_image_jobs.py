@@ -0,0 +1,122 @@
+import time
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from PIL import Image
+
+from posts.models import Attachment
+from posts.services import (create_post, create_post_attachment,
+                            delete_post_attachments)
+from profiles.management.fake_google_drive import FakeGoogleDriveServer
+from profiles.models import ImageUploadJob
+from profiles.services.images import process_image_upload_job
+from utils.concurrency import map_in_threads
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ("Measures how long it takes to store and delete the "
+            "attachments of a post with one and with several threads, "
+            "in a local fake Drive server or in the local storage. "
+            "Only the jobs of the benchmark are processed, "
+            "all generated data is deleted")
+
+    STORAGES = {
+        "drive": "profiles.services.storages.GoogleDriveStorage",
+        "local": "profiles.services.storages.LocalStorage"
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attachments", type=int, default=5)
+        parser.add_argument("--threads", type=int, default=5)
+        parser.add_argument("--latency", type=float, default=0.2,
+                            help="Seconds each Drive request takes")
+        parser.add_argument("--size", type=int, default=1024,
+                            help="Width and height of the images")
+        parser.add_argument("--storage", choices=self.STORAGES,
+                            default="drive")
+
+    def handle(self, *args, **options):
+        # The worker threads only see committed data, so the data is
+        # deleted at the end instead of being rolled back. The login is
+        # generated, so the benchmark never touches an existing user
+        suffix = get_random_string(12).lower()
+        author = User.objects.create_user(
+            login=f"images-benchmark-{suffix}",
+            email=f"images-{suffix}@benchmark.local", password=None)
+
+        storage = self.STORAGES[options["storage"]]
+
+        try:
+            with FakeGoogleDriveServer(options["latency"]) as server, \
+                    TemporaryDirectory() as directory, override_settings(
+                        IMAGE_STORAGE_BACKEND=storage,
+                        IMAGE_STORAGE_LOCAL_ROOT=Path(directory),
+                        GOOGLE_DRIVE_API_ROOT_URL=server.root_url,
+                        IMAGE_THREAD_POOL_SIZE=options["threads"]):
+                for threads in sorted({1, options["threads"]}):
+                    self.run(author, threads, options)
+        finally:
+            author.delete()
+
+    def run(self, author, threads, options):
+        post = create_post(author, "")
+        for _ in range(options["attachments"]):
+            create_post_attachment(post, self.generate_image(options["size"]))
+
+        jobs = self.claim_jobs(post)
+
+        started_at = time.perf_counter()
+        map_in_threads(process_image_upload_job, jobs, threads)
+        processing_time = time.perf_counter() - started_at
+
+        ready = Attachment.objects.filter(
+            post=post, status=Attachment.Status.READY).count()
+
+        with override_settings(IMAGE_THREAD_POOL_SIZE=threads):
+            started_at = time.perf_counter()
+            delete_post_attachments(post)
+            deletion_time = time.perf_counter() - started_at
+
+        self.stdout.write(
+            f"{threads} thread(s): {ready} attachments stored in "
+            f"{processing_time * 1000:.0f} ms, "
+            f"deleted in {deletion_time * 1000:.0f} ms"
+        )
+
+    def claim_jobs(self, post):
+        """
+        Claims the jobs of the post attachments like the workers do,
+        the jobs of the users are left to the workers
+        """
+        jobs_ids = ImageUploadJob.objects.filter(
+            content_type=ContentType.objects.get_for_model(Attachment),
+            object_id__in=Attachment.objects.filter(post=post).values("id")
+        ).values_list("id", flat=True)
+
+        claimed_jobs_ids = [
+            job_id for job_id in jobs_ids
+            if ImageUploadJob.objects.filter(
+                id=job_id, status=ImageUploadJob.Status.PENDING
+            ).update(status=ImageUploadJob.Status.RUNNING,
+                     updated_at=timezone.now())
+        ]
+
+        return list(ImageUploadJob.objects.filter(id__in=claimed_jobs_ids))
+
+    def generate_image(self, size):
+        buffer = BytesIO()
+        Image.effect_noise((size, size), 64).convert("RGB").save(
+            buffer, "JPEG", quality=95)
+
+        return SimpleUploadedFile("image.jpg", buffer.getvalue(),
+                                  "image/jpeg")
@@ -0,0 +1,73 @@
+import statistics
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from profiles.services.images import decode_image, resize_image
+
+
+class Command(BaseCommand):
+    help = ("Measures the CPU time per megapixel of decoding and resizing "
+            "generated JPEG photos into the variants, decoded at full size "
+            "and decoded once in draft mode. Encoding is not measured, "
+            "it is the same for both")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--megapixels", type=float, nargs="+",
+                            default=[2, 12, 24])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        for megapixels in options["megapixels"]:
+            data = self.generate_photo(megapixels)
+
+            for name, process in (("full decode", self.full_decode),
+                                  ("draft decode", self.draft_decode)):
+                timings = []
+                for _ in range(options["repeat"]):
+                    started_at = time.process_time()
+                    process(BytesIO(data))
+                    timings.append((time.process_time() - started_at) * 1000)
+
+                median = statistics.median(timings)
+                self.stdout.write(
+                    f"{megapixels:g} MP, {name}: median {median:.0f} ms, "
+                    f"{median / megapixels:.1f} ms per megapixel"
+                )
+
+    def generate_photo(self, megapixels):
+        """
+        Returns a 4:3 JPEG with noise, noise is harder to
+        compress and decode than a plain color
+        """
+        width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+        height = width * 3 // 4
+        image = Image.merge("RGB", [
+            Image.effect_noise((width, height), sigma)
+            for sigma in (32, 64, 96)
+        ])
+
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=90)
+
+        return buffer.getvalue()
+
+    def full_decode(self, file):
+        image = Image.open(file)
+        image.load()
+
+        return [resize_image(image, side)
+                for side in settings.IMAGE_VARIANTS.values()]
+
+    def draft_decode(self, file):
+        image = decode_image(file, max(settings.IMAGE_VARIANTS.values()))
+
+        resized_images = []
+        for side in sorted(settings.IMAGE_VARIANTS.values(), reverse=True):
+            image = resize_image(image, side)
+            resized_images.append(image)
+
+        return resized_images
@@ -0,0 +1,68 @@
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Imports everything a server process loads before serving the first request
+STARTUP_SCRIPT = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+
+class Command(BaseCommand):
+    help = ("Measures the import time of the project with "
+            "python -X importtime and lists the slowest top level imports")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--max-ms", type=float,
+            help="Fail if the median import time is longer")
+
+    def handle(self, *args, **options):
+        runs = [self.measure() for _ in range(options["repeat"])]
+        totals = [sum(run.values()) for run in runs]
+        median_total = statistics.median(totals)
+
+        self.stdout.write(f"Import time: median {median_total:.0f} ms, "
+                          f"min {min(totals):.0f} ms")
+
+        # The slowest top level imports of the median run
+        run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+        for name, ms in sorted(run.items(), key=lambda i: -i[1])[
+                :options["top"]]:
+            self.stdout.write(f"{ms:8.1f} ms  {name}")
+
+        if options["max_ms"] is not None and median_total > options["max_ms"]:
+            raise CommandError(
+                f"Import time {median_total:.0f} ms is longer than "
+                f"{options['max_ms']:.0f} ms")
+
+    def measure(self):
+        """
+        Returns the cumulative import time in ms of each top level import
+        """
+        result = subprocess.run(
+            (sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT),
+            capture_output=True, text=True, cwd=settings.BASE_DIR
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr)
+
+        imports = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+
+            _, cumulative, name = line.split("|")
+            # Nested imports are indented
+            if not name[1:].startswith(" "):
+                imports[name.strip()] = int(cumulative) / 1000
+
+        return imports
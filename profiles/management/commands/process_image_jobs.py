@@ -0,0 +1,57 @@
+from threading import Lock
+from time import sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from profiles.services.images import (claim_image_upload_job,
+                                      fail_image_upload_job,
+                                      process_image_upload_job)
+from utils.cache import is_cache_shared
+from utils.concurrency import map_in_threads
+
+
+class Command(BaseCommand):
+    help = "Encodes and stores uploaded avatars, banners and attachments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Exit when there are no more jobs instead of waiting")
+        parser.add_argument(
+            "--threads", type=int, default=settings.IMAGE_THREAD_POOL_SIZE,
+            help="Number of jobs processed concurrently")
+
+    def handle(self, *args, **options):
+        self.output_lock = Lock()
+
+        if not is_cache_shared():
+            self.stderr.write(
+                "The cache is not shared with the web server, the cached "
+                "profiles will show the stored images only after "
+                "PROFILE_RESPONSES_CACHE_TTL seconds(see CACHE_BACKEND)")
+
+        map_in_threads(lambda _: self.work(options["once"]),
+                       range(options["threads"]), options["threads"])
+
+    def work(self, once):
+        while True:
+            job = claim_image_upload_job()
+
+            if job is None:
+                if once:
+                    return
+                sleep(settings.IMAGE_UPLOAD_WORKER_POLL_INTERVAL)
+                continue
+
+            try:
+                process_image_upload_job(job)
+            except Exception as e:
+                fail_image_upload_job(job, e)
+                self.write(self.stderr, f"Job #{job.id} failed: {e}")
+            else:
+                self.write(self.stdout, f"Job #{job.id} processed")
+
+    def write(self, stream, message):
+        with self.output_lock:
+            stream.write(message)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from profiles.services.documents import rebuild_profiles_documents
+
+
+class Command(BaseCommand):
+    help = ("Rebuilds the documents read by the profile endpoints "
+            "from the profile tables")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        documents_count = rebuild_profiles_documents(options["chunk_size"])
+        self.stdout.write(f"Rebuilt {documents_count} profile documents")
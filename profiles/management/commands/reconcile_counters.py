@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.services import reconcile_likes_counts
+from profiles.services.counters import reconcile_profiles_counters
+
+
+class Command(BaseCommand):
+    help = ("Fixes drifted likes counters of posts and "
+            "followers/following/posts counters of profiles")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        fixed_posts_count = reconcile_likes_counts(chunk_size)
+        self.stdout.write(f"Fixed likes counters of {fixed_posts_count} posts")
+
+        fixed_profiles_count = reconcile_profiles_counters(chunk_size)
+        self.stdout.write(
+            f"Fixed counters of {fixed_profiles_count} profiles")
@@ -0,0 +1,94 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from threading import Lock, Thread
+from time import sleep
+from urllib.parse import urlsplit
+
+
+class FakeGoogleDriveRequestHandler(BaseHTTPRequestHandler):
+    """
+    Implements the part of the Drive v3 API used by GoogleDriveAPI:
+    resumable uploads, permissions and deletion of files
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, data=None, headers=()):
+        body = json.dumps(data).encode() if data is not None else b""
+
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length)
+
+    def do_POST(self):
+        self.read_body()
+        sleep(self.server.latency)
+        path = urlsplit(self.path).path
+
+        if path.endswith("/permissions"):
+            self.respond(200, {"id": "anyoneWithLink"})
+        elif "upload" in path:
+            location = f"{self.server.root_url}session/{self.server.new_id()}"
+            self.respond(200, {}, headers=(("Location", location),))
+        else:
+            self.respond(404, {"error": "Not found"})
+
+    def do_PUT(self):
+        self.server.add_uploaded_bytes(len(self.read_body()))
+        sleep(self.server.latency)
+        file_id = urlsplit(self.path).path.rsplit("/", 1)[-1]
+
+        self.respond(200, {"id": file_id, "webContentLink": ""})
+
+    def do_DELETE(self):
+        sleep(self.server.latency)
+        self.respond(204)
+
+
+class FakeGoogleDriveServer(ThreadingHTTPServer):
+    """
+    Local Drive API emulator for the benchmarks, each request
+    takes at least latency seconds like a remote round trip
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0):
+        super().__init__(("127.0.0.1", 0), FakeGoogleDriveRequestHandler)
+        self.latency = latency
+        self.uploaded_bytes = 0
+        self._ids = count(1)
+        self._lock = Lock()
+
+    @property
+    def root_url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}/"
+
+    def new_id(self):
+        with self._lock:
+            return f"fake{next(self._ids)}"
+
+    def add_uploaded_bytes(self, size):
+        with self._lock:
+            self.uploaded_bytes += size
+
+    def __enter__(self):
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    counts = queryset.filter(**{field: OuterRef("pk")}).order_by().values(
+        field).annotate(count=Count("pk")).values("count")
+    return Coalesce(Subquery(counts), 0)
+
+
+def count_followers_and_posts(apps, schema_editor):
+    Follower = apps.get_model("followers", "Follower")
+    Post = apps.get_model("posts", "Post")
+    Profile = apps.get_model("profiles", "Profile")
+
+    Profile.objects.update(
+        followers_count=count_subquery(
+            Follower.objects.all(), "following_user"),
+        following_count=count_subquery(
+            Follower.objects.all(), "follower_user"),
+        posts_count=count_subquery(Post.objects.all(), "author")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('followers', '0002_initial'),
+        ('posts', '0002_initial'),
+        ('profiles', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_followers_and_posts,
+                             migrations.RunPython.noop),
+    ]
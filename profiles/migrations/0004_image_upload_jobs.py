@@ -0,0 +1,54 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('profiles', '0003_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='avatar',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='banner',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ImageUploadJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('data', models.BinaryField()),
+                ('name', models.CharField(max_length=255)),
+                ('mime_type', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'image upload job',
+                'verbose_name_plural': 'image upload jobs',
+                'db_table': 'image_upload_jobs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='imageuploadjob',
+            index=models.Index(fields=['status', 'id'], name='image_uploa_status_5e56ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imageuploadjob',
+            index=models.Index(fields=['content_type', 'object_id'], name='image_uploa_content_1687c3_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_image_upload_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='avatar',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='banner',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
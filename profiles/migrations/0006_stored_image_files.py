@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0005_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImageFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('file_id', models.CharField(max_length=50, unique=True)),
+                ('link', models.URLField(max_length=300)),
+                ('references', models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'stored image file',
+                'verbose_name_plural': 'stored image files',
+                'db_table': 'stored_image_files',
+            },
+        ),
+    ]
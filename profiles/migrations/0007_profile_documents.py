@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_login_trigrams'),
+        ('profiles', '0006_stored_image_files'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_document', serialize=False, to='users.user')),
+                ('login', models.SlugField(unique=True)),
+                ('data', models.JSONField()),
+            ],
+            options={
+                'verbose_name': 'profile document',
+                'verbose_name_plural': 'profiles documents',
+                'db_table': 'profiles_documents',
+            },
+        ),
+    ]
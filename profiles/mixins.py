@@ -1,9 +1,10 @@
 from django.core.files import File
 from rest_framework.response import Response
+from rest_framework.status import HTTP_202_ACCEPTED
 
 from utils.exceptions import BadRequest400
 
-from .services.images import update_instance_image
+from .services.images import update_instance_image, validate_uploaded_image
 
 
 class UpdateImageMixin:
@@ -11,7 +12,7 @@ class UpdateImageMixin:
 
     def is_file_an_image(self, image):
         if isinstance(image, File):
-            return image.content_type.split("/")[0] == "image"
+            return validate_uploaded_image(image)
         return False
 
     def put(self, request):
@@ -21,7 +22,11 @@ class UpdateImageMixin:
             instance = self.get_object(request)
             link_to_image = update_instance_image(instance, image)
 
-            return Response({self.image_field: link_to_image})
+            # The image is stored by the worker, until then
+            # the link points to the previous image
+            return Response({self.image_field: link_to_image,
+                             "status": instance.status},
+                            status=HTTP_202_ACCEPTED)
 
         raise BadRequest400("Image not provided",
                             {self.image_field: ["Image not provided"]})
@@ -1,10 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.fields import (GenericForeignKey,
+                                                GenericRelation)
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
+from utils.models import DirtyFieldsMixin
+
 User = get_user_model()
 
 
-class Profile(models.Model):
+class Profile(DirtyFieldsMixin, models.Model):
     user = models.OneToOneField(
         User, primary_key=True, on_delete=models.CASCADE)
 
@@ -18,6 +23,10 @@ class Profile(models.Model):
     birthday = models.DateField(null=True, blank=True)
     theme = models.CharField(max_length=250, blank=True)
 
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    posts_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         verbose_name = "profile"
         verbose_name_plural = "profiles"
@@ -27,7 +36,30 @@ class Profile(models.Model):
         return f"{self.user.login} profile"
 
 
-class ProfileRelatedModel(models.Model):
+class ProfileDocument(models.Model):
+    """
+    Denormalized profile read by the profile endpoints in a single
+    lookup, rebuilt whenever the profile, its contacts, avatar or
+    banner, the login or the admin status or the ban of the user change
+    """
+    user = models.OneToOneField(
+        User, primary_key=True, related_name="profile_document",
+        on_delete=models.CASCADE)
+
+    login = models.SlugField(max_length=50, unique=True)
+    # The profile serialized by ProfileDocumentDataSerializer
+    data = models.JSONField()
+
+    class Meta:
+        verbose_name = "profile document"
+        verbose_name_plural = "profiles documents"
+        db_table = "profiles_documents"
+
+    def __str__(self):
+        return f"{self.login} profile document"
+
+
+class ProfileRelatedModel(DirtyFieldsMixin, models.Model):
     profile = models.OneToOneField(
         Profile, on_delete=models.CASCADE, unique=True)
 
@@ -36,12 +68,35 @@ class ProfileRelatedModel(models.Model):
 
 
 class ImageModel(models.Model):
+    class Status(models.TextChoices):
+        PROCESSING = "processing"
+        READY = "ready"
+        FAILED = "failed"
+
     file_id = models.CharField(max_length=50, blank=True)
     link = models.URLField(max_length=300, blank=True)
+    # The file_id and link point to the previous image
+    # until the uploaded one has been processed
+    status = models.CharField(max_length=10, choices=Status.choices,
+                              default=Status.READY)
+    # Resized copies of the image, {size: {format: {file_id, link}}},
+    # file_id and link are the ones of the full size JPEG. Variants
+    # with the same content(e.g. of small images) share the file
+    variants = models.JSONField(default=dict, blank=True)
+
+    upload_jobs = GenericRelation("profiles.ImageUploadJob")
 
     class Meta:
         abstract = True
 
+    def get_variant_link(self, size, format="jpeg"):
+        """
+        Returns the link of the variant, images without
+        variants(e.g. GIFs) have only the link of the original
+        """
+        variant = self.variants.get(size, {}).get(format)
+        return variant["link"] if variant else self.link
+
 
 class Avatar(ProfileRelatedModel, ImageModel):
     class Meta:
@@ -75,3 +130,64 @@ class Contacts(ProfileRelatedModel):
 
     def __str__(self):
         return f"{self.profile.user.login} contacts"
+
+
+class ImageUploadJob(models.Model):
+    """
+    Uploaded image waiting to be encoded and stored
+    by the process_image_jobs worker
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        FAILED = "failed"
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    image = GenericForeignKey("content_type", "object_id")
+
+    data = models.BinaryField()
+    name = models.CharField(max_length=255)
+    mime_type = models.CharField(max_length=100)
+
+    status = models.CharField(max_length=10, choices=Status.choices,
+                              default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "image upload job"
+        verbose_name_plural = "image upload jobs"
+        db_table = "image_upload_jobs"
+        indexes = (
+            models.Index(fields=("status", "id")),
+            models.Index(fields=("content_type", "object_id")),
+        )
+
+    def __str__(self):
+        return f"Upload of {self.name} ({self.status})"
+
+
+class StoredImageFile(models.Model):
+    """
+    File in the image storage, identical files are stored once
+    and deleted from the storage with their last reference
+    """
+
+    # SHA-256 of the stored bytes
+    content_hash = models.CharField(max_length=64, unique=True)
+    file_id = models.CharField(max_length=50, unique=True)
+    link = models.URLField(max_length=300)
+    # Number of the images and variants using the file
+    references = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        verbose_name = "stored image file"
+        verbose_name_plural = "stored image files"
+        db_table = "stored_image_files"
+
+    def __str__(self):
+        return f"{self.file_id} ({self.references} references)"
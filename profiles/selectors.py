@@ -1,16 +1,11 @@
 from django.core.exceptions import ObjectDoesNotExist
 
-from utils.exceptions import NotFound404
+from .models import ProfileDocument
+from .services.documents import create_profile_document
 
-from .models import Profile
 
-
-def get_profile_by_user_login(user_login):
-    return Profile.objects.get(user__login=user_login)
-
-
-def get_profile_by_user_login_or_404(user_login):
+def get_profile_document_by_user_id(user_id):
     try:
-        return get_profile_by_user_login(user_login)
+        return ProfileDocument.objects.get(user_id=user_id)
     except ObjectDoesNotExist:
-        raise NotFound404("Invalid login, user is not found")
+        return create_profile_document(user_id)
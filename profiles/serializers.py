@@ -3,6 +3,7 @@ from rest_framework import serializers
 from bans.services import check_if_user_is_banned
 
 from .models import Contacts, Profile
+from .services.images import validate_uploaded_image
 
 
 def generate_error_messages(field_name):
@@ -18,6 +19,43 @@ def generate_error_messages(field_name):
     }
 
 
+def get_accepted_image_format(context):
+    """
+    Returns WebP if the client has announced
+    support for it in the Accept header, JPEG otherwise
+    """
+    request = context.get("request")
+    accept = request.META.get("HTTP_ACCEPT", "") if request else ""
+
+    return "webp" if "image/webp" in accept else "jpeg"
+
+
+def get_image_link(image, size, context):
+    """
+    Returns the link of the image variant of the size
+    in the format accepted by the client
+    """
+    return image.get_variant_link(size, get_accepted_image_format(context))
+
+
+class UploadedImageField(serializers.FileField):
+    """
+    Unlike serializers.ImageField only reads the header of the image,
+    the pixels are decoded once by the process_image_jobs worker
+    """
+    default_error_messages = {
+        "invalid_image": "Upload a valid image"
+    }
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+
+        if not validate_uploaded_image(file):
+            self.fail("invalid_image")
+
+        return file
+
+
 class ContactsSerializer(serializers.ModelSerializer):
     mainLink = serializers.SerializerMethodField()
 
@@ -64,10 +102,10 @@ class ProfileSerializer(serializers.ModelSerializer):
         return obj.about_me
 
     def get_avatar(self, obj):
-        return obj.avatar.link
+        return get_image_link(obj.avatar, "medium", self.context)
 
     def get_banner(self, obj):
-        return obj.banner.link
+        return get_image_link(obj.banner, "full", self.context)
 
     class Meta:
         model = Profile
@@ -84,6 +122,53 @@ class AuthenticatedUserProfileSerializer(ProfileSerializer):
                   "aboutMe", "theme", "avatar", "banner", "contacts")
 
 
+class ProfileDocumentDataSerializer(ProfileSerializer):
+    """
+    Serializes a profile for its ProfileDocument, the data has the fields
+    of both profile representations and the image links of every format
+    """
+
+    def get_isBanned(self, obj):
+        # The ban is loaded with the profile, the banned users
+        # set is updated only after the ban has been committed
+        return hasattr(obj.user, "ban")
+
+    def get_avatar(self, obj):
+        return {format: obj.avatar.get_variant_link("medium", format)
+                for format in ("jpeg", "webp")}
+
+    def get_banner(self, obj):
+        return {format: obj.banner.get_variant_link("full", format)
+                for format in ("jpeg", "webp")}
+
+    class Meta:
+        model = Profile
+        fields = ("id", "isLookingForAJob", "professionalSkills", "isAdmin",
+                  "fullname", "login", "status", "location", "birthday",
+                  "isBanned", "aboutMe", "theme", "avatar", "banner",
+                  "contacts")
+
+
+class ProfileDocumentSerializer(serializers.BaseSerializer):
+    """
+    Represents a ProfileDocument as ProfileSerializer
+    represents the profile, without reading the profile tables
+    """
+    profile_fields = ProfileSerializer.Meta.fields
+
+    def to_representation(self, instance):
+        data = {field: instance.data[field] for field in self.profile_fields}
+        format = get_accepted_image_format(self.context)
+        data["avatar"] = data["avatar"][format]
+        data["banner"] = data["banner"][format]
+
+        return data
+
+
+class AuthenticatedUserProfileDocumentSerializer(ProfileDocumentSerializer):
+    profile_fields = AuthenticatedUserProfileSerializer.Meta.fields
+
+
 class UpdateContactsSerializer(serializers.Serializer):
     github, vk, facebook, instagram, twitter, website, youtube, mainLink = [
         serializers.URLField(
@@ -234,6 +319,6 @@ class UpdatePasswordSerailizer(serializers.Serializer):
 
     def update(self, instance, validated_data):
         instance.set_password(validated_data["newPassword1"])
-        instance.save()
+        instance.save(update_fields=("password",))
 
         return instance
@@ -0,0 +1,73 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from followers.models import Follower
+from posts.models import Post
+
+from ..models import Profile
+
+PROFILE_COUNTERS = ("followers_count", "following_count", "posts_count")
+
+
+def increment_profile_counter(user_id, counter):
+    Profile.objects.filter(user_id=user_id).update(**{
+        counter: F(counter) + 1
+    })
+
+
+def decrement_profile_counter(user_id, counter):
+    Profile.objects.filter(user_id=user_id, **{f"{counter}__gt": 0}).update(**{
+        counter: F(counter) - 1
+    })
+
+
+def count_subquery(queryset, field):
+    counts = queryset.filter(**{field: OuterRef("pk")}).order_by().values(
+        field).annotate(count=Count("pk")).values("count")
+    return Coalesce(Subquery(counts), 0)
+
+
+def get_actual_profile_counters():
+    return {
+        "followers_count": count_subquery(
+            Follower.objects.all(), "following_user"),
+        "following_count": count_subquery(
+            Follower.objects.all(), "follower_user"),
+        "posts_count": count_subquery(Post.objects.all(), "author")
+    }
+
+
+def reconcile_profiles_counters(chunk_size=1000):
+    """
+    Recalculates the counters of the profiles whose counters have drifted,
+    profiles are processed in chunks by primary key.
+    Returns the number of fixed profiles
+    """
+    actual_counters = get_actual_profile_counters()
+    fixed_profiles_count = 0
+    last_id = 0
+
+    while True:
+        chunk = list(Profile.objects.filter(user_id__gt=last_id).order_by(
+            "user_id"
+        ).annotate(**{
+            f"actual_{counter}": expression
+            for counter, expression in actual_counters.items()
+        }).values("user_id", *PROFILE_COUNTERS, *(
+            f"actual_{counter}" for counter in PROFILE_COUNTERS
+        ))[:chunk_size])
+
+        if not chunk:
+            return fixed_profiles_count
+
+        last_id = chunk[-1]["user_id"]
+        drifted_ids = [
+            row["user_id"] for row in chunk
+            if any(row[c] != row[f"actual_{c}"] for c in PROFILE_COUNTERS)
+        ]
+
+        if drifted_ids:
+            # Counters are recalculated by the UPDATE itself,
+            # so changes made since the chunk was read are not lost
+            fixed_profiles_count += Profile.objects.filter(
+                user_id__in=drifted_ids).update(**actual_counters)
@@ -0,0 +1,93 @@
+from django.db import IntegrityError, transaction
+
+from ..cache import profile_responses
+from ..models import Profile, ProfileDocument
+from ..serializers import ProfileDocumentDataSerializer
+
+
+def get_profiles_for_documents():
+    # Profiles whose rows are being deleted(e.g. with the user) are skipped
+    return Profile.objects.filter(
+        contacts__isnull=False, avatar__isnull=False, banner__isnull=False
+    ).select_related("user__ban", "contacts", "avatar", "banner")
+
+
+def build_profile_document(profile):
+    return ProfileDocument(
+        user_id=profile.user_id, login=profile.user.login,
+        data=ProfileDocumentDataSerializer(profile).data)
+
+
+def create_profiles_documents(users_ids):
+    """
+    Creates the documents of the new profiles, a single
+    SELECT and a single INSERT for all the profiles
+    """
+    return ProfileDocument.objects.bulk_create(
+        build_profile_document(profile)
+        for profile in get_profiles_for_documents().filter(
+            user_id__in=users_ids))
+
+
+def create_profile_document(user_id):
+    """
+    Creates the document of a profile that hasn't got one, e.g. created
+    before the documents were added. Raises Profile.DoesNotExist
+    if there is no profile
+    """
+    document = build_profile_document(
+        get_profiles_for_documents().get(user_id=user_id))
+
+    try:
+        with transaction.atomic():
+            document.save(force_insert=True)
+    except IntegrityError:
+        # Created by a concurrent request
+        return ProfileDocument.objects.get(user_id=user_id)
+
+    return document
+
+
+def update_profile_document(user_id):
+    """
+    Rebuilds the document of the profile, a missing document is not
+    created(e.g. of a user being deleted), it is created on the first read
+    """
+    profile_responses.bump_version(user_id)
+    profile = get_profiles_for_documents().filter(user_id=user_id).first()
+
+    if profile is not None:
+        document = build_profile_document(profile)
+        ProfileDocument.objects.filter(user_id=user_id).update(
+            login=document.login, data=document.data)
+
+
+def rebuild_profiles_documents(chunk_size=1000):
+    """
+    Rebuilds the documents of all the profiles in chunks by primary key,
+    e.g. after the profile tables have been changed bypassing the signals.
+    Returns the number of the documents
+    """
+    documents_count = 0
+    last_id = 0
+
+    while True:
+        profiles = list(get_profiles_for_documents().filter(
+            user_id__gt=last_id).order_by("user_id")[:chunk_size])
+
+        if not profiles:
+            return documents_count
+
+        last_id = profiles[-1].user_id
+        documents = [build_profile_document(p) for p in profiles]
+
+        with transaction.atomic():
+            ProfileDocument.objects.filter(user_id__in=[
+                document.user_id for document in documents
+            ]).delete()
+            ProfileDocument.objects.bulk_create(documents)
+
+            for document in documents:
+                profile_responses.bump_version(document.user_id)
+
+        documents_count += len(documents)
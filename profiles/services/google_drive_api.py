@@ -1,11 +1,13 @@
 import enum
+import json
+from functools import lru_cache
+from threading import local
 
 from django.conf import settings
 from django.utils.crypto import get_random_string
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+
+# googleapiclient and google.auth are imported when the first client is
+# created, they take a large part of the startup time of the process
 
 
 class GoogleDrivePermissionType(enum.Enum):
@@ -54,16 +56,27 @@ class GoogleDriveAPI:
     COMMON_LINK_TO_FILE = "https://drive.google.com/uc?id="
 
     def __init__(self):
-        SCOPES = ("https://www.googleapis.com/auth/drive",)
+        from googleapiclient.discovery import build_from_document
+
+        document = get_discovery_document()
+        root_url = settings.GOOGLE_DRIVE_API_ROOT_URL
+
+        if root_url:
+            from httplib2 import Http
 
-        json_keyfile_path = settings.GOOGLE_DRIVE_STORAGE_JSON_KEY_FILE
-        credentials = service_account.Credentials.from_service_account_file(
-            json_keyfile_path, scopes=SCOPES)
+            # Uploads use the rootUrl of the discovery document,
+            # so the document is changed instead of the api endpoint
+            self._drive_service = build_from_document(
+                {**document, "rootUrl": root_url}, http=Http())
+        else:
+            self._drive_service = build_from_document(
+                document, credentials=get_credentials())
 
-        self._drive_service = build("drive", "v3", credentials=credentials)
+    def upload_file(self, file, mime_type, permissions=()):
+        from googleapiclient.http import MediaIoBaseUpload
 
-    def upload_file(self, path, permissions=()):
-        media = MediaFileUpload(path, resumable=True)
+        # The file object is streamed by chunks, no temporary file is needed
+        media = MediaIoBaseUpload(file, mime_type, resumable=True)
         file_name = get_random_string(length=48)
         file_metadata = {
             "name": file_name,
@@ -92,8 +105,54 @@ class GoogleDriveAPI:
         return response["id"], link_to_image
 
     def delete_file(self, file_id):
+        from googleapiclient.errors import HttpError
+
         try:
             self._drive_service.files().delete(fileId=file_id).execute()
         except HttpError as e:
             if e.status_code != 404:
                 raise e
+
+
+@lru_cache(maxsize=None)
+def get_discovery_document():
+    """
+    Returns the Drive v3 discovery document shipped with googleapiclient,
+    it's read from the disk instead of being requested from Google and
+    parsed once per process
+    """
+    from googleapiclient.discovery_cache import get_static_doc
+
+    return json.loads(get_static_doc("drive", "v3"))
+
+
+@lru_cache(maxsize=None)
+def get_credentials():
+    """
+    Returns the service account credentials shared by the clients
+    of all threads, the key file is read and parsed once per process
+    """
+    from google.oauth2 import service_account
+
+    SCOPES = ("https://www.googleapis.com/auth/drive",)
+
+    return service_account.Credentials.from_service_account_file(
+        settings.GOOGLE_DRIVE_STORAGE_JSON_KEY_FILE, scopes=SCOPES)
+
+
+_clients = local()
+
+
+def get_google_drive():
+    """
+    Returns the GoogleDriveAPI of the current thread, it's created on
+    the first use. The googleapiclient service objects are not
+    thread-safe, but the credentials and the discovery document
+    are shared by the whole process
+    """
+    google_drive = getattr(_clients, "google_drive", None)
+
+    if google_drive is None:
+        google_drive = _clients.google_drive = GoogleDriveAPI()
+
+    return google_drive
@@ -1,49 +1,392 @@
-from os import remove
+from collections import Counter
+from datetime import timedelta
+from hashlib import sha256
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
 
 from django.conf import settings
-from django.core.files.storage import default_storage
-from PIL import Image
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, Q
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
 
-from .google_drive_api import GoogleDriveAPI
+from utils.concurrency import map_in_threads
 
-google_drive = GoogleDriveAPI()
+from ..models import ImageModel, ImageUploadJob, StoredImageFile
+from .storages import get_image_storage
+
+# Sent with the model of the image and its primary key when the worker
+# has stored an uploaded image, the image is changed by an UPDATE
+# so post_save is not sent
+image_stored = Signal()
 
 
 def update_instance_image(instance, file):
-    if instance.file_id != "":
-        google_drive.delete_file(instance.file_id)
+    """
+    Queues the file to be uploaded as the instance image,
+    the instance stays in the processing status until
+    the process_image_jobs worker has stored the file
+    """
+    content_type = ContentType.objects.get_for_model(instance)
+
+    with transaction.atomic():
+        # Pending uploads of the same image are superseded by this one
+        ImageUploadJob.objects.filter(
+            content_type=content_type, object_id=instance.pk,
+            status=ImageUploadJob.Status.PENDING
+        ).delete()
+        ImageUploadJob.objects.create(
+            content_type=content_type, object_id=instance.pk,
+            data=b"".join(file.chunks()), name=file.name,
+            mime_type=file.content_type
+        )
+
+        instance.status = ImageModel.Status.PROCESSING
+        instance.save(update_fields=("status",))
+
+    return instance.link
+
+
+def upload_image(file, mime_type):
+    """
+    Stores the variants of the image and returns the file id and link of
+    the full size JPEG with all the variants, GIFs are stored as uploaded
+    without being decoded and have no variants
+    """
+    if mime_type == "image/gif":
+        (file_id, link), = store_image_files(
+            [(file, mime_type, hash_file(file))])
+        return file_id, link, {}
+
+    image = decode_image(file, max(settings.IMAGE_VARIANTS.values()))
+
+    # Every size is resized from the next larger one instead of the decoded
+    # image, Image.save stores the encoder options on the image so each of
+    # the concurrently encoded formats gets its own copy
+    resized_by_size = {}
+    for size, side in sorted(settings.IMAGE_VARIANTS.items(),
+                             key=lambda variant: -variant[1]):
+        image = resized_by_size[size] = resize_image(image, side)
+
+    resized_images = [
+        (size, format, resized_by_size[size].copy())
+        for size in settings.IMAGE_VARIANTS
+        for format in settings.IMAGE_VARIANTS_FORMATS
+    ]
+    encoded_files = map_in_threads(
+        lambda resized_image: encode_image_file(*resized_image[1:]),
+        resized_images, settings.IMAGE_THREAD_POOL_SIZE)
+
+    try:
+        stored_files = store_image_files(encoded_files)
+    finally:
+        for encoded_file, _, _ in encoded_files:
+            encoded_file.close()
+
+    variants = {}
+    for (size, format, _), (file_id, link) in zip(resized_images,
+                                                  stored_files):
+        variants.setdefault(size, {})[format] = {
+            "file_id": file_id, "link": link}
+
+    full_size = variants["full"]["jpeg"]
+    return full_size["file_id"], full_size["link"], variants
+
+
+def store_image_files(files):
+    """
+    Adds a reference to a stored file with the same content as each of the
+    (file object, mime type, content hash) or uploads it, returns the file
+    id and link of each of them. All or none of the files are stored
+    """
+    storage = get_image_storage()
+    references = Counter(content_hash for _, _, content_hash in files)
+    stored_files = add_image_files_references(references)
+
+    new_files = {content_hash: (file, mime_type)
+                 for file, mime_type, content_hash in files
+                 if content_hash not in stored_files}
 
-    file_id, link = upload_image(file)
+    def upload_file(new_file):
+        try:
+            return storage.upload(*new_file)
+        except Exception as e:
+            return e
 
-    instance.file_id = file_id
-    instance.link = link
-    instance.save()
+    results = map_in_threads(upload_file, new_files.values(),
+                             settings.IMAGE_THREAD_POOL_SIZE)
+    errors = [r for r in results if isinstance(r, Exception)]
 
-    return link
+    if errors:
+        storage.delete_many([r[0] for r in results
+                             if not isinstance(r, Exception)])
+        release_image_files([
+            file_id
+            for content_hash, (file_id, _) in stored_files.items()
+            for _ in range(references[content_hash])
+        ])
+        raise errors[0]
 
+    for content_hash, (file_id, link) in zip(new_files, results):
+        try:
+            with transaction.atomic():
+                StoredImageFile.objects.create(
+                    content_hash=content_hash, file_id=file_id, link=link,
+                    references=references[content_hash])
+        except IntegrityError:
+            # Another worker has stored the same content meanwhile
+            storage.delete(file_id)
+            stored_files.update(add_image_files_references(
+                {content_hash: references[content_hash]}))
+            if content_hash not in stored_files:
+                raise
+        else:
+            stored_files[content_hash] = (file_id, link)
 
-def upload_image(file):
-    path = save_image_in_media_folder(file)
+    return [stored_files[content_hash] for _, _, content_hash in files]
 
-    file_id, link = google_drive.upload_file(path)
-    remove(path)
 
-    return file_id, link
+def add_image_files_references(references):
+    """
+    Adds the number of references to the stored files with the content
+    hashes, returns the file id and link of each of the stored files
+    """
+    by_number = {}
+    for content_hash, number in references.items():
+        by_number.setdefault(number, []).append(content_hash)
 
+    for number, contents_hashes in by_number.items():
+        StoredImageFile.objects.filter(
+            content_hash__in=contents_hashes
+        ).update(references=F("references") + number)
 
-def save_image_in_media_folder(file):
+    # A file with a reference isn't deleted, so it can be read afterwards
+    return {
+        content_hash: (file_id, link)
+        for content_hash, file_id, link in StoredImageFile.objects.filter(
+            content_hash__in=references).values_list(
+            "content_hash", "file_id", "link")
+    }
+
+
+def release_image_files(files_ids):
+    """
+    Removes a reference to each of the files(a file is listed once per
+    reference), files without references left are deleted from the
+    storage. Files stored before the deduplication have no references
+    and are deleted right away
+    """
+    references = Counter(files_ids)
+    stored_files_ids = set(StoredImageFile.objects.filter(
+        file_id__in=references).values_list("file_id", flat=True))
+
+    by_number = {}
+    for file_id in stored_files_ids:
+        by_number.setdefault(references[file_id], []).append(file_id)
+
+    for number, numbered_files_ids in by_number.items():
+        StoredImageFile.objects.filter(
+            file_id__in=numbered_files_ids
+        ).update(references=F("references") - number)
+
+    unused_files_ids = [file_id for file_id in references
+                        if file_id not in stored_files_ids]
+    for file_id in stored_files_ids:
+        # A file can be referenced again until it is deleted,
+        # then a new copy of it is uploaded instead
+        deleted, _ = StoredImageFile.objects.filter(
+            file_id=file_id, references=0).delete()
+        if deleted:
+            unused_files_ids.append(file_id)
+
+    if unused_files_ids:
+        get_image_storage().delete_many(sorted(unused_files_ids))
+
+
+def validate_uploaded_image(file):
+    """
+    Reads only the header of the uploaded file, the pixels are decoded
+    once by the worker. Returns False if the file is not an image in one of
+    the IMAGE_UPLOAD_FORMATS or is larger than IMAGE_MAX_PIXELS, otherwise
+    sets the content type of the file to the one of the detected format
+    """
+    try:
+        image = Image.open(file)
+    except Exception:
+        return False
+    finally:
+        file.seek(0)
+
+    if image.format not in settings.IMAGE_UPLOAD_FORMATS or \
+            image.width * image.height > settings.IMAGE_MAX_PIXELS:
+        return False
+
+    # The content type sent by the client is not trusted
+    file.content_type = Image.MIME[image.format]
+    return True
+
+
+def decode_image(file, side):
+    """
+    Decodes the image once, downscaled while decoding as long as it still
+    fits into a square with the side without being enlarged, applies
+    the EXIF orientation and strips the metadata
+    """
     image = Image.open(file)
-    path = settings.MEDIA_ROOT / file.name
 
-    if file.content_type == "image/gif":
-        save_gif(file, path)
+    # JPEGs can be decoded at 1/2, 1/4 or 1/8 of the size which is much
+    # cheaper than decoding the full size, the draft is ignored by other
+    # formats
+    scale = max(image.size) / side
+    if scale > 1:
+        image.draft(None, (int(image.width / scale),
+                           int(image.height / scale)))
+
+    image = ImageOps.exif_transpose(image)
+    # Only the transparency is needed to encode the image
+    image.info = {key: value for key, value in image.info.items()
+                  if key == "transparency"}
+
+    return image
+
+
+def resize_image(image, side):
+    """
+    Returns a copy of the image that fits into a square with the side,
+    smaller images are not enlarged
+    """
+    resized_image = image.copy()
+    resized_image.thumbnail((side, side), Image.LANCZOS)
+
+    return resized_image
+
+
+def encode_image_file(format, image):
+    """
+    Encodes the image into a spooled file, returns
+    the file with its mime type and content hash
+    """
+    file = SpooledTemporaryFile(max_size=settings.IMAGE_SPOOL_MAX_SIZE)
+    mime_type = encode_image(image, format, file)
+
+    return file, mime_type, hash_file(file)
+
+
+def hash_file(file):
+    """
+    Returns the SHA-256 of the content of the file
+    and rewinds the file to the beginning
+    """
+    file.seek(0)
+    content_hash = sha256()
+    for chunk in iter(lambda: file.read(64 * 1024), b""):
+        content_hash.update(chunk)
+    file.seek(0)
+
+    return content_hash.hexdigest()
+
+
+def encode_image(image, format, destination):
+    """
+    Encodes the image into the destination file object
+    in the format, returns the mime type
+    """
+    format = format.upper()
+
+    if format == "JPEG" and image.mode not in ("RGB", "L"):
+        # JPEG has no transparency, transparent areas become white
+        rgba_image = image.convert("RGBA")
+        image = Image.new("RGB", rgba_image.size, "white")
+        image.paste(rgba_image, mask=rgba_image.getchannel("A"))
+
+    image.save(destination, format, optimize=True, quality=45)
+
+    return Image.MIME[format]
+
+
+def get_image_files_ids(file_id, variants):
+    """
+    Returns the ids of the stored files of an image, a file is listed once
+    per variant using it. The file of an image with variants is one of them
+    """
+    files_ids = [variant["file_id"] for formats in variants.values()
+                 for variant in formats.values()]
+
+    if not files_ids and file_id:
+        return [file_id]
+    return sorted(files_ids)
+
+
+def claim_image_upload_job():
+    """
+    Marks the oldest pending job as running and returns it,
+    returns None if there are no jobs to process
+    """
+    abandoned_at = timezone.now() - timedelta(
+        seconds=settings.IMAGE_UPLOAD_JOB_TIMEOUT)
+    claimable = Q(status=ImageUploadJob.Status.PENDING) | Q(
+        status=ImageUploadJob.Status.RUNNING, updated_at__lt=abandoned_at)
+
+    jobs_ids = ImageUploadJob.objects.filter(claimable).order_by(
+        "id").values_list("id", flat=True)[:10]
+
+    for job_id in jobs_ids:
+        # Other workers may claim the same job, only one UPDATE succeeds
+        claimed = ImageUploadJob.objects.filter(claimable, id=job_id).update(
+            status=ImageUploadJob.Status.RUNNING, updated_at=timezone.now())
+
+        if claimed:
+            return ImageUploadJob.objects.get(id=job_id)
+
+    return None
+
+
+def process_image_upload_job(job):
+    model = job.content_type.model_class()
+    file = BytesIO(job.data)
+    previous_file_id, previous_variants = model.objects.filter(
+        pk=job.object_id).values_list("file_id", "variants").first() or (
+        None, {})
+
+    file_id, link, variants = upload_image(file, job.mime_type)
+
+    # A single conditional UPDATE instead of a locking read, the image
+    # is not changed if it was deleted, replaced or a newer upload of
+    # it was queued while this one was processed
+    newer_jobs = ImageUploadJob.objects.filter(
+        content_type=job.content_type, object_id=job.object_id,
+        id__gt=job.id)
+    is_updated = model.objects.filter(
+        pk=job.object_id, file_id=previous_file_id
+    ).exclude(Exists(newer_jobs)).update(
+        file_id=file_id, link=link, variants=variants,
+        status=ImageModel.Status.READY)
+
+    job.delete()
+
+    if is_updated:
+        image_stored.send(sender=model, pk=job.object_id)
+        unused_files_ids = get_image_files_ids(
+            previous_file_id, previous_variants)
     else:
-        image.save(path, optimize=True, quality=45)
+        unused_files_ids = get_image_files_ids(file_id, variants)
+
+    release_image_files(unused_files_ids)
+
 
-    return path
+def fail_image_upload_job(job, error):
+    job.attempts += 1
+    job.error = str(error)
 
+    if job.attempts < settings.IMAGE_UPLOAD_JOB_MAX_ATTEMPTS:
+        job.status = ImageUploadJob.Status.PENDING
+        job.save(update_fields=("attempts", "error", "status", "updated_at"))
+        return
 
-def save_gif(file, path):
-    with default_storage.open(path, "wb+") as destination:
-        for chunk in file.chunks():
-            destination.write(chunk)
+    with transaction.atomic():
+        job.status = ImageUploadJob.Status.FAILED
+        job.save(update_fields=("attempts", "error", "status", "updated_at"))
+        job.content_type.model_class().objects.filter(
+            pk=job.object_id).update(status=ImageModel.Status.FAILED)
@@ -0,0 +1,25 @@
+from ..models import Avatar, Banner, Contacts, Profile
+from .documents import create_profiles_documents
+
+
+def create_profiles(users):
+    """
+    Creates the profiles of the new users with their contacts, avatars,
+    banners and documents, a single INSERT per table for all the users
+    """
+    profiles = Profile.objects.bulk_create(
+        Profile(user=user, fullname=user.login) for user in users)
+    # The profiles are cached in the users, saving a user
+    # saves only the fields of its profile changed afterwards
+    for profile in profiles:
+        profile.reset_dirty_fields()
+
+    # The profiles are not assigned to keep the rows without ids(they
+    # are not returned by bulk_create on every database) out of their cache
+    for model in (Contacts, Avatar, Banner):
+        model.objects.bulk_create(model(profile_id=profile.pk)
+                                  for profile in profiles)
+
+    create_profiles_documents([profile.pk for profile in profiles])
+
+    return profiles
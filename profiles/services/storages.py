@@ -0,0 +1,106 @@
+import re
+from functools import lru_cache
+from mimetypes import guess_extension
+from os import remove
+from pathlib import Path
+from shutil import copyfileobj
+
+from django.conf import settings
+from django.utils.crypto import get_random_string
+from django.utils.module_loading import import_string
+
+from utils.concurrency import map_in_threads
+
+from .google_drive_api import GoogleDriveAPI, get_google_drive
+
+
+class BaseImageStorage:
+    """
+    Stores the images files, implementations must be thread-safe
+    """
+
+    def upload(self, file, mime_type):
+        """
+        Stores the content of the binary file object
+        and returns the file id and link
+        """
+        raise NotImplementedError
+
+    def delete(self, file_id):
+        """
+        Deletes the file, missing files are ignored
+        """
+        raise NotImplementedError
+
+    def delete_many(self, files_ids):
+        map_in_threads(self.delete, files_ids,
+                       settings.IMAGE_THREAD_POOL_SIZE)
+
+    def get_link(self, file_id):
+        raise NotImplementedError
+
+
+class GoogleDriveStorage(BaseImageStorage):
+    def upload(self, file, mime_type):
+        return get_google_drive().upload_file(file, mime_type)
+
+    def delete(self, file_id):
+        get_google_drive().delete_file(file_id)
+
+    def get_link(self, file_id):
+        return GoogleDriveAPI.COMMON_LINK_TO_FILE + file_id
+
+
+class LocalStorage(BaseImageStorage):
+    """
+    Keeps the files in IMAGE_STORAGE_LOCAL_ROOT, they are served
+    by the retrieve_local_image view
+    """
+
+    FILE_ID_PATTERN = re.compile(r"[A-Za-z0-9]+(\.[A-Za-z0-9]+)?")
+
+    @property
+    def root(self):
+        return Path(settings.IMAGE_STORAGE_LOCAL_ROOT)
+
+    def is_file_id_valid(self, file_id):
+        return self.FILE_ID_PATTERN.fullmatch(file_id) is not None
+
+    def get_path(self, file_id):
+        if not self.is_file_id_valid(file_id):
+            raise ValueError("Invalid file id")
+
+        return self.root / file_id
+
+    def upload(self, file, mime_type):
+        # Ids with the extension must fit into the 50 characters
+        # of the file_id columns
+        file_id = get_random_string(length=40) + (
+            guess_extension(mime_type) or "")
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.get_path(file_id), "xb") as destination:
+            copyfileobj(file, destination)
+
+        return file_id, self.get_link(file_id)
+
+    def delete(self, file_id):
+        try:
+            remove(self.get_path(file_id))
+        except FileNotFoundError:
+            pass
+
+    def get_link(self, file_id):
+        return settings.IMAGE_STORAGE_LOCAL_URL + file_id
+
+
+@lru_cache(maxsize=None)
+def get_image_storage_class(import_path):
+    return import_string(import_path)
+
+
+def get_image_storage():
+    """
+    Returns the storage selected by the IMAGE_STORAGE_BACKEND setting
+    """
+    return get_image_storage_class(settings.IMAGE_STORAGE_BACKEND)()
@@ -1,26 +1,88 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from bans.models import Ban
+
+from .cache import profile_responses
 from .models import Avatar, Banner, Contacts, Profile
+from .services.documents import update_profile_document
+from .services.images import image_stored
+from .services.profiles import create_profiles
 
 User = get_user_model()
 
+# Fields of the users and images shown by the profile documents
+USER_DOCUMENT_FIELDS = {"login", "is_staff"}
+IMAGE_DOCUMENT_FIELDS = {"file_id", "link", "variants"}
+
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     if created:
-        profile = Profile(user=instance, fullname=instance.login)
-        profile.save()
+        create_profiles([instance])
+
+
+@receiver(post_save, sender=User)
+def save_profile(sender, instance, created, **kwargs):
+    """
+    Saves the changes of the profile rows loaded through the user,
+    rows that haven't been loaded can't have changes
+    """
+    # The rows of a new profile have just been created
+    if created or not User.profile.is_cached(instance):
+        return
 
-        Contacts(profile=profile).save()
-        Avatar(profile=profile).save()
-        Banner(profile=profile).save()
+    profile = instance.profile
+    profile.save()
+
+    for related_name in ("contacts", "avatar", "banner"):
+        if getattr(Profile, related_name).is_cached(profile):
+            getattr(profile, related_name).save()
 
 
 @receiver(post_save, sender=User)
-def save_profile(sender, instance, **kwargs):
-    instance.profile.save()
-    instance.profile.contacts.save()
-    instance.profile.avatar.save()
-    instance.profile.banner.save()
+def update_user_profile_document(sender, instance, created,
+                                 update_fields=None, **kwargs):
+    # The document of a new profile is created with the profile
+    if not created and (update_fields is None or
+                        USER_DOCUMENT_FIELDS.intersection(update_fields)):
+        update_profile_document(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def delete_profile_responses(sender, instance, **kwargs):
+    profile_responses.bump_version(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def update_profile_document_on_profile_save(sender, instance, **kwargs):
+    update_profile_document(instance.user_id)
+
+
+@receiver(post_save, sender=Contacts)
+def update_profile_document_on_contacts_save(sender, instance, **kwargs):
+    update_profile_document(instance.profile_id)
+
+
+@receiver(post_save, sender=Avatar)
+@receiver(post_save, sender=Banner)
+def update_profile_document_on_image_save(sender, instance,
+                                          update_fields=None, **kwargs):
+    # E.g. the status of a queued upload is not shown
+    if update_fields is None or \
+            IMAGE_DOCUMENT_FIELDS.intersection(update_fields):
+        update_profile_document(instance.profile_id)
+
+
+@receiver(image_stored, sender=Avatar)
+@receiver(image_stored, sender=Banner)
+def update_profile_document_on_image_stored(sender, pk, **kwargs):
+    update_profile_document(
+        sender.objects.values_list("profile_id", flat=True).get(pk=pk))
+
+
+@receiver(post_save, sender=Ban)
+@receiver(post_delete, sender=Ban)
+def update_profile_document_on_ban_change(sender, instance, **kwargs):
+    update_profile_document(instance.receiver_id)
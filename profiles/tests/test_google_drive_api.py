@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from threading import Thread
+from unittest.mock import patch
+
+from django.conf import settings
+
+from utils.tests import ExtendedTestCase
+
+from ..services.google_drive_api import get_google_drive
+
+
+class GetGoogleDriveTestCase(ExtendedTestCase):
+    @patch("profiles.services.google_drive_api.GoogleDriveAPI",
+           side_effect=object)
+    def test_client_per_thread(self, GoogleDriveAPI):
+        clients = []
+        threads = [Thread(target=lambda: clients.append(
+            (get_google_drive(), get_google_drive()))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        (first, first_again), (second, second_again) = clients
+        self.assertIs(first, first_again)
+        self.assertIs(second, second_again)
+        self.assertIsNot(first, second)
+
+    def test_client_is_not_loaded_at_startup(self):
+        """
+        googleapiclient should only be imported when an image is stored
+        """
+        script = (
+            "import sys, django\n"
+            "django.setup()\n"
+            "from django.urls import get_resolver\n"
+            "get_resolver().url_patterns\n"
+            "print(sorted(m for m in sys.modules if m.startswith("
+            "('googleapiclient', 'google.auth', 'google.oauth2'))))\n"
+        )
+        result = subprocess.run(
+            (sys.executable, "-c", script), capture_output=True, text=True,
+            cwd=settings.BASE_DIR
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[]")
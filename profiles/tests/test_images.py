@@ -0,0 +1,346 @@
+from io import BytesIO, StringIO
+from unittest.mock import Mock, patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from posts.models import Attachment
+from posts.services import create_post, create_post_attachment, delete_post
+from utils.tests import ExtendedTestCase
+
+from ..models import (ImageModel, ImageUploadJob, ProfileDocument,
+                      StoredImageFile)
+from ..services.images import (claim_image_upload_job, decode_image,
+                               fail_image_upload_job,
+                               process_image_upload_job,
+                               update_instance_image, upload_image,
+                               validate_uploaded_image)
+
+
+# One variant per image, the variants are tested separately
+@override_settings(IMAGE_UPLOAD_JOB_MAX_ATTEMPTS=2,
+                   IMAGE_VARIANTS={"full": 2048},
+                   IMAGE_VARIANTS_FORMATS=("jpeg",))
+class ImageUploadJobsTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.avatar = self.user.profile.avatar
+
+        self.storage = Mock()
+        storage_patcher = patch("profiles.services.images.get_image_storage",
+                                return_value=self.storage)
+        storage_patcher.start()
+        self.addCleanup(storage_patcher.stop)
+        self.uploaded_files = []
+        self.uploaded_files_count = 0
+        self.storage.upload.side_effect = self.upload_file
+
+    def upload_file(self, file, mime_type):
+        self.uploaded_files.append((file.read(), mime_type))
+        self.uploaded_files_count += 1
+        file_id = f"file{self.uploaded_files_count}"
+        return file_id, f"http://localhost:8000/{file_id}"
+
+    def run_worker(self):
+        # Threads of the worker wouldn't see the data of the test transaction
+        call_command("process_image_jobs", "--once", "--threads", "1",
+                     stdout=StringIO(), stderr=StringIO())
+
+    def test_image_is_processed_by_worker(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+
+        self.avatar.refresh_from_db()
+        self.assertEqual(self.avatar.status, ImageModel.Status.PROCESSING)
+        self.assertEqual(self.avatar.link, "")
+        self.storage.upload.assert_not_called()
+
+        self.run_worker()
+
+        self.avatar.refresh_from_db()
+        self.assertEqual(self.avatar.status, ImageModel.Status.READY)
+        self.assertEqual(self.avatar.file_id, "file1")
+        self.assertEqual(self.avatar.link, "http://localhost:8000/file1")
+        self.assertFalse(ImageUploadJob.objects.exists())
+        self.assertEqual(
+            ProfileDocument.objects.get(user=self.user).data["avatar"],
+            {"jpeg": "http://localhost:8000/file1",
+             "webp": "http://localhost:8000/file1"})
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_worker_warns_about_process_local_cache(self):
+        stderr = StringIO()
+        call_command("process_image_jobs", "--once", "--threads", "1",
+                     stdout=StringIO(), stderr=stderr)
+
+        self.assertIn("The cache is not shared", stderr.getvalue())
+
+    def test_previous_image_is_deleted_after_replacement(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+        self.run_worker()
+        update_instance_image(self.avatar,
+                              self.generate_image_file(size=(32, 32)))
+
+        self.avatar.refresh_from_db()
+        # The previous image is shown until the new one is ready
+        self.assertEqual(self.avatar.link, "http://localhost:8000/file1")
+        self.storage.delete_many.assert_not_called()
+
+        self.run_worker()
+
+        self.avatar.refresh_from_db()
+        self.assertEqual(self.avatar.file_id, "file2")
+        self.storage.delete_many.assert_called_once_with(["file1"])
+
+    def test_same_image_is_stored_once(self):
+        post = create_post(self.user, "Post")
+        for _ in range(2):
+            create_post_attachment(post, self.generate_image_file())
+        update_instance_image(self.avatar, self.generate_image_file())
+        self.run_worker()
+
+        self.assertEqual(self.uploaded_files_count, 1)
+        self.assertEqual(StoredImageFile.objects.get().references, 3)
+        self.assertEqual(set(Attachment.objects.values_list("file_id",
+                                                            flat=True)),
+                         {"file1"})
+
+        # The file is deleted with its last reference
+        delete_post(post)
+        self.storage.delete_many.assert_not_called()
+        self.assertEqual(StoredImageFile.objects.get().references, 1)
+
+        update_instance_image(self.avatar,
+                              self.generate_image_file(size=(32, 32)))
+        self.run_worker()
+        self.storage.delete_many.assert_called_once_with(["file1"])
+        self.assertEqual(StoredImageFile.objects.get().file_id, "file2")
+
+    def test_reuploaded_image_is_not_deleted(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+        self.run_worker()
+        update_instance_image(self.avatar, self.generate_image_file())
+        self.run_worker()
+
+        self.avatar.refresh_from_db()
+        self.assertEqual(self.avatar.file_id, "file1")
+        self.assertEqual(StoredImageFile.objects.get().references, 1)
+        self.storage.delete_many.assert_not_called()
+
+    def test_pending_upload_is_superseded(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+        update_instance_image(self.avatar, self.generate_image_file())
+
+        self.assertEqual(ImageUploadJob.objects.count(), 1)
+
+    def test_running_upload_is_superseded(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+        running_job = claim_image_upload_job()
+        update_instance_image(self.avatar, self.generate_image_file())
+
+        process_image_upload_job(running_job)
+
+        # The result of the outdated upload is discarded
+        self.avatar.refresh_from_db()
+        self.assertEqual(self.avatar.file_id, "")
+        self.assertEqual(self.avatar.status, ImageModel.Status.PROCESSING)
+        self.storage.delete_many.assert_called_once_with(["file1"])
+
+    def test_job_is_claimed_once(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+
+        self.assertIsNotNone(claim_image_upload_job())
+        self.assertIsNone(claim_image_upload_job())
+
+    def test_abandoned_job_is_claimed_again(self):
+        update_instance_image(self.avatar, self.generate_image_file())
+        claim_image_upload_job()
+
+        with override_settings(IMAGE_UPLOAD_JOB_TIMEOUT=-1):
+            self.assertIsNotNone(claim_image_upload_job())
+
+    def test_failed_job_is_retried(self):
+        self.storage.upload.side_effect = Exception("Unavailable")
+        update_instance_image(self.avatar, self.generate_image_file())
+
+        job = claim_image_upload_job()
+        fail_image_upload_job(job, "Unavailable")
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageUploadJob.Status.PENDING)
+
+        self.run_worker()
+
+        job.refresh_from_db()
+        self.avatar.refresh_from_db()
+        self.assertEqual(job.status, ImageUploadJob.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.error, "Unavailable")
+        self.assertEqual(self.avatar.status, ImageModel.Status.FAILED)
+
+    def test_attachments_are_listed_when_ready(self):
+        post = create_post(self.user, "Post")
+        create_post_attachment(post, self.generate_image_file())
+
+        attachment = Attachment.objects.get(post=post)
+        self.assertEqual(attachment.status, ImageModel.Status.PROCESSING)
+
+        self.run_worker()
+
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.status, ImageModel.Status.READY)
+        self.assertEqual(attachment.link, "http://localhost:8000/file1")
+
+    def test_upload_of_deleted_attachment(self):
+        post = create_post(self.user, "Post")
+        create_post_attachment(post, self.generate_image_file())
+
+        delete_post(post)
+
+        self.assertFalse(ImageUploadJob.objects.exists())
+        self.storage.delete_many.assert_not_called()
+
+    def test_attachments_files_are_deleted_with_post(self):
+        post = create_post(self.user, "Post")
+        for file_id in ("file1", "file2", "file3"):
+            Attachment.objects.create(post=post, file_id=file_id,
+                                      link=f"http://localhost:8000/{file_id}")
+        create_post_attachment(post, self.generate_image_file())
+
+        delete_post(post)
+
+        self.storage.delete_many.assert_called_once_with(
+            ["file1", "file2", "file3"])
+        self.assertFalse(Attachment.objects.exists())
+
+
+@override_settings(IMAGE_THREAD_POOL_SIZE=1,
+                   IMAGE_VARIANTS={"thumbnail": 16, "full": 48},
+                   IMAGE_VARIANTS_FORMATS=("jpeg", "webp"))
+class ImageVariantsTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.storage = Mock()
+        self.uploaded_images = []
+        self.storage.upload.side_effect = self.upload_file
+
+        storage_patcher = patch("profiles.services.images.get_image_storage",
+                                return_value=self.storage)
+        storage_patcher.start()
+        self.addCleanup(storage_patcher.stop)
+
+    def upload_file(self, file, mime_type):
+        image = Image.open(BytesIO(file.read()))
+        self.uploaded_images.append((mime_type, image.format, image.size))
+
+        file_id = f"file{len(self.uploaded_images)}"
+        return file_id, f"http://localhost:8000/{file_id}"
+
+    def test_variants(self):
+        file = self.generate_image_file(size=(64, 32))
+        file_id, link, variants = upload_image(file, "image/jpeg")
+
+        self.assertEqual(self.uploaded_images, [
+            ("image/jpeg", "JPEG", (16, 8)),
+            ("image/webp", "WEBP", (16, 8)),
+            ("image/jpeg", "JPEG", (48, 24)),
+            ("image/webp", "WEBP", (48, 24)),
+        ])
+        self.assertEqual(variants["thumbnail"]["webp"], {
+            "file_id": "file2", "link": "http://localhost:8000/file2"})
+        # The full size JPEG is the main file of the image
+        self.assertEqual((file_id, link),
+                         ("file3", "http://localhost:8000/file3"))
+
+    def test_small_images_are_not_enlarged(self):
+        file = self.generate_image_file(size=(10, 10))
+        upload_image(file, "image/jpeg")
+
+        self.assertEqual({size for _, _, size in self.uploaded_images},
+                         {(10, 10)})
+
+    def test_transparent_image(self):
+        file = self.generate_image_file(name="image.png", format="PNG")
+        Image.new("RGBA", (20, 20)).save(buffer := BytesIO(), "PNG")
+        file.file = buffer
+        buffer.seek(0)
+
+        upload_image(file, "image/png")
+
+        self.assertIn(("image/jpeg", "JPEG", (16, 16)), self.uploaded_images)
+
+    def test_gif_is_not_decoded(self):
+        file = self.generate_image_file(name="image.gif", format="GIF")
+        self.storage.upload.side_effect = None
+        self.storage.upload.return_value = ("file1", "link")
+
+        with patch("profiles.services.images.Image.open") as open_image:
+            file_id, link, variants = upload_image(file, "image/gif")
+
+        open_image.assert_not_called()
+        self.assertEqual(self.storage.upload.call_args.args[1], "image/gif")
+        self.assertEqual(variants, {})
+
+    def test_variants_are_deleted_when_an_upload_fails(self):
+        def upload_file(file, mime_type):
+            if mime_type == "image/webp":
+                raise Exception("Unavailable")
+            return self.upload_file(file, mime_type)
+
+        self.storage.upload.side_effect = upload_file
+
+        with self.assertRaisesMessage(Exception, "Unavailable"):
+            upload_image(self.generate_image_file(), "image/jpeg")
+
+        self.storage.delete_many.assert_called_once_with(["file1", "file2"])
+
+
+class ImageDecodingTestCase(ExtendedTestCase):
+    def generate_jpeg(self, size, orientation=None):
+        exif = Image.Exif()
+        if orientation:
+            exif[0x0112] = orientation
+
+        buffer = BytesIO()
+        Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+        buffer.seek(0)
+
+        return buffer
+
+    def test_orientation_is_applied_and_exif_is_stripped(self):
+        # Orientation 6 is rotated 90 degrees clockwise
+        image = decode_image(self.generate_jpeg((64, 32), 6), 2048)
+
+        self.assertEqual(image.size, (32, 64))
+        self.assertNotIn("exif", image.info)
+
+    def test_jpeg_is_downscaled_while_decoding(self):
+        # The smallest scale(1/2) at which the image is still
+        # larger than the square is decoded
+        image = decode_image(self.generate_jpeg((800, 400)), 300)
+
+        self.assertEqual(image.size, (400, 200))
+
+    def test_uploaded_image_content_type_is_detected(self):
+        file = self.generate_image_file(name="image.png", format="PNG")
+        file.content_type = "image/jpeg"
+
+        self.assertIs(validate_uploaded_image(file), True)
+        self.assertEqual(file.content_type, "image/png")
+        self.assertEqual(file.tell(), 0)
+
+    def test_invalid_uploaded_images(self):
+        files = (
+            SimpleUploadedFile("image.jpg", b"text", "image/jpeg"),
+            self.generate_image_file(name="image.bmp", format="BMP"),
+        )
+
+        for file in files:
+            with self.subTest(file.name):
+                self.assertIs(validate_uploaded_image(file), False)
+
+    @override_settings(IMAGE_MAX_PIXELS=64 * 63)
+    def test_uploaded_image_with_too_many_pixels(self):
+        self.assertIs(validate_uploaded_image(self.generate_image_file()),
+                      False)
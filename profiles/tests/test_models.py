@@ -69,3 +69,50 @@ class BannerModelTestCase(ExtendedTestCase):
 
         self.assertEqual(banner.file_id, "")
         self.assertEqual(banner.link, "")
+
+
+class DirtyFieldsTestCase(ExtendedTestCase):
+    def setUp(self):
+        user = self.UserModel.objects.create_user(
+            login="NewUser", email="new@user.com", password="pass")
+        self.user = self.UserModel.objects.get(id=user.id)
+
+    def test_only_changed_fields_are_saved(self):
+        profile = Profile.objects.get(user=self.user)
+        profile.status = "Status"
+
+        # The UPDATE and the rebuild of the profile document
+        with self.assertNumQueries(3) as queries:
+            profile.save()
+
+        self.assertNotIn("fullname", queries.captured_queries[0]["sql"])
+        self.assertEqual(profile.get_dirty_fields(), [])
+        profile.refresh_from_db()
+        self.assertEqual(profile.status, "Status")
+
+    def test_unchanged_object_is_not_saved(self):
+        avatar = Avatar.objects.get(profile__user=self.user)
+
+        with self.assertNumQueries(0):
+            avatar.save()
+
+    def test_json_field_changed_in_place(self):
+        avatar = Avatar.objects.get(profile__user=self.user)
+        avatar.variants["full"] = {}
+
+        self.assertEqual(avatar.get_dirty_fields(), ["variants"])
+
+    def test_user_save_cascades_only_loaded_changes(self):
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=("is_active",))
+
+        self.user.profile.contacts.github = "https://github.com/user"
+        self.user.profile.avatar
+
+        # The profile and avatar are unchanged, the contacts
+        # are saved and the profile document is rebuilt
+        with self.assertNumQueries(4):
+            self.user.save(update_fields=("is_active",))
+
+        self.assertEqual(Contacts.objects.get().github,
+                         "https://github.com/user")
@@ -0,0 +1,144 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from bans.services import ban_user, unban_user
+from followers.services import follow, unfollow
+from posts.models import Post
+from posts.services import delete_post
+from utils.tests import ExtendedTestCase
+
+from ..models import Profile, ProfileDocument
+from ..selectors import get_profile_document_by_user_id
+from ..serializers import (AuthenticatedUserProfileSerializer,
+                           ProfileSerializer)
+
+
+class ProfileCountersTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.second_user = self.UserModel.objects.create_user(
+            login="SecondUser", email="second_user@gmail.com",
+            password="pass")
+
+    def get_counters(self, user):
+        return Profile.objects.values_list(
+            "followers_count", "following_count", "posts_count"
+        ).get(user=user)
+
+    def test_followers_counters(self):
+        follow(self.user, self.second_user)
+
+        self.assertEqual(self.get_counters(self.user), (0, 1, 0))
+        self.assertEqual(self.get_counters(self.second_user), (1, 0, 0))
+
+        unfollow(self.user, self.second_user)
+
+        self.assertEqual(self.get_counters(self.user), (0, 0, 0))
+        self.assertEqual(self.get_counters(self.second_user), (0, 0, 0))
+
+    def test_followers_counters_after_user_deletion(self):
+        third_user = self.UserModel.objects.create_user(
+            login="ThirdUser", email="third_user@gmail.com",
+            password="pass")
+        follow(self.user, self.second_user)
+        follow(self.second_user, self.user)
+        follow(third_user, self.second_user)
+
+        self.second_user.delete()
+
+        self.assertEqual(self.get_counters(self.user), (0, 0, 0))
+        self.assertEqual(self.get_counters(third_user), (0, 0, 0))
+
+    def test_posts_counter(self):
+        post = Post.objects.create(author=self.user, body="Post")
+        Post.objects.create(author=self.user, body="Second post")
+        self.assertEqual(self.get_counters(self.user), (0, 0, 2))
+
+        delete_post(post)
+        self.assertEqual(self.get_counters(self.user), (0, 0, 1))
+
+    def test_reconcile_counters_command(self):
+        follow(self.user, self.second_user)
+        Post.objects.create(author=self.user, body="Post")
+        Profile.objects.update(
+            followers_count=5, following_count=5, posts_count=5)
+
+        out = StringIO()
+        call_command("reconcile_counters", "--chunk-size", "1", stdout=out)
+
+        self.assertIn("Fixed counters of 2 profiles", out.getvalue())
+        self.assertEqual(self.get_counters(self.user), (0, 1, 1))
+        self.assertEqual(self.get_counters(self.second_user), (1, 0, 0))
+
+
+class ProfileDocumentsTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.admin = self.UserModel.objects.create_superuser(
+            login="Admin", email="admin@gmail.com", password="pass")
+
+    def get_document_data(self):
+        return ProfileDocument.objects.get(user=self.user).data
+
+    def assertDocumentIsActual(self):
+        profile = Profile.objects.get(user=self.user)
+        data = {**AuthenticatedUserProfileSerializer(profile).data,
+                **ProfileSerializer(profile).data}
+        document_data = self.get_document_data()
+
+        self.assertEqual(document_data["avatar"]["jpeg"], data.pop("avatar"))
+        self.assertEqual(document_data["banner"]["jpeg"], data.pop("banner"))
+        self.assertEqual(
+            {k: v for k, v in document_data.items()
+             if k not in ("avatar", "banner")}, data)
+
+    def test_document_is_created_with_profile(self):
+        self.assertDocumentIsActual()
+        self.assertEqual(ProfileDocument.objects.get(user=self.user).login,
+                         "User")
+
+    def test_document_is_rebuilt_on_profile_changes(self):
+        self.user.profile.status = "Status"
+        self.user.profile.contacts.github = "https://github.com/user"
+        self.user.save()
+
+        self.assertDocumentIsActual()
+        self.assertEqual(self.get_document_data()["status"], "Status")
+
+        self.user.login = "NewLogin"
+        self.user.is_staff = True
+        self.user.save(update_fields=("login", "is_staff"))
+
+        self.assertDocumentIsActual()
+        self.assertEqual(ProfileDocument.objects.get(user=self.user).login,
+                         "NewLogin")
+
+    def test_document_is_rebuilt_on_ban_changes(self):
+        ban_user(self.user, self.admin)
+        self.assertIs(self.get_document_data()["isBanned"], True)
+
+        unban_user(self.user)
+        self.assertIs(self.get_document_data()["isBanned"], False)
+
+    def test_missing_document_is_created_on_read(self):
+        ProfileDocument.objects.all().delete()
+
+        document = get_profile_document_by_user_id(self.user.id)
+        self.assertEqual(document.login, "User")
+        self.assertDocumentIsActual()
+
+    def test_rebuild_profile_documents_command(self):
+        Profile.objects.filter(user=self.user).update(status="Status")
+        ProfileDocument.objects.filter(user=self.admin).delete()
+
+        out = StringIO()
+        call_command("rebuild_profile_documents", "--chunk-size", "1",
+                     stdout=out)
+
+        self.assertIn("Rebuilt 2 profile documents", out.getvalue())
+        self.assertDocumentIsActual()
+        self.assertTrue(
+            ProfileDocument.objects.filter(user=self.admin).exists())
@@ -0,0 +1,118 @@
+from io import BytesIO, StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from utils.tests import APIViewTestCase
+
+from ..models import ImageModel
+from ..services.images import get_image_files_ids, update_instance_image
+from ..services.storages import LocalStorage, get_image_storage
+
+
+class LocalStorageTestCase(APIViewTestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name) / "images"
+
+        settings_override = override_settings(
+            IMAGE_STORAGE_BACKEND="profiles.services.storages.LocalStorage",
+            IMAGE_STORAGE_LOCAL_ROOT=self.root,
+            IMAGE_STORAGE_LOCAL_URL="http://testserver/api/v1/images/"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.storage = get_image_storage()
+
+    def upload(self):
+        return self.storage.upload(BytesIO(b"image"), "image/jpeg")
+
+    def url(self, file_id):
+        return reverse("local_image", kwargs={"file_id": file_id})
+
+    def test_storage_is_selected_by_settings(self):
+        self.assertIsInstance(self.storage, LocalStorage)
+
+    def test_upload_and_delete(self):
+        file_id, link = self.upload()
+
+        self.assertTrue(file_id.endswith(".jpg"))
+        self.assertEqual(link, "http://testserver/api/v1/images/" + file_id)
+        self.assertEqual((self.root / file_id).read_bytes(), b"image")
+
+        self.storage.delete(file_id)
+        self.assertFalse((self.root / file_id).exists())
+        # Deleting a missing file is not an error
+        self.storage.delete(file_id)
+
+    def test_file_id_fits_into_column(self):
+        max_length = ImageModel._meta.get_field("file_id").max_length
+
+        for mime_type in ("image/jpeg", "image/png", "image/gif",
+                          "image/webp"):
+            with self.subTest(mime_type):
+                file_id, _ = self.storage.upload(BytesIO(b"image"),
+                                                 mime_type)
+                self.assertLessEqual(len(file_id), max_length)
+
+    def test_delete_many(self):
+        files_ids = [self.upload()[0]
+                     for _ in range(3)]
+
+        self.storage.delete_many(files_ids)
+
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_invalid_file_id(self):
+        with self.assertRaises(ValueError):
+            self.storage.delete("../image.jpg")
+
+    def test_retrieve_image(self):
+        file_id, link = self.upload()
+        response = self.client.get(link)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(b"".join(response.streaming_content), b"image")
+
+    @override_settings(IMAGE_STORAGE_LOCAL_SENDFILE="x-accel-redirect")
+    def test_retrieve_image_with_x_accel_redirect(self):
+        file_id, link = self.upload()
+        response = self.client.get(link)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"],
+                         "/protected/images/" + file_id)
+        self.assertEqual(response.content, b"")
+
+    def test_retrieve_missing_image(self):
+        for file_id in ("missing.jpg", "..%2Fimage.jpg"):
+            response = self.client.get(self.url(file_id))
+            self.assertEqual(response.status_code,
+                             self.http_status.HTTP_404_NOT_FOUND)
+
+    def test_avatar_upload(self):
+        user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        avatar = user.profile.avatar
+
+        update_instance_image(avatar, self.generate_image_file())
+        call_command("process_image_jobs", "--once", "--threads", "1",
+                     stdout=StringIO())
+
+        avatar.refresh_from_db()
+        self.assertEqual(avatar.status, ImageModel.Status.READY)
+        self.assertEqual(avatar.link, self.storage.get_link(avatar.file_id))
+        stored_files_ids = get_image_files_ids(avatar.file_id,
+                                               avatar.variants)
+        # The image is smaller than the variants sizes, the same
+        # JPEG and WebP files are shared by the sizes
+        self.assertEqual(len(stored_files_ids), 6)
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()),
+                         sorted(set(stored_files_ids)))
+        self.assertEqual(len(set(stored_files_ids)), 2)
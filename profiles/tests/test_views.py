@@ -1,7 +1,14 @@
+from urllib.parse import urlencode
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 
-from posts.models import Like, Post
-from utils.tests import APIViewTestCase
+from bans.cache import banned_users
+from posts.models import Attachment, Like, Post
+from utils.tests import APIViewTestCase, ListAPIViewTestCase
+
+from ..models import Avatar
 
 
 class RetrieveUpdateProfileAPIViewTestCase(APIViewTestCase):
@@ -36,6 +43,20 @@ class RetrieveUpdateProfileAPIViewTestCase(APIViewTestCase):
         self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.user.id)
 
+    @override_settings(BANS_VERSION_CHECK_INTERVAL=60)
+    def test_profile_detail_number_of_queries(self):
+        banned_users.invalidate()
+        banned_users.refresh()
+
+        # The authenticated user and the profile document
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data["aboutMe"], "I am a view test")
+        self.assertEqual(response.data["contacts"]["github"],
+                         "https://github.com/HanSaloZu")
+        self.assertNotIn("isBanned", response.data)
+
     # Profile update tests
 
     def test_profile_update_without_contacts(self):
@@ -187,6 +208,41 @@ class UpdateAvatarAPIViewTestCase(APIViewTestCase):
             fields_errors_dict_len=1
         )
 
+    def test_avatar_update_with_file_that_is_not_an_image(self):
+        """
+        The content type sent by the client is not trusted
+        """
+        response = self.client.put(
+            self.url,
+            {"avatar": SimpleUploadedFile("image.png", b"text", "image/png")},
+            format="multipart")
+
+        self.client_error_response_test(
+            response,
+            messages=[
+                "Image not provided",
+            ],
+            fields_errors_dict_len=1
+        )
+
+    def test_avatar_update(self):
+        """
+        The image is processed by the worker, the response
+        is returned immediately with the processing status
+        """
+        response = self.client.put(
+            self.url, {"avatar": self.generate_image_file()},
+            format="multipart")
+        avatar = self.user.profile.avatar
+        avatar.refresh_from_db()
+
+        self.assertEqual(response.status_code,
+                         self.http_status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data, {"avatar": "",
+                                         "status": "processing"})
+        self.assertEqual(avatar.status, Avatar.Status.PROCESSING)
+        self.assertEqual(avatar.upload_jobs.count(), 1)
+
 
 class UpdateBannerAPIViewTestCase(APIViewTestCase):
     url = reverse("profile_banner_update")
@@ -271,6 +327,29 @@ class UpdatePasswordAPIViewTestCase(APIViewTestCase):
         user = self.UserModel.objects.all().first()
         self.assertIs(user.check_password(payload["newPassword1"]), True)
 
+    @override_settings(BANS_VERSION_CHECK_INTERVAL=60)
+    def test_update_password_number_of_queries(self):
+        """
+        Only the password column is written, neither the profile rows
+        nor a session(the request is authenticated by a JWT) are saved
+        """
+        banned_users.invalidate()
+        banned_users.refresh()
+        payload = {
+            "oldPassword": "pass",
+            "newPassword1": "newpassword",
+            "newPassword2": "newpassword"
+        }
+
+        # The authenticated user and the UPDATE
+        with self.assertNumQueries(2) as queries:
+            response = self.client.put(self.url, payload)
+
+        self.assertEqual(response.status_code,
+                         self.http_status.HTTP_204_NO_CONTENT)
+        self.assertIn('SET "password" =',
+                      queries.captured_queries[1]["sql"])
+
     def test_update_password_with_different_passwords(self):
         """
         Password update with different passwords should return a 400 error
@@ -420,3 +499,115 @@ class RetrieveCreateDestroyLikedPostAPIViewTestCase(APIViewTestCase):
             status=self.http_status.HTTP_404_NOT_FOUND,
             messages=["Invalid id, post is not found"]
         )
+
+
+class ListPostsAPIViewTestCase(ListAPIViewTestCase):
+    def url(self, parameters={}):
+        url = reverse("posts_list")
+        if parameters:
+            url += "?" + urlencode(parameters)
+
+        return url
+
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="NewUser", email="new@user.com", password="pass")
+        second_user = self.UserModel.objects.create_user(
+            login="SecondUser", email="second@user.com", password="pass")
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.generate_jwt_auth_credentials(self.user)
+        )
+
+        for i in range(5):
+            post = Post.objects.create(author=self.user, body=f"Post #{i}")
+            Like.objects.create(user=second_user, post=post)
+            Attachment.objects.create(
+                post=post, file_id=str(i), link=f"http://localhost:8000/{i}")
+
+        Post.objects.create(author=second_user, body="Foreign post")
+
+    def test_posts_list(self):
+        """
+        A posts list request should return only
+        the posts of the authenticated user
+        """
+        response = self.client.get(self.url())
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=5,
+            page_size=5
+        )
+
+        post = response.data["items"][0]
+        self.assertEqual(post["body"], "Post #4")
+        self.assertEqual(post["likes"], 1)
+        self.assertIs(post["isLiked"], False)
+        self.assertEqual(post["attachments"], ["http://localhost:8000/4"])
+
+    def test_posts_list_number_of_queries(self):
+        """
+        The number of queries should not depend on the number of posts
+        """
+        single_post_page_queries = self.count_list_view_queries(
+            self.url({"limit": 1}))
+        full_page_queries = self.count_list_view_queries(
+            self.url({"limit": 5}))
+
+        self.assertEqual(single_post_page_queries, full_page_queries)
+
+
+class ListLikedPostsAPIViewTestCase(ListAPIViewTestCase):
+    def url(self, parameters={}):
+        url = reverse("liked_posts_list")
+        if parameters:
+            url += "?" + urlencode(parameters)
+
+        return url
+
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="NewUser", email="new@user.com", password="pass")
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.generate_jwt_auth_credentials(self.user)
+        )
+
+        for i in range(5):
+            author = self.UserModel.objects.create_user(
+                login=f"Author{i}", email=f"author{i}@user.com",
+                password="pass")
+            post = Post.objects.create(author=author, body=f"Post #{i}")
+            Like.objects.create(user=self.user, post=post)
+            Attachment.objects.create(
+                post=post, file_id=str(i), link=f"http://localhost:8000/{i}")
+
+        Post.objects.create(author=self.user, body="Not liked post")
+
+    def test_liked_posts_list(self):
+        """
+        A liked posts list request should return only liked posts
+        """
+        response = self.client.get(self.url())
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=5,
+            page_size=5
+        )
+
+        for post in response.data["items"]:
+            self.assertEqual(post["likes"], 1)
+            self.assertIs(post["isLiked"], True)
+
+    def test_liked_posts_list_number_of_queries(self):
+        """
+        The number of queries should not depend on the number of posts
+        """
+        single_post_page_queries = self.count_list_view_queries(
+            self.url({"limit": 1}))
+        full_page_queries = self.count_list_view_queries(
+            self.url({"limit": 5}))
+
+        self.assertEqual(single_post_page_queries, full_page_queries)
@@ -1,16 +1,25 @@
+from mimetypes import guess_type
+
+from django.conf import settings
 from django.contrib.auth import update_session_auth_hash
+from django.http import FileResponse, Http404, HttpResponse
+from django.views import View
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT
 from rest_framework.views import APIView
 
 from posts.mixins import ListPostsWithOrderingAPIViewMixin
 from posts.selectors import get_liked_posts, get_post_by_id_or_404
+from posts.services import is_liked, like_post, unlike_post
 from utils.shortcuts import raise_400_based_on_serializer
 from utils.views import LoginRequiredAPIView
 
 from .mixins import UpdateImageMixin
-from .serializers import (AuthenticatedUserProfileSerializer,
+from .selectors import get_profile_document_by_user_id
+from .serializers import (AuthenticatedUserProfileDocumentSerializer,
                           UpdatePasswordSerailizer, UpdateProfileSerializer)
+from .services.storages import LocalStorage
 
 
 class RetrieveUpdateProfileAPIView(LoginRequiredAPIView, APIView):
@@ -18,17 +27,24 @@ class RetrieveUpdateProfileAPIView(LoginRequiredAPIView, APIView):
     Retrieves and updates the authenticated user profile
     """
 
+    def get_profile_representation(self, request):
+        document = get_profile_document_by_user_id(request.user.id)
+        serializer = AuthenticatedUserProfileDocumentSerializer(
+            document, context={"request": request})
+
+        return serializer.data
+
     def get(self, request):
-        serializer = AuthenticatedUserProfileSerializer(request.user.profile)
-        return Response(serializer.data)
+        return Response(self.get_profile_representation(request))
 
     def patch(self, request):
         instance = request.user.profile
         serializer = UpdateProfileSerializer(instance, data=request.data)
 
         if serializer.is_valid():
-            instance = serializer.save()
-            return Response(AuthenticatedUserProfileSerializer(instance).data)
+            # The document has been rebuilt by the signals
+            serializer.save()
+            return Response(self.get_profile_representation(request))
 
         raise_400_based_on_serializer(serializer)
 
@@ -65,7 +81,10 @@ class UpdatePasswordAPIView(LoginRequiredAPIView, APIView):
 
         if serializer.is_valid():
             user = serializer.save()
-            update_session_auth_hash(request, user)
+            # Only a session has to be kept valid after the password change
+            if isinstance(request.successful_authenticator,
+                          SessionAuthentication):
+                update_session_auth_hash(request, user)
             return Response(status=HTTP_204_NO_CONTENT)
 
         raise_400_based_on_serializer(serializer)
@@ -99,18 +118,14 @@ class RetrieveCreateDestroyLikedPostAPIView(LoginRequiredAPIView, APIView):
 
     def get(self, request, id):
         post = get_post_by_id_or_404(id)
-        is_liked = request.user.like_set.all().filter(post_id=post.id).exists()
 
         return Response(data={
-            "isLiked": is_liked
+            "isLiked": is_liked(request.user, post)
         })
 
     def put(self, request, id):
         post = get_post_by_id_or_404(id)
-        is_liked = request.user.like_set.all().filter(post_id=post.id).exists()
-
-        if not is_liked:
-            request.user.like_set.create(post=post, user=request.user)
+        like_post(request.user, post)
 
         return Response(data={
             "isLiked": True
@@ -118,11 +133,42 @@ class RetrieveCreateDestroyLikedPostAPIView(LoginRequiredAPIView, APIView):
 
     def delete(self, request, id):
         post = get_post_by_id_or_404(id)
-        like_object = request.user.like_set.all().filter(post_id=post.id)
-
-        if like_object.exists():
-            like_object.delete()
+        unlike_post(request.user, post)
 
         return Response(data={
             "isLiked": False
         })
+
+
+class RetrieveLocalImageView(View):
+    """
+    Sends the images stored by LocalStorage, the file is sent by
+    the web server when IMAGE_STORAGE_LOCAL_SENDFILE is set
+    """
+
+    def get(self, request, file_id):
+        storage = LocalStorage()
+        if not storage.is_file_id_valid(file_id):
+            raise Http404("Image is not found")
+
+        path = storage.get_path(file_id)
+        content_type = guess_type(file_id)[0] or "application/octet-stream"
+        sendfile = settings.IMAGE_STORAGE_LOCAL_SENDFILE
+
+        if sendfile == "x-accel-redirect":
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = (
+                settings.IMAGE_STORAGE_LOCAL_ACCEL_PREFIX + file_id)
+        elif sendfile == "x-sendfile":
+            response = HttpResponse(content_type=content_type)
+            response["X-Sendfile"] = str(path)
+        else:
+            try:
+                response = FileResponse(open(path, "rb"),
+                                        content_type=content_type)
+            except FileNotFoundError:
+                raise Http404("Image is not found")
+
+        # Files ids are never reused
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
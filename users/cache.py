@@ -0,0 +1,5 @@
+from utils.cache import CacheNamespace
+
+# Ids of the users by their logins, entries are deleted with the users,
+# all of them are invalidated when a login changes
+users_ids_by_login = CacheNamespace("users:login", "SELECTORS_CACHE_TTL")
@@ -0,0 +1,130 @@
+import csv
+import os
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email, validate_slug
+from django.db import transaction
+
+from profiles.services.profiles import create_profiles
+from users.search import index_users_logins
+from users.serializers import RESERVED_LOGINS
+from utils.concurrency import map_in_threads
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ("Creates active users from a CSV file with login, email and "
+            "password(optional) columns in batches with bulk INSERTs, "
+            "no signals are sent for the created users")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--threads", type=int, default=os.cpu_count(),
+            help="Number of passwords hashed concurrently")
+
+    def handle(self, *args, **options):
+        self.imported = self.skipped = 0
+
+        try:
+            with open(options["path"], newline="") as file:
+                rows = csv.DictReader(file)
+                if not {"login", "email"} <= set(rows.fieldnames or ()):
+                    raise CommandError(
+                        "The file must have login and email columns")
+
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) == options["batch_size"]:
+                        self.import_batch(batch, options["threads"])
+                        batch = []
+                self.import_batch(batch, options["threads"])
+        except OSError as e:
+            raise CommandError(e)
+
+        self.stdout.write(
+            f"{self.imported} users imported, {self.skipped} skipped")
+
+    def import_batch(self, rows, threads):
+        if not rows:
+            return
+
+        for row in rows:
+            row["email"] = User.objects.normalize_email(row["email"])
+        rows = self.get_valid_rows(rows)
+        if not rows:
+            return
+
+        # Hashing is the slowest part, hashlib releases the GIL
+        passwords = map_in_threads(
+            lambda password: make_password(password or None),
+            [row.get("password") for row in rows], threads)
+
+        users = [
+            User(login=row["login"], email=row["email"], password=password)
+            for row, password in zip(rows, passwords)
+        ]
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+
+            # The ids aren't returned by bulk_create on every database
+            ids = dict(User.objects.filter(
+                login__in=[user.login for user in users]
+            ).values_list("login", "id"))
+            for user in users:
+                user.id = ids[user.login]
+
+            create_profiles(users)
+            index_users_logins(users)
+
+        self.imported += len(users)
+
+    def get_valid_rows(self, rows):
+        """
+        Returns the rows with valid and unused logins and emails,
+        the others are reported and skipped
+        """
+        used_logins = set(User.objects.filter(
+            login__in=[row["login"] for row in rows]
+        ).values_list("login", flat=True))
+        used_emails = set(User.objects.filter(
+            email__in=[row["email"] for row in rows]
+        ).values_list("email", flat=True))
+
+        valid_rows = []
+        for row in rows:
+            error = self.validate_row(row, used_logins, used_emails)
+
+            if error:
+                self.skipped += 1
+                self.stderr.write(f"{row['login']}: {error}")
+                continue
+
+            used_logins.add(row["login"])
+            used_emails.add(row["email"])
+            valid_rows.append(row)
+
+        return valid_rows
+
+    def validate_row(self, row, used_logins, used_emails):
+        try:
+            validate_slug(row["login"])
+            validate_email(row["email"])
+        except ValidationError as e:
+            return e.messages[0]
+
+        if len(row["login"]) > 50 or row["login"].lower() in RESERVED_LOGINS:
+            return "Invalid login"
+        if row["login"] in used_logins:
+            return "This login is already in use"
+        if row["email"] in used_emails:
+            return "This email is already in use"
+
+        return None
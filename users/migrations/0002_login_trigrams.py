@@ -0,0 +1,61 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def get_login_trigrams(login):
+    login = "  " + login.lower()
+    return {login[i:i + 3] for i in range(len(login) - 2)}
+
+
+def create_login_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX users_login_trgm ON users "
+            "USING GIN (UPPER(login::text) gin_trgm_ops)"
+        )
+        return
+
+    User = apps.get_model("users", "User")
+    LoginTrigram = apps.get_model("users", "LoginTrigram")
+
+    LoginTrigram.objects.bulk_create(
+        (LoginTrigram(user_id=user_id, trigram=trigram)
+         for user_id, login in User.objects.values_list(
+             "id", "login").iterator()
+         for trigram in get_login_trigrams(login)),
+        batch_size=5000
+    )
+
+
+def drop_login_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX users_login_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginTrigram',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='login_trigrams', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'login trigram',
+                'db_table': 'users_login_trigrams',
+                'unique_together': {('trigram', 'user')},
+            },
+        ),
+        migrations.RunPython(create_login_search_index,
+                             drop_login_search_index),
+    ]
@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 
 from utils.views import ListAPIViewMixin
 
+from .search import search_users
 from .serializers import ExtendedUserSerializer
 
 User = get_user_model()
@@ -12,4 +13,4 @@ class ListUsersAPIViewMixin(ListAPIViewMixin):
     serializer_class = ExtendedUserSerializer
 
     def filter_queryset(self, queryset, kwargs):
-        return queryset.filter(login__contains=kwargs["q"])
+        return search_users(queryset, kwargs["q"])
@@ -24,3 +24,22 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.login
+
+
+class LoginTrigram(models.Model):
+    """
+    Trigrams of the lowercased login padded with two spaces(as pg_trgm does),
+    used to search users by login on databases without pg_trgm
+    """
+
+    user = models.ForeignKey(
+        User, related_name="login_trigrams", on_delete=models.CASCADE)
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        unique_together = ("trigram", "user")
+        verbose_name = "login trigram"
+        db_table = "users_login_trigrams"
+
+    def __str__(self):
+        return f"{self.trigram} of {self.user_id} login"
@@ -0,0 +1,97 @@
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import Length
+
+from .models import LoginTrigram, User
+
+LOGIN_TRIGRAM_PADDING = "  "
+
+
+def get_trigrams(value):
+    value = value.lower()
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def get_login_trigrams(login):
+    return get_trigrams(LOGIN_TRIGRAM_PADDING + login)
+
+
+def uses_trigram_table():
+    # PostgreSQL searches with the pg_trgm GIN index on users.login
+    return connection.vendor != "postgresql"
+
+
+def get_users_ids_with_trigrams(trigrams):
+    return LoginTrigram.objects.filter(trigram__in=trigrams).values(
+        "user_id"
+    ).annotate(
+        trigrams_count=Count("trigram")
+    ).filter(trigrams_count=len(trigrams)).values("user_id")
+
+
+def get_users_by_login_substring(q):
+    users = User.objects.all().filter(login__icontains=q)
+    trigrams = get_trigrams(q)
+
+    if trigrams and uses_trigram_table():
+        users = users.filter(id__in=get_users_ids_with_trigrams(trigrams))
+
+    return users
+
+
+def search_users(queryset, q):
+    if not q:
+        return queryset
+
+    return queryset.filter(
+        id__in=get_users_by_login_substring(q).values("id"))
+
+
+def autocomplete_users(q):
+    """
+    Returns the users whose logins start with q,
+    shortest logins go first
+    """
+    users = User.objects.all().filter(login__istartswith=q)
+
+    if uses_trigram_table():
+        trigrams = get_trigrams(LOGIN_TRIGRAM_PADDING + q)
+        users = users.filter(id__in=get_users_ids_with_trigrams(trigrams))
+
+    return users.order_by(Length("login"), "login")
+
+
+def index_user_login(user, created=False):
+    if not uses_trigram_table():
+        return
+
+    # A new user has no trigrams yet
+    if not created:
+        LoginTrigram.objects.filter(user=user).delete()
+
+    index_users_logins([user])
+
+
+def index_users_logins(users, batch_size=None):
+    """
+    Adds the trigrams of the logins of the users
+    that aren't indexed yet with bulk INSERTs
+    """
+    if not uses_trigram_table():
+        return
+
+    LoginTrigram.objects.bulk_create(
+        (LoginTrigram(user_id=user.id, trigram=trigram)
+         for user in users
+         for trigram in get_login_trigrams(user.login)),
+        batch_size=batch_size
+    )
+
+
+def rebuild_login_index():
+    if not uses_trigram_table():
+        return
+
+    LoginTrigram.objects.all().delete()
+    index_users_logins(User.objects.only("id", "login").iterator(),
+                       batch_size=5000)
@@ -0,0 +1,29 @@
+from django.core.exceptions import ObjectDoesNotExist
+
+from utils.exceptions import NotFound404
+
+from .cache import users_ids_by_login
+from .models import User
+
+
+def get_user_id_by_login(login):
+    return users_ids_by_login.get_or_set(
+        (login,), lambda: User.objects.values_list(
+            "id", flat=True).get(login=login))
+
+
+def get_user_id_by_login_or_404(login):
+    try:
+        return get_user_id_by_login(login)
+    except ObjectDoesNotExist:
+        raise NotFound404("Invalid login, user is not found")
+
+
+def get_user_by_login_or_404(login):
+    """
+    Loads the user by the primary key, the login is resolved by the cache
+    """
+    try:
+        return User.objects.get(id=get_user_id_by_login_or_404(login))
+    except ObjectDoesNotExist:
+        raise NotFound404("Invalid login, user is not found")
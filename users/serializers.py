@@ -1,7 +1,13 @@
+from django.db.models import Q
 from rest_framework import serializers
 
+from profiles.serializers import get_image_link
+
 from .models import User
 
+# Logins that clash with the /users/<login>/ routes
+RESERVED_LOGINS = ("autocomplete",)
+
 
 class UserSerializer(serializers.ModelSerializer):
     avatar = serializers.SerializerMethodField()
@@ -11,7 +17,7 @@ class UserSerializer(serializers.ModelSerializer):
         return obj.id
 
     def get_avatar(self, obj):
-        return obj.profile.avatar.link
+        return get_image_link(obj.profile.avatar, "thumbnail", self.context)
 
     def get_isAdmin(self, obj):
         return obj.is_staff
@@ -95,11 +101,20 @@ class CreateUserSerializer(serializers.Serializer):
         })
 
     def validate(self, data):
-        if User.objects.all().filter(login=data["login"]).exists():
+        if data["login"].lower() in RESERVED_LOGINS:
             raise serializers.ValidationError(
-                {"login": "This login is already in use"})
-
-        if User.objects.all().filter(email=data["email"]).exists():
+                {"login": "This login is reserved"})
+
+        # Both are checked with a single query
+        used_logins_and_emails = User.objects.all().filter(
+            Q(login=data["login"]) | Q(email=data["email"])
+        ).values_list("login", "email")
+
+        for login, _ in used_logins_and_emails:
+            if login == data["login"]:
+                raise serializers.ValidationError(
+                    {"login": "This login is already in use"})
+        if used_logins_and_emails:
             raise serializers.ValidationError(
                 {"email": "This email is already in use"})
 
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import users_ids_by_login
+from .models import User
+from .search import index_user_login
+
+
+@receiver(post_save, sender=User)
+def index_login(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or "login" in update_fields:
+        index_user_login(instance, created)
+
+
+@receiver(post_save, sender=User)
+def delete_cached_user_ids(sender, instance, created,
+                           update_fields=None, **kwargs):
+    # The previous login is unknown, logins change rarely
+    if not created and (update_fields is None or "login" in update_fields):
+        users_ids_by_login.invalidate()
+
+
+@receiver(post_delete, sender=User)
+def delete_cached_user_id(sender, instance, **kwargs):
+    users_ids_by_login.delete(instance.login)
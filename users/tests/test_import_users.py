@@ -0,0 +1,73 @@
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from profiles.models import Avatar, Banner, Contacts, Profile
+from utils.tests import ExtendedTestCase
+
+from ..search import autocomplete_users
+
+
+# Fast hashing, the default hasher is slow on purpose
+@override_settings(PASSWORD_HASHERS=[
+    "django.contrib.auth.hashers.MD5PasswordHasher"])
+class ImportUsersTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.UserModel.objects.create_user(
+            login="ExistingUser", email="existing@gmail.com", password="pass")
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "users.csv"
+
+    def import_users(self, csv, *args):
+        self.path.write_text(csv)
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_users", str(self.path), *args,
+                     stdout=stdout, stderr=stderr)
+
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_users(self):
+        rows = "".join(f"User{i},user{i}@gmail.com,pass{i}\n"
+                       for i in range(5))
+
+        with self.assertNumQueries(
+                # Per batch of 2 users: 2 uniqueness checks, savepoint,
+                # users, ids, 4 profile tables, SELECT and INSERT of
+                # the profile documents, trigrams, release
+                3 * 13):
+            stdout, _ = self.import_users(
+                "login,email,password\n" + rows, "--batch-size", "2")
+
+        self.assertIn("5 users imported, 0 skipped", stdout)
+
+        user = self.UserModel.objects.get(login="User3")
+        self.assertEqual(user.email, "user3@gmail.com")
+        self.assertIs(user.is_active, True)
+        self.assertIs(user.check_password("pass3"), True)
+        self.assertEqual(user.profile.fullname, "User3")
+        for model in (Profile, Contacts, Avatar, Banner):
+            self.assertEqual(model.objects.count(), 6)
+        self.assertEqual(list(autocomplete_users("user3")), [user])
+
+    def test_invalid_rows_are_skipped(self):
+        stdout, stderr = self.import_users(
+            "login,email\n"
+            "ExistingUser,new@gmail.com\n"
+            "NewUser,existing@gmail.com\n"
+            "Invalid login,invalid@gmail.com\n"
+            "autocomplete,autocomplete@gmail.com\n"
+            "Duplicate,duplicate@gmail.com\n"
+            "Duplicate,duplicate2@gmail.com\n"
+        )
+
+        self.assertIn("1 users imported, 5 skipped", stdout)
+        self.assertIn("This login is already in use", stderr)
+        self.assertIn("This email is already in use", stderr)
+        # Users without a password can't log in until they reset it
+        user = self.UserModel.objects.get(login="Duplicate")
+        self.assertIs(user.has_usable_password(), False)
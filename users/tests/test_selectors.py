@@ -0,0 +1,42 @@
+from utils.exceptions import NotFound404
+from utils.tests import ExtendedTestCase
+
+from ..selectors import get_user_by_login_or_404, get_user_id_by_login_or_404
+
+
+class UserIdResolverTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+
+    def test_user_id_is_cached(self):
+        get_user_id_by_login_or_404("User")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_id_by_login_or_404("User"),
+                             self.user.id)
+
+    def test_invalid_login(self):
+        with self.assertRaises(NotFound404):
+            get_user_id_by_login_or_404("invalid")
+
+        # Missing logins are not cached
+        user = self.UserModel.objects.create_user(
+            login="invalid", email="invalid@gmail.com", password="pass")
+        self.assertEqual(get_user_id_by_login_or_404("invalid"), user.id)
+
+    def test_login_change(self):
+        get_user_id_by_login_or_404("User")
+        self.user.login = "NewLogin"
+        self.user.save(update_fields=("login",))
+
+        with self.assertRaises(NotFound404):
+            get_user_id_by_login_or_404("User")
+        self.assertEqual(get_user_by_login_or_404("NewLogin"), self.user)
+
+    def test_user_deletion(self):
+        get_user_id_by_login_or_404("User")
+        self.user.delete()
+
+        with self.assertRaises(NotFound404):
+            get_user_by_login_or_404("User")
@@ -1,3 +1,5 @@
+from rest_framework.test import APIRequestFactory
+
 from utils.shortcuts import generate_messages_list_by_serializer_errors
 from utils.tests import ExtendedTestCase
 
@@ -26,6 +28,29 @@ class UserSerializerTestCase(ExtendedTestCase):
         self.assertEqual(len(serializer.data), 4)
         self.assertIs(serializer.data["isAdmin"], True)
 
+    def test_avatar_thumbnail(self):
+        """
+        The thumbnail of the avatar is used, WebP if the client accepts it
+        """
+        user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        avatar = user.profile.avatar
+        avatar.link = "http://localhost:8000/full.jpg"
+        avatar.variants = {"thumbnail": {
+            "jpeg": {"file_id": "1", "link": "http://localhost:8000/1.jpg"},
+            "webp": {"file_id": "2", "link": "http://localhost:8000/2.webp"}
+        }}
+        avatar.save()
+
+        request = APIRequestFactory().get("/", HTTP_ACCEPT="image/webp,*/*")
+        webp_serializer = self.serializer_class(
+            instance=user, context={"request": request})
+
+        self.assertEqual(self.serializer_class(instance=user).data["avatar"],
+                         "http://localhost:8000/1.jpg")
+        self.assertEqual(webp_serializer.data["avatar"],
+                         "http://localhost:8000/2.webp")
+
 
 class CreateUserSerializerTestCase(ExtendedTestCase):
     serializer_class = CreateUserSerializer
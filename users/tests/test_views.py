@@ -1,9 +1,17 @@
+from io import StringIO
+from unittest.mock import patch
 from urllib.parse import urlencode
 
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 
+from bans.cache import banned_users
 from followers.services import follow
+from posts.models import Attachment, Like, Post
+from profiles.services.images import update_instance_image
 from utils.tests import APIViewTestCase, ListAPIViewTestCase
+from verification.models import OutboxEmail
 
 
 class ListCreateUsersAPIViewTestCase(ListAPIViewTestCase):
@@ -63,6 +71,28 @@ class ListCreateUsersAPIViewTestCase(ListAPIViewTestCase):
         response = self.client.get(self.url({"q": "3333"}))
         self.check_common_details_of_list_view_response(response)
 
+    def test_users_list_search_is_case_insensitive(self):
+        response = self.client.get(self.url({"q": "rdUSE"}))
+
+        self.check_common_details_of_list_view_response(
+            response, page_size=1, total_items=1)
+        self.assertEqual(response.data["items"][0]["id"], self.third_user.id)
+
+        response = self.client.get(self.url({"q": "d"}))
+        self.check_common_details_of_list_view_response(
+            response, page_size=2, total_items=2)
+
+    def test_users_list_search_after_login_change(self):
+        self.third_user.login = "RenamedUser"
+        self.third_user.save()
+
+        response = self.client.get(self.url({"q": "ThirdUser"}))
+        self.check_common_details_of_list_view_response(response)
+
+        response = self.client.get(self.url({"q": "renamed"}))
+        self.check_common_details_of_list_view_response(
+            response, page_size=1, total_items=1)
+
     def test_users_list_with_valid_limit_parameter(self):
         response = self.client.get(self.url({"limit": 2}))
 
@@ -100,6 +130,51 @@ class ListCreateUsersAPIViewTestCase(ListAPIViewTestCase):
         self.check_common_details_of_list_view_response(
             response, total_items=3, total_pages=3, page_size=1, page_number=2)
 
+    def test_users_list_with_cursor_parameter(self):
+        """
+        Users list with the cursor parameter should be paginated by keyset
+        and should not contain totalItems and totalPages
+        """
+        response = self.client.get(self.url({"limit": 2, "cursor": ""}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertNotIn("totalItems", response.data)
+        self.assertNotIn("totalPages", response.data)
+        self.assertEqual(response.data["pageSize"], 2)
+        self.assertIsNone(response.data["prevCursor"])
+        self.assertEqual(response.data["items"][0]["id"], self.third_user.id)
+        self.assertEqual(response.data["items"][1]["id"], self.second_user.id)
+
+        next_cursor = response.data["nextCursor"]
+        response = self.client.get(
+            self.url({"limit": 2, "cursor": next_cursor}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.data["pageSize"], 1)
+        self.assertEqual(response.data["items"][0]["id"], self.first_user.id)
+        self.assertIsNone(response.data["nextCursor"])
+
+        prev_cursor = response.data["prevCursor"]
+        response = self.client.get(
+            self.url({"limit": 2, "cursor": prev_cursor}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.data["pageSize"], 2)
+        self.assertEqual(response.data["items"][0]["id"], self.third_user.id)
+        self.assertEqual(response.data["nextCursor"], next_cursor)
+        self.assertIsNone(response.data["prevCursor"])
+
+    def test_users_list_with_invalid_cursor_parameter(self):
+        """
+        Users list with invalid cursor parameter should return a 400 error
+        """
+        response = self.client.get(self.url({"cursor": "invalid"}))
+
+        self.client_error_response_test(
+            response,
+            messages=["Invalid cursor value"]
+        )
+
     def test_users_list_with_invalid_page_parameter(self):
         """
         Users list with invalid page parameter should return a 400 error
@@ -148,6 +223,33 @@ class ListCreateUsersAPIViewTestCase(ListAPIViewTestCase):
         self.assertEqual(response.data["messages"][0],
                          "You are already authenticated")
 
+    def test_registration(self):
+        """
+        The verification email is queued in the outbox
+        instead of being sent during the request
+        """
+        self.client.credentials()
+        payload = {
+            "login": "NewUser",
+            "email": "new@user.com",
+            "password1": "pass",
+            "password2": "pass"
+        }
+        # Login and email check, savepoint, user, login trigrams,
+        # 4 profile rows, profile document(SELECT and INSERT),
+        # code check, code, email, savepoint release
+        with self.assertNumQueries(14):
+            response = self.client.post(self.url(), payload)
+
+        self.assertEqual(response.status_code,
+                         self.http_status.HTTP_204_NO_CONTENT)
+
+        user = self.UserModel.objects.get(login="NewUser")
+        email = OutboxEmail.objects.get()
+        self.assertIs(user.is_active, False)
+        self.assertEqual(email.to_email, "new@user.com")
+        self.assertIn(user.verificationcode.code, email.body)
+
     def test_invalid_registration(self):
         """
         Invalid registration request should return a 400 status code
@@ -170,6 +272,27 @@ class ListCreateUsersAPIViewTestCase(ListAPIViewTestCase):
             fields_errors_dict_len=3
         )
 
+    def test_registration_with_reserved_login(self):
+        """
+        Registration with a login that clashes with the users routes
+        should return a 400 error
+        """
+        self.client.credentials()
+        payload = {
+            "login": "autocomplete",
+            "email": "autocomplete@gmail.com",
+            "password1": "pass",
+            "password2": "pass"
+        }
+
+        response = self.client.post(self.url(), payload)
+
+        self.client_error_response_test(
+            response,
+            fields_errors_dict_len=1,
+            messages=["This login is reserved"]
+        )
+
     def test_registration_with_used_email(self):
         """
         Registration with the used email should return a 400 error
@@ -265,8 +388,80 @@ class RetrieveUserProfileAPIViewTestCase(APIViewTestCase):
         response = self.client.get(self.url({"login": self.second_user.login}))
 
         self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
-        self.assertEqual(response.data["id"], self.second_user.id)
-        self.assertNotIn("theme", response.data)
+        self.assertEqual(response.json()["id"], self.second_user.id)
+        self.assertNotIn("theme", response.json())
+
+    @override_settings(BANS_VERSION_CHECK_INTERVAL=60)
+    def test_user_profile_detail_number_of_queries(self):
+        banned_users.invalidate()
+        banned_users.refresh()
+        url = self.url({"login": self.second_user.login})
+
+        # The authenticated user, the user id and the profile document
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.json()["contacts"]["github"],
+                         "https://github.com/HanSaloZu")
+        self.assertIs(response.json()["isBanned"], False)
+
+    @override_settings(BANS_VERSION_CHECK_INTERVAL=60)
+    def test_user_profile_detail_not_modified(self):
+        banned_users.invalidate()
+        banned_users.refresh()
+        url = self.url({"login": self.second_user.login})
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        # The user, its id and the response are cached
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code,
+                         self.http_status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_user_profile_detail_after_profile_change(self):
+        url = self.url({"login": self.second_user.login})
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second_user.profile.status = "New status"
+            self.second_user.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["status"], "New status")
+
+    @override_settings(IMAGE_VARIANTS={"full": 2048},
+                       IMAGE_VARIANTS_FORMATS=("jpeg",))
+    @patch("profiles.services.images.get_image_storage")
+    def test_user_profile_detail_after_image_processing(self, get_storage):
+        """
+        An avatar stored by the image worker should
+        invalidate the cached profile response
+        """
+        get_storage.return_value.upload.return_value = (
+            "file1", "http://localhost:8000/file1")
+        url = self.url({"login": self.second_user.login})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_instance_image(self.second_user.profile.avatar,
+                                  self.generate_image_file())
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("process_image_jobs", "--once", "--threads", "1",
+                         stdout=StringIO(), stderr=StringIO())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.json()["avatar"],
+                         "http://localhost:8000/file1")
 
     def test_self_profile_detail(self):
         """
@@ -276,8 +471,8 @@ class RetrieveUserProfileAPIViewTestCase(APIViewTestCase):
         response = self.client.get(self.url({"login": self.first_user.login}))
 
         self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
-        self.assertEqual(response.data["id"], self.first_user.id)
-        self.assertNotIn("theme", response.data)
+        self.assertEqual(response.json()["id"], self.first_user.id)
+        self.assertNotIn("theme", response.json())
 
     def test_user_profile_detail_with_invalid_user_login(self):
         """
@@ -293,6 +488,60 @@ class RetrieveUserProfileAPIViewTestCase(APIViewTestCase):
             messages=["Invalid login, user is not found"])
 
 
+class AutocompleteUsersAPIViewTestCase(APIViewTestCase):
+    def url(self, parameters={}):
+        return reverse("users_autocomplete") + "?" + urlencode(parameters)
+
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.generate_jwt_auth_credentials(self.user)
+        )
+
+        for login in ("alex", "alexander", "Alexey", "balex"):
+            self.UserModel.objects.create_user(
+                login=login, email=f"{login}@gmail.com", password="pass")
+
+    def test_request_by_unauthenticated_client(self):
+        self.client.credentials()
+        response = self.client.get(self.url({"q": "al"}))
+
+        self.unauthorized_client_error_response_test(response)
+
+    def test_autocomplete(self):
+        """
+        Autocomplete should return the users whose logins start
+        with the q parameter, shortest logins go first
+        """
+        response = self.client.get(self.url({"q": "ale"}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        logins = [item["login"] for item in response.data["items"]]
+        self.assertEqual(logins, ["alex", "Alexey", "alexander"])
+        self.assertEqual(len(response.data["items"][0]), 4)
+
+        response = self.client.get(self.url({"q": "a", "limit": 1}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        logins = [item["login"] for item in response.data["items"]]
+        self.assertEqual(logins, ["alex"])
+
+    def test_autocomplete_with_empty_q_parameter(self):
+        response = self.client.get(self.url({"q": ""}))
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        self.assertEqual(response.data["items"], [])
+
+    def test_autocomplete_with_invalid_limit_parameter(self):
+        response = self.client.get(self.url({"q": "a", "limit": 21}))
+
+        self.client_error_response_test(
+            response,
+            messages=["Maximum number of users is 20"]
+        )
+
+
 class ListUserFollowersAPIViewTestCase(ListAPIViewTestCase):
     def url(self, kwargs={}, parameters={}):
         url = reverse("user_followers_list", kwargs=kwargs)
@@ -417,3 +666,59 @@ class ListUserFollowingAPIViewTestCase(ListAPIViewTestCase):
             status=self.http_status.HTTP_404_NOT_FOUND,
             messages=["Invalid login, user is not found"]
         )
+
+
+class ListUserPostsAPIViewTestCase(ListAPIViewTestCase):
+    def url(self, kwargs, parameters={}):
+        url = reverse("user_posts_list", kwargs=kwargs)
+        if parameters:
+            url += "?" + urlencode(parameters)
+
+        return url
+
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User", email="user@gmail.com", password="pass")
+        self.target_user = self.UserModel.objects.create_user(
+            login="TargetUser", email="target@gmail.com", password="pass")
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=self.generate_jwt_auth_credentials(self.user)
+        )
+
+        for i in range(5):
+            post = Post.objects.create(
+                author=self.target_user, body=f"Post #{i}")
+            Like.objects.create(user=self.user, post=post)
+            Attachment.objects.create(
+                post=post, file_id=str(i), link=f"http://localhost:8000/{i}")
+
+        Post.objects.create(author=self.user, body="Foreign post")
+
+    def test_user_posts_list(self):
+        """
+        A user posts list request should return
+        only the posts of the specified user
+        """
+        response = self.client.get(self.url({"login": "TargetUser"}))
+
+        self.check_common_details_of_list_view_response(
+            response,
+            total_items=5,
+            page_size=5
+        )
+
+        for post in response.data["items"]:
+            self.assertEqual(post["author"]["id"], self.target_user.id)
+            self.assertIs(post["isLiked"], True)
+
+    def test_user_posts_list_number_of_queries(self):
+        """
+        The number of queries should not depend on the number of posts
+        """
+        single_post_page_queries = self.count_list_view_queries(
+            self.url({"login": "TargetUser"}, {"limit": 1}))
+        full_page_queries = self.count_list_view_queries(
+            self.url({"login": "TargetUser"}, {"limit": 5}))
+
+        self.assertEqual(single_post_page_queries, full_page_queries)
@@ -1,11 +1,13 @@
 from django.urls import path
 
-from .views import (ListCreateUsersAPIView, ListUserFollowersAPIView,
-                    ListUserFollowingAPIView, ListUserPostsAPIView,
-                    RetrieveUserProfileAPIView)
+from .views import (AutocompleteUsersAPIView, ListCreateUsersAPIView,
+                    ListUserFollowersAPIView, ListUserFollowingAPIView,
+                    ListUserPostsAPIView, RetrieveUserProfileAPIView)
 
 urlpatterns = [
     path("", ListCreateUsersAPIView.as_view(), name="users_list"),
+    path("autocomplete/", AutocompleteUsersAPIView.as_view(),
+         name="users_autocomplete"),
     path("<str:login>/", RetrieveUserProfileAPIView.as_view(),
          name="user_profile_detail"),
     path("<str:login>/posts/", ListUserPostsAPIView.as_view(),
@@ -1,20 +1,30 @@
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import (get_conditional_response,
+                                patch_cache_control, patch_vary_headers)
 from rest_framework.generics import RetrieveAPIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT
+from rest_framework.views import APIView
 
 from followers.selectors import (get_user_followers_ids_list,
                                  get_user_followings_ids_list)
 from posts.mixins import ListPostsWithOrderingAPIViewMixin
-from profiles.selectors import get_profile_by_user_login_or_404
-from profiles.serializers import ProfileSerializer
-from utils.exceptions import Forbidden403, NotAuthenticated401
+from profiles.cache import profile_responses
+from profiles.selectors import get_profile_document_by_user_id
+from profiles.serializers import (ProfileDocumentSerializer,
+                                  get_accepted_image_format)
+from utils.exceptions import BadRequest400, Forbidden403, NotAuthenticated401
 from utils.shortcuts import raise_400_based_on_serializer
 from utils.views import LoginRequiredAPIView
-from verification.services.codes import create_verification_code
+from verification.services.codes import issue_verification_code
 from verification.services.email import send_verification_email
 
 from .mixins import ListUsersAPIViewMixin
-from .serializers import CreateUserSerializer
+from .search import autocomplete_users
+from .selectors import get_user_id_by_login_or_404
+from .serializers import CreateUserSerializer, UserSerializer
 
 
 class ListCreateUsersAPIView(ListUsersAPIViewMixin):
@@ -34,24 +44,61 @@ class ListCreateUsersAPIView(ListUsersAPIViewMixin):
         serializer = CreateUserSerializer(data=request.data)
 
         if serializer.is_valid():
-            user = serializer.save()
+            # The email is sent by the send_emails worker, it is
+            # queued only if the user has been created
+            with transaction.atomic():
+                user = serializer.save()
 
-            verification_code = create_verification_code(user).code
-            send_verification_email(user, verification_code)
+                verification_code = issue_verification_code(user)
+                send_verification_email(user, verification_code)
 
             return Response(status=HTTP_204_NO_CONTENT)
 
         raise_400_based_on_serializer(serializer)
 
 
+class AutocompleteUsersAPIView(LoginRequiredAPIView, APIView):
+    """
+    Lists the users whose logins start with the q parameter
+    """
+
+    def get(self, request):
+        """
+        Query parameters:
+
+            q - login prefix
+            limit - maximum number of users
+        """
+        q = request.query_params.get("q", "")
+
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise BadRequest400("Invalid limit value")
+
+        if limit > 20:
+            raise BadRequest400("Maximum number of users is 20")
+        elif limit < 1:
+            raise BadRequest400("Minimum number of users is 1")
+
+        users = []
+        if q:
+            users = autocomplete_users(q).select_related(
+                "profile__avatar")[:limit]
+
+        return Response({
+            "items": UserSerializer(users, many=True).data
+        })
+
+
 class ListUserFollowersAPIView(LoginRequiredAPIView, ListUsersAPIViewMixin):
     """
     Lists the users following the specified user
     """
 
     def filter_queryset(self, queryset, kwargs):
-        target_user = get_profile_by_user_login_or_404(kwargs["login"]).user
-        followers_ids = get_user_followers_ids_list(target_user)
+        target_user_id = get_user_id_by_login_or_404(kwargs["login"])
+        followers_ids = get_user_followers_ids_list(target_user_id)
         queryset_of_followers = queryset.filter(id__in=followers_ids)
 
         return super().filter_queryset(queryset_of_followers, kwargs)
@@ -63,8 +110,8 @@ class ListUserFollowingAPIView(LoginRequiredAPIView, ListUsersAPIViewMixin):
     """
 
     def filter_queryset(self, queryset, kwargs):
-        target_user = get_profile_by_user_login_or_404(kwargs["login"]).user
-        followings_ids = get_user_followings_ids_list(target_user)
+        target_user_id = get_user_id_by_login_or_404(kwargs["login"])
+        followings_ids = get_user_followings_ids_list(target_user_id)
         queryset_of_followings = queryset.filter(id__in=followings_ids)
 
         return super().filter_queryset(queryset_of_followings, kwargs)
@@ -76,10 +123,33 @@ class RetrieveUserProfileAPIView(LoginRequiredAPIView, RetrieveAPIView):
     """
 
     def retrieve(self, request, *args, **kwargs):
-        instance = get_profile_by_user_login_or_404(kwargs["login"])
-        serializer = ProfileSerializer(instance)
-
-        return Response(serializer.data)
+        """
+        The profile has no viewer-specific fields, it is rendered once per
+        version and image format, a request with the ETag of the cached
+        response(If-None-Match) is answered with 304 Not Modified
+        """
+        user_id = get_user_id_by_login_or_404(kwargs["login"])
+        context = {"request": request}
+        format = get_accepted_image_format(context)
+
+        version = profile_responses.get_version(user_id)
+        cached_response = profile_responses.get(user_id, version, format)
+
+        if cached_response is None:
+            document = get_profile_document_by_user_id(user_id)
+            serializer = ProfileDocumentSerializer(document, context=context)
+            cached_response = profile_responses.set(
+                user_id, version, format,
+                JSONRenderer().render(serializer.data))
+
+        etag, content = cached_response
+        response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept",))
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return get_conditional_response(request, etag=etag,
+                                        response=response)
 
 
 class ListUserPostsAPIView(LoginRequiredAPIView,
@@ -89,7 +159,7 @@ class ListUserPostsAPIView(LoginRequiredAPIView,
     """
 
     def filter_queryset(self, queryset, kwargs):
-        target_user = get_profile_by_user_login_or_404(kwargs["login"]).user
-        posts = queryset.filter(author=target_user)
+        target_user_id = get_user_id_by_login_or_404(kwargs["login"])
+        posts = queryset.filter(author_id=target_user_id)
 
         return super().filter_queryset(posts, kwargs)
@@ -0,0 +1,142 @@
+import re
+from hashlib import sha256
+from random import random
+from time import monotonic, sleep
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+# Keys safe for every backend, memcached refuses spaces,
+# control characters and keys longer than 250 characters
+SAFE_KEY_PATTERN = re.compile(r"[\w.:-]{1,200}")
+
+MISSING = object()
+
+
+def get_jittered_ttl(ttl):
+    """
+    Reduces the TTL by a random share of up to CACHE_TTL_JITTER,
+    so that entries cached at the same time don't expire together
+    """
+    if not ttl:
+        return ttl
+    return max(1, round(ttl * (1 - settings.CACHE_TTL_JITTER * random())))
+
+
+def is_cache_shared():
+    """
+    Returns False if the cache is kept in the memory of each process,
+    so entries can't be invalidated by the other processes
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+class CacheNamespace:
+    """
+    Cache entries whose keys are prefixed with the name and the version of
+    the namespace. Replacing the version invalidates all the entries at once,
+    entries of the previous versions are never read again and expire.
+    Expired entries are recomputed by a single process, see get_or_set
+    """
+
+    def __init__(self, name, ttl_setting):
+        self.name = name
+        self.ttl_setting = ttl_setting
+
+    @property
+    def ttl(self):
+        return getattr(settings, self.ttl_setting)
+
+    def _get_version_key(self):
+        return f"{self.name}:version"
+
+    def get_version(self):
+        key = self._get_version_key()
+        version = cache.get(key)
+
+        if version is None:
+            version = uuid4().hex
+            # Another process may have set the version in between
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+
+        return version
+
+    def make_key(self, *parts, version=None):
+        """
+        Builds the key of the current version, or of the given one
+        to read and write a value computed before an invalidation
+        """
+        key = ":".join(str(part) for part in parts)
+        if not SAFE_KEY_PATTERN.fullmatch(key):
+            key = sha256(key.encode()).hexdigest()
+
+        return f"{self.name}:{version or self.get_version()}:{key}"
+
+    def get(self, *parts, default=None, version=None):
+        return cache.get(self.make_key(*parts, version=version), default)
+
+    def set(self, parts, value, ttl=None, version=None):
+        cache.set(self.make_key(*parts, version=version), value,
+                  get_jittered_ttl(ttl or self.ttl))
+
+    def delete(self, *parts):
+        """
+        Deletes the entry now and once the transaction is committed,
+        the value may be cached again by another process in between
+        """
+        key = self.make_key(*parts)
+        cache.delete(key)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    def invalidate(self):
+        """
+        Invalidates all the entries of the namespace
+        now and once the transaction is committed
+        """
+        def replace_version():
+            cache.set(self._get_version_key(), uuid4().hex, None)
+
+        replace_version()
+        transaction.on_commit(replace_version)
+
+    def get_or_set(self, parts, compute, ttl=None):
+        """
+        Returns the cached value or caches the result of compute. A missing
+        value is computed by one process at a time, the others wait for
+        it up to CACHE_RECOMPUTE_LOCK_TIMEOUT seconds. Exceptions
+        raised by compute are not cached
+        """
+        key = self.make_key(*parts)
+        value = cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        lock_key = f"{key}:lock"
+        lock_timeout = settings.CACHE_RECOMPUTE_LOCK_TIMEOUT
+
+        if cache.add(lock_key, True, lock_timeout):
+            try:
+                value = compute()
+                cache.set(key, value, get_jittered_ttl(ttl or self.ttl))
+            finally:
+                cache.delete(lock_key)
+
+            return value
+
+        deadline = monotonic() + lock_timeout
+        while monotonic() < deadline:
+            sleep(settings.CACHE_RECOMPUTE_POLL_INTERVAL)
+
+            value = cache.get(key, MISSING)
+            if value is not MISSING:
+                return value
+            # The computation has failed, e.g. the object doesn't exist
+            if not cache.get(lock_key):
+                break
+
+        return compute()
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+
+def map_in_threads(func, items, max_workers):
+    """
+    Calls func for each item in a bounded thread pool and returns
+    the results in the order of the items. Exceptions are raised
+    after all the calls have finished
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+
+    def call(item):
+        try:
+            return func(item)
+        finally:
+            # Each thread has its own database connections
+            connections.close_all()
+
+    max_workers = min(len(items), max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(call, item) for item in items]
+
+    return [future.result() for future in futures]
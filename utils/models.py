@@ -0,0 +1,66 @@
+from copy import deepcopy
+
+
+class DirtyFieldsMixin:
+    """
+    Remembers the values of the fields loaded from the database, save()
+    of a loaded object writes only the changed fields and doesn't
+    query the database at all if nothing has changed
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.reset_dirty_fields()
+
+        return instance
+
+    def reset_dirty_fields(self):
+        """
+        Marks the current values as saved, e.g. after bulk_create
+        """
+        self._loaded_values = self._get_loaded_values()
+
+    def _get_loaded_values(self, fields=None):
+        # Deferred fields are not in __dict__ until they are loaded,
+        # mutable values(e.g. of JSONField) are copied
+        return {
+            field.attname: deepcopy(self.__dict__[field.attname])
+            for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__ and
+            (fields is None or field.attname in fields or field.name in fields)
+        }
+
+    def get_dirty_fields(self):
+        """
+        Returns the names of the fields changed since the object was
+        loaded or saved, None if the object has not been loaded
+        """
+        loaded_values = getattr(self, "_loaded_values", None)
+        if loaded_values is None:
+            return None
+
+        return [
+            field.attname for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__ and (
+                field.attname not in loaded_values or
+                loaded_values[field.attname] != self.__dict__[field.attname])
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None \
+                and not args and not kwargs.get("force_insert"):
+            dirty_fields = self.get_dirty_fields()
+            # Django skips the save if update_fields is empty
+            if dirty_fields is not None:
+                kwargs["update_fields"] = dirty_fields
+
+        super().save(*args, **kwargs)
+        self.reset_dirty_fields()
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+
+        if getattr(self, "_loaded_values", None) is None:
+            self._loaded_values = {}
+        self._loaded_values.update(self._get_loaded_values(fields))
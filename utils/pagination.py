@@ -0,0 +1,198 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import date
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+# Range of the integers every database can compare with a column
+MIN_INTEGER, MAX_INTEGER = -2 ** 63, 2 ** 63 - 1
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor, prev_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+
+class CursorPaginator:
+    """
+    Keyset pagination. The cursor encodes the values of the ordering
+    fields(plus the primary key) of the first or last item of a page,
+    so the next page is a range scan instead of an OFFSET, no COUNT
+    is needed and concurrently inserted rows don't shift pages
+    """
+
+    def __init__(self, queryset, per_page):
+        self.per_page = per_page
+        self.ordering = self.get_ordering(queryset)
+        self.queryset = queryset
+
+    def get_ordering(self, queryset):
+        if queryset.query.order_by:
+            ordering = list(queryset.query.order_by)
+        else:
+            ordering = list(queryset.model._meta.ordering)
+
+        if not all(isinstance(field, str) for field in ordering):
+            raise ValueError(
+                "Cursor pagination supports only ordering by field names")
+
+        pk_names = ("pk", queryset.model._meta.pk.name)
+        if not any(field.lstrip("-") in pk_names for field in ordering):
+            sign = "-" if ordering and ordering[0].startswith("-") else ""
+            ordering.append(sign + "pk")
+
+        return ordering
+
+    def get_page(self, cursor=""):
+        values, backwards = self.decode_cursor(cursor)
+
+        ordering = self.ordering
+        if backwards:
+            ordering = [reverse_ordering_field(f) for f in ordering]
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(get_keyset_filter(ordering, values))
+
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+
+        if backwards:
+            object_list.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, values is not None
+
+        next_cursor = prev_cursor = None
+        if object_list and has_next:
+            next_cursor = self.encode_cursor(object_list[-1])
+        if object_list and has_prev:
+            prev_cursor = self.encode_cursor(object_list[0], backwards=True)
+
+        return CursorPage(object_list, next_cursor, prev_cursor)
+
+    def get_values(self, obj):
+        values = []
+
+        for field in self.ordering:
+            value = obj
+            for attr in field.lstrip("-").split("__"):
+                value = getattr(value, attr)
+
+            if isinstance(value, date):
+                value = value.isoformat()
+            values.append(value)
+
+        return values
+
+    def encode_cursor(self, obj, backwards=False):
+        data = {
+            "o": self.ordering,
+            "v": self.get_values(obj),
+            "b": backwards
+        }
+        raw = json.dumps(data, separators=(",", ":")).encode()
+
+        return urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def get_ordering_field(self, name):
+        """
+        Returns the model field or the output field of
+        the annotation the queryset is ordered by
+        """
+        query = self.queryset.query
+        if name in query.annotations:
+            return query.annotations[name].output_field
+
+        opts = query.model._meta
+        for part in name.split("__"):
+            field = opts.pk if part == "pk" else opts.get_field(part)
+            if field.is_relation:
+                opts = field.related_model._meta
+
+        return field
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, False
+
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            data = json.loads(urlsafe_b64decode(cursor + padding))
+            ordering, values = data["o"], data["v"]
+            backwards = bool(data["b"])
+        except (BinasciiError, ValueError, TypeError, KeyError):
+            raise InvalidCursor
+
+        if ordering != self.ordering or not isinstance(values, list) or \
+                len(values) != len(ordering):
+            raise InvalidCursor
+
+        return self.clean_values(values), backwards
+
+    def clean_values(self, values):
+        """
+        Converts the cursor values to the types of the ordering fields,
+        a tampered cursor must not reach the database
+        """
+        cleaned_values = []
+
+        for field_name, value in zip(self.ordering, values):
+            if value is None:
+                raise InvalidCursor
+
+            try:
+                field = self.get_ordering_field(field_name.lstrip("-"))
+                value = field.to_python(value)
+                field.run_validators(value)
+            except (FieldDoesNotExist, ValidationError, ValueError,
+                    TypeError, OverflowError):
+                raise InvalidCursor
+
+            if isinstance(value, int) and \
+                    not MIN_INTEGER <= value <= MAX_INTEGER:
+                raise InvalidCursor
+
+            cleaned_values.append(value)
+
+        return cleaned_values
+
+
+def reverse_ordering_field(field):
+    if field.startswith("-"):
+        return field[1:]
+    return "-" + field
+
+
+def get_keyset_filter(ordering, values):
+    """
+    Builds (a > x) OR (a = x AND b > y) OR ... condition
+    for the ordering fields and the cursor values
+    """
+    keyset_filter = Q()
+
+    for i, field in enumerate(ordering):
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition = Q(**{f"{field.lstrip('-')}__{lookup}": values[i]})
+
+        for previous_field, value in zip(ordering[:i], values):
+            condition &= Q(**{previous_field.lstrip("-"): value})
+
+        keyset_filter |= condition
+
+    return keyset_filter
@@ -1,13 +1,44 @@
+from io import BytesIO
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
+# Each test rolls back its bans, so the banned users set must not
+# be reused between tests without checking the bans version. Tests run
+# with a cache of their own, whatever backend is configured
+@override_settings(
+    BANS_VERSION_CHECK_INTERVAL=0,
+    CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tests"
+    }}
+)
 class ExtendedTestCase(APITestCase):
     UserModel = get_user_model()
 
+    def _pre_setup(self):
+        super()._pre_setup()
+        # Ids of the rolled back rows are reused by the next tests
+        cache.clear()
+
+    def generate_image_file(self, name="image.jpg", format="JPEG",
+                            size=(64, 64)):
+        buffer = BytesIO()
+        Image.new("RGB", size, "red").save(buffer, format)
+
+        return SimpleUploadedFile(name, buffer.getvalue(),
+                                  f"image/{format.lower()}")
+
 
 class APIViewTestCase(ExtendedTestCase):
     http_status = status
@@ -77,3 +108,12 @@ class ListAPIViewTestCase(APIViewTestCase):
         self.assertEqual(response.data["totalPages"], total_pages)
         self.assertEqual(response.data["pageSize"], page_size)
         self.assertEqual(response.data["pageNumber"], page_number)
+
+    def count_list_view_queries(self, url):
+        # Each request is counted with the cache of the selectors empty
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, self.http_status.HTTP_200_OK)
+        return len(context.captured_queries)
@@ -4,6 +4,7 @@ from rest_framework.views import APIView
 
 from .exceptions import (BadRequest400, Forbidden403, NotAuthenticated401,
                          get_exception_json_response)
+from .pagination import CursorPaginator, InvalidCursor
 
 
 class LoginRequiredAPIView:
@@ -40,6 +41,10 @@ class ListAPIViewMixin(APIView):
             limit - number of items per page
             page - page number
             ordering - list sorting
+            cursor - keyset pagination cursor(nextCursor or prevCursor of
+                the previous response, an empty value requests
+                the first page), the page parameter is ignored and
+                the total number of items is not calculated
         """
         kwargs["q"] = request.query_params.get("q", "")
         kwargs["ordering"] = request.query_params.get("ordering", "")
@@ -61,6 +66,10 @@ class ListAPIViewMixin(APIView):
 
         queryset = self.filter_queryset(self.get_queryset(), kwargs)
 
+        if "cursor" in request.query_params:
+            return self.get_cursor_paginated_response(
+                request, queryset, kwargs["limit"])
+
         paginator = Paginator(queryset, kwargs["limit"])
         page = paginator.get_page(kwargs["page"])
         page_size = len(page.object_list)
@@ -75,3 +84,21 @@ class ListAPIViewMixin(APIView):
             "pageSize": page_size,
             "pageNumber": page.number
         })
+
+    def get_cursor_paginated_response(self, request, queryset, limit):
+        paginator = CursorPaginator(queryset, limit)
+
+        try:
+            page = paginator.get_page(request.query_params["cursor"])
+        except InvalidCursor:
+            raise BadRequest400("Invalid cursor value")
+
+        serializer = self.serializer_class(
+            page, many=True, context={"request": request})
+
+        return Response({
+            "items": serializer.data,
+            "pageSize": len(page),
+            "nextCursor": page.next_cursor,
+            "prevCursor": page.prev_cursor
+        })
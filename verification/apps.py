@@ -4,6 +4,3 @@ from django.apps import AppConfig
 class VerificationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "verification"
-
-    def ready(self):
-        import verification.signals
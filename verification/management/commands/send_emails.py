@@ -0,0 +1,30 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from verification.services.email import (claim_outbox_emails,
+                                         send_outbox_emails)
+
+
+class Command(BaseCommand):
+    help = ("Sends the emails queued in the outbox in batches, "
+            "one SMTP connection per batch")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Exit when there are no more emails instead of waiting")
+
+    def handle(self, *args, **options):
+        while True:
+            emails = claim_outbox_emails()
+
+            if not emails:
+                if options["once"]:
+                    return
+                sleep(settings.EMAIL_OUTBOX_WORKER_POLL_INTERVAL)
+                continue
+
+            sent = send_outbox_emails(emails)
+            self.stdout.write(f"{sent} of {len(emails)} emails sent")
@@ -0,0 +1,25 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from verification.services.codes import remove_expired_codes
+
+
+class Command(BaseCommand):
+    help = ("Periodically removes the expired email verification codes, "
+            "they are already rejected when they are used")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Remove the expired codes once instead of periodically")
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = remove_expired_codes()
+            self.stdout.write(f"{deleted} expired codes removed")
+
+            if options["once"]:
+                return
+            sleep(settings.EMAIL_VERIFICATION_CODES_SWEEP_INTERVAL)
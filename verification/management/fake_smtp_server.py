@@ -0,0 +1,93 @@
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from threading import Lock, Thread
+
+
+class FakeSMTPRequestHandler(StreamRequestHandler):
+    """
+    Implements the part of SMTP used by smtplib without
+    authentication and encryption, every message is accepted
+    unless one of its recipients is refused
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.add_connection()
+        self.reply("220 localhost Fake SMTP server")
+        recipients = []
+
+        for line in self.rfile:
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command.split(":", 1)[1].strip(" <>")
+                if recipient in self.server.refused_recipients:
+                    self.reply("550 Mailbox unavailable")
+                else:
+                    recipients.append(recipient)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                self.server.add_message(recipients, self.read_data())
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            else:
+                self.reply("502 Command not implemented")
+
+    def read_data(self):
+        lines = []
+        for line in self.rfile:
+            if line == b".\r\n":
+                break
+            lines.append(line)
+
+        return b"".join(lines).decode()
+
+
+class FakeSMTPServer(ThreadingTCPServer):
+    """
+    Local SMTP server for the tests of the send_emails worker,
+    keeps the received messages and counts the connections
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, refused_recipients=()):
+        super().__init__(("127.0.0.1", 0), FakeSMTPRequestHandler)
+        self.refused_recipients = set(refused_recipients)
+        self.connections = 0
+        self.messages = []
+        self._lock = Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def add_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def add_message(self, recipients, data):
+        with self._lock:
+            self.messages.append((recipients, data))
+
+    def __enter__(self):
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verification', '0002_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='verificationcode',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
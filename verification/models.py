@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.db import Error, models
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -8,7 +9,8 @@ class VerificationCode(models.Model):
     user = models.OneToOneField(
         User, primary_key=True, on_delete=models.CASCADE)
     code = models.CharField(max_length=6, unique=True, db_index=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Indexed for the sweep_verification_codes command
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         verbose_name = "verification code"
@@ -24,3 +26,42 @@ class VerificationCode(models.Model):
                 "Attempted to create a verification code for active user")
 
         return super(VerificationCode, self).save(*args, **kwargs)
+
+
+class OutboxEmail(models.Model):
+    """
+    Email waiting to be sent by the send_emails worker, written in
+    the transaction of the change it is about. Sent emails are deleted
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        SENDING = "sending"
+        FAILED = "failed"
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+
+    status = models.CharField(max_length=10, choices=Status.choices,
+                              default=Status.PENDING)
+    # Identifies the emails claimed by a worker at once
+    batch_id = models.UUIDField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    # Failed emails are retried with an increasing delay
+    send_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "outbox email"
+        verbose_name_plural = "outbox emails"
+        db_table = "email_outbox"
+        indexes = (
+            models.Index(fields=("status", "id")),
+            models.Index(fields=("batch_id",)),
+        )
+
+    def __str__(self):
+        return f"{self.subject} to {self.to_email} ({self.status})"
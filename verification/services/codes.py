@@ -1,10 +1,33 @@
-import datetime
+import re
+from base64 import b32encode
+from time import time
 
 from django.conf import settings
-from django.utils.crypto import get_random_string
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.crypto import (constant_time_compare, get_random_string,
+                                 salted_hmac)
 
 from ..models import VerificationCode
 
+User = get_user_model()
+
+# <user id>-<signature>, the stored codes never contain a dash. Ids
+# are limited to 18 digits to fit into a 64-bit integer column
+STATELESS_CODE_PATTERN = re.compile(r"(?P<user_id>[0-9]{1,18})-[A-Z2-7]+")
+
+
+def issue_verification_code(user):
+    """
+    Returns a new email verification code of the user. Stateless
+    codes are not stored, the codes of the table are accepted as well
+    """
+    if settings.EMAIL_VERIFICATION_STATELESS_CODES:
+        return generate_stateless_verification_code(
+            user, get_verification_code_window())
+
+    return create_verification_code(user).code
+
 
 def create_verification_code(user):
     verification_code = generate_verification_code()
@@ -16,27 +39,107 @@ def generate_verification_code():
         code = get_random_string(
             length=6, allowed_chars="ABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890")
 
-        if not check_if_verification_code_exists(code):
+        # Expired codes keep their values until they are swept
+        if not VerificationCode.objects.all().filter(code=code).exists():
             return code
 
 
+def get_valid_verification_codes():
+    """
+    Returns the codes that haven't expired, expired codes are
+    removed periodically by the sweep_verification_codes command
+    """
+    code_lifetime = settings.EMAIL_VERIFICATION_CODE_LIFETIME
+
+    return VerificationCode.objects.all().filter(
+        created_at__gte=timezone.now() - code_lifetime)
+
+
+def get_verification_code_window(timestamp=None):
+    """
+    Returns the number of the time window of a stateless code
+    """
+    window = settings.EMAIL_VERIFICATION_CODE_WINDOW.total_seconds()
+    return int((time() if timestamp is None else timestamp) // window)
+
+
+def generate_stateless_verification_code(user, window):
+    """
+    Signs the user id and email with the window, the code becomes
+    invalid when it expires, the email changes or the user is activated
+    """
+    signature = salted_hmac(
+        "verification.stateless_code", f"{user.pk}:{user.email}:{window}",
+        algorithm="sha256").digest()
+
+    return f"{user.pk}-{b32encode(signature).decode()[:8]}"
+
+
+def get_user_by_stateless_verification_code(code):
+    """
+    Returns the inactive user of the code if it is valid and
+    hasn't expired, the user row is the only query
+    """
+    match = STATELESS_CODE_PATTERN.fullmatch(code)
+    user = User.objects.filter(pk=match["user_id"], is_active=False).first()
+    if user is None:
+        return None
+
+    # Every window the lifetime of the code overlaps is checked
+    current_window = get_verification_code_window()
+    windows_count = settings.EMAIL_VERIFICATION_CODE_LIFETIME // \
+        settings.EMAIL_VERIFICATION_CODE_WINDOW
+
+    for window in range(current_window - windows_count, current_window + 1):
+        if constant_time_compare(
+                code, generate_stateless_verification_code(user, window)):
+            return user
+
+    return None
+
+
 def check_if_verification_code_exists(code):
-    return VerificationCode.objects.all().filter(code=code).exists()
+    if STATELESS_CODE_PATTERN.fullmatch(code):
+        return get_user_by_stateless_verification_code(code) is not None
+
+    return get_valid_verification_codes().filter(code=code).exists()
 
 
 def verify_email_by_code(code):
-    verification_code_object = VerificationCode.objects.get(code=code)
-    user = verification_code_object.user
+    if STATELESS_CODE_PATTERN.fullmatch(code):
+        user = get_user_by_stateless_verification_code(code)
+        if user is None:
+            raise VerificationCode.DoesNotExist(
+                "Verification code is invalid or expired")
+        verification_code_object = None
+    else:
+        verification_code_object = get_valid_verification_codes().get(
+            code=code)
+        user = verification_code_object.user
 
     user.is_active = True
-    user.save()
+    user.save(update_fields=("is_active",))
 
-    verification_code_object.delete()
+    if verification_code_object is not None:
+        verification_code_object.delete()
 
 
 def remove_expired_codes():
+    """
+    Deletes the expired codes in batches to keep the deletes
+    short, returns the number of deleted codes
+    """
     code_lifetime = settings.EMAIL_VERIFICATION_CODE_LIFETIME
+    batch_size = settings.EMAIL_VERIFICATION_CODES_SWEEP_BATCH_SIZE
+    expired_codes = VerificationCode.objects.all().filter(
+        created_at__lt=timezone.now() - code_lifetime)
+    deleted = 0
+
+    while True:
+        users_ids = list(expired_codes.values_list(
+            "user_id", flat=True)[:batch_size])
+        if not users_ids:
+            return deleted
 
-    VerificationCode.objects.all().filter(
-        created_at__lt=datetime.datetime.now() - code_lifetime
-    ).delete()
+        deleted += VerificationCode.objects.filter(
+            user_id__in=users_ids).delete()[0]
@@ -1,13 +1,23 @@
-from django.core.mail import EmailMessage
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
 from django.template.loader import render_to_string
+from django.utils import timezone
+
+from ..models import OutboxEmail
 
 
-def send_email(email_subject, email_template, email_context, to_email):
+def queue_email(email_subject, email_template, email_context, to_email):
+    """
+    Writes the email into the outbox, it is sent by the send_emails
+    worker once the current transaction is committed
+    """
     message = render_to_string(email_template, email_context)
-    email = EmailMessage(
-        email_subject, message, to=[to_email]
-    )
-    email.send()
+
+    return OutboxEmail.objects.create(
+        to_email=to_email, subject=email_subject, body=message)
 
 
 def send_verification_email(user, verification_code):
@@ -16,5 +26,74 @@ def send_verification_email(user, verification_code):
         "code": verification_code
     }
 
-    send_email("Verify your email", "email/verify_email.html",
-               email_context, user.email)
+    return queue_email("Verify your email", "email/verify_email.html",
+                       email_context, user.email)
+
+
+def claim_outbox_emails():
+    """
+    Marks a batch of the oldest emails due to be sent as being sent
+    and returns it, the batch is empty if there is nothing to send
+    """
+    now = timezone.now()
+    claimable = Q(status=OutboxEmail.Status.PENDING, send_after__lte=now) | Q(
+        status=OutboxEmail.Status.SENDING,
+        updated_at__lt=now - settings.EMAIL_OUTBOX_TIMEOUT)
+
+    emails_ids = list(OutboxEmail.objects.filter(claimable).order_by(
+        "id").values_list("id", flat=True)[:settings.EMAIL_OUTBOX_BATCH_SIZE])
+
+    # Emails claimed by other workers meanwhile are not updated
+    batch_id = uuid4()
+    OutboxEmail.objects.filter(claimable, id__in=emails_ids).update(
+        status=OutboxEmail.Status.SENDING, batch_id=batch_id, updated_at=now)
+
+    return list(OutboxEmail.objects.filter(batch_id=batch_id).order_by("id"))
+
+
+def send_outbox_emails(emails):
+    """
+    Sends the emails through a single SMTP connection and returns
+    the number of sent emails. Sent emails are deleted afterwards,
+    so an email may be sent twice if the worker crashes meanwhile
+    """
+    connection = get_connection(fail_silently=False)
+
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            fail_outbox_email(email, e)
+        return 0
+
+    sent_emails_ids = []
+    try:
+        for email in emails:
+            message = EmailMessage(email.subject, email.body,
+                                   to=[email.to_email], connection=connection)
+            try:
+                message.send()
+            except Exception as e:
+                fail_outbox_email(email, e)
+            else:
+                sent_emails_ids.append(email.id)
+    finally:
+        connection.close()
+        OutboxEmail.objects.filter(id__in=sent_emails_ids).delete()
+
+    return len(sent_emails_ids)
+
+
+def fail_outbox_email(email, error):
+    email.attempts += 1
+    email.error = str(error)
+
+    if email.attempts < settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.Status.PENDING
+        email.send_after = timezone.now() + \
+            settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+    else:
+        email.status = OutboxEmail.Status.FAILED
+
+    email.save(update_fields=("attempts", "error", "status",
+                              "send_after", "updated_at"))
@@ -1,13 +0,0 @@
-from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-
-from .services.codes import remove_expired_codes
-
-User = get_user_model()
-
-
-@receiver(post_save, sender=User)
-def create_user(sender, instance, created, **kwargs):
-    if created:
-        remove_expired_codes()
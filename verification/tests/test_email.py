@@ -0,0 +1,96 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from utils.tests import ExtendedTestCase
+
+from ..management.fake_smtp_server import FakeSMTPServer
+from ..models import OutboxEmail
+from ..services.email import (claim_outbox_emails, queue_email,
+                              send_outbox_emails)
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+    EMAIL_HOST="127.0.0.1", EMAIL_USE_TLS=False, EMAIL_HOST_USER="",
+    EMAIL_HOST_PASSWORD="", EMAIL_OUTBOX_BATCH_SIZE=2,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+class OutboxTestCase(ExtendedTestCase):
+    def queue_emails(self, *to_emails):
+        for to_email in to_emails:
+            queue_email("Subject", "email/verify_email.html",
+                        {"code": "CODE12"}, to_email)
+
+    def run_worker(self, server):
+        with override_settings(EMAIL_PORT=server.port):
+            call_command("send_emails", "--once", stdout=StringIO())
+
+    def test_emails_are_sent_in_batches(self):
+        self.queue_emails("first@gmail.com", "second@gmail.com",
+                          "third@gmail.com")
+
+        with FakeSMTPServer() as server:
+            self.run_worker(server)
+
+        # Two batches, one connection per batch
+        self.assertEqual(server.connections, 2)
+        self.assertEqual([r for r, _ in server.messages], [
+            ["first@gmail.com"], ["second@gmail.com"], ["third@gmail.com"]])
+        self.assertIn("CODE12", server.messages[0][1])
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_failed_email_is_retried(self):
+        self.queue_emails("refused@gmail.com", "user@gmail.com")
+
+        with FakeSMTPServer(refused_recipients={"refused@gmail.com"}) as \
+                server:
+            self.run_worker(server)
+
+        # The other emails of the batch are sent
+        self.assertEqual([r for r, _ in server.messages],
+                         [["user@gmail.com"]])
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("refused@gmail.com", email.error)
+        # The retry is delayed
+        self.assertEqual(claim_outbox_emails(), [])
+
+        OutboxEmail.objects.update(send_after=email.created_at)
+        with FakeSMTPServer(refused_recipients={"refused@gmail.com"}) as \
+                server:
+            self.run_worker(server)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertEqual(email.attempts, 2)
+
+    def test_unavailable_server(self):
+        self.queue_emails("user@gmail.com")
+        emails = claim_outbox_emails()
+
+        with FakeSMTPServer() as server:
+            port = server.port
+
+        with override_settings(EMAIL_PORT=port):
+            self.assertEqual(send_outbox_emails(emails), 0)
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.attempts, 1)
+
+    def test_email_is_claimed_once(self):
+        self.queue_emails("user@gmail.com")
+
+        self.assertEqual(len(claim_outbox_emails()), 1)
+        self.assertEqual(claim_outbox_emails(), [])
+
+    def test_abandoned_email_is_claimed_again(self):
+        self.queue_emails("user@gmail.com")
+        claim_outbox_emails()
+
+        with override_settings(EMAIL_OUTBOX_TIMEOUT=timedelta(seconds=-1)):
+            self.assertEqual(len(claim_outbox_emails()), 1)
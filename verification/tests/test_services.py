@@ -1,3 +1,12 @@
+from io import StringIO
+from time import time
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
 from utils.tests import ExtendedTestCase
 
 from ..models import VerificationCode
@@ -58,3 +67,95 @@ class CodesTestCase(ExtendedTestCase):
         self.assertEqual(VerificationCode.objects.all().count(), 0)
         self.assertIs(self.UserModel.objects.get(
             id=self.first_user.id).is_active, True)
+
+    def expire_verification_code(self, verification_code):
+        VerificationCode.objects.filter(pk=verification_code.pk).update(
+            created_at=timezone.now() -
+            settings.EMAIL_VERIFICATION_CODE_LIFETIME * 2)
+
+    def test_expired_verification_code(self):
+        """
+        Expired codes are invalid before they are removed
+        """
+        verification_code = codes.create_verification_code(self.first_user)
+        self.expire_verification_code(verification_code)
+
+        self.assertIs(codes.check_if_verification_code_exists(
+            verification_code.code), False)
+        with self.assertRaises(VerificationCode.DoesNotExist):
+            codes.verify_email_by_code(verification_code.code)
+
+    def test_remove_expired_codes(self):
+        expired_code = codes.create_verification_code(self.first_user)
+        self.expire_verification_code(expired_code)
+        valid_code = codes.create_verification_code(self.second_user)
+
+        call_command("sweep_verification_codes", "--once", stdout=StringIO())
+
+        self.assertEqual(list(VerificationCode.objects.all()), [valid_code])
+
+
+@override_settings(EMAIL_VERIFICATION_STATELESS_CODES=True)
+class StatelessCodesTestCase(ExtendedTestCase):
+    def setUp(self):
+        self.user = self.UserModel.objects.create_user(
+            login="User",
+            email="user@gmail.com",
+            password="pass",
+            is_active=False
+        )
+
+    def test_stateless_verification_code(self):
+        code = codes.issue_verification_code(self.user)
+
+        self.assertFalse(VerificationCode.objects.exists())
+        # Only the user row is read
+        with self.assertNumQueries(1):
+            self.assertIs(codes.check_if_verification_code_exists(code),
+                          True)
+
+        codes.verify_email_by_code(code)
+
+        self.user.refresh_from_db()
+        self.assertIs(self.user.is_active, True)
+        # The code can't be used again
+        self.assertIs(codes.check_if_verification_code_exists(code), False)
+
+    def test_expired_stateless_verification_code(self):
+        code = codes.issue_verification_code(self.user)
+        expired_at = time() + (
+            settings.EMAIL_VERIFICATION_CODE_LIFETIME +
+            settings.EMAIL_VERIFICATION_CODE_WINDOW).total_seconds()
+
+        with patch("verification.services.codes.time",
+                   return_value=expired_at):
+            self.assertIs(codes.check_if_verification_code_exists(code),
+                          False)
+            with self.assertRaises(VerificationCode.DoesNotExist):
+                codes.verify_email_by_code(code)
+
+    def test_invalid_stateless_verification_codes(self):
+        code = codes.issue_verification_code(self.user)
+        other_user = self.UserModel.objects.create_user(
+            login="OtherUser", email="other@gmail.com", password="pass",
+            is_active=False)
+
+        for invalid_code in (code[:-1] + ("A" if code[-1] != "A" else "B"),
+                             f"{other_user.id}{code[code.index('-'):]}",
+                             "0-AAAAAAAA"):
+            with self.subTest(invalid_code):
+                self.assertIs(
+                    codes.check_if_verification_code_exists(invalid_code),
+                    False)
+
+        self.user.email = "changed@gmail.com"
+        self.user.save()
+        self.assertIs(codes.check_if_verification_code_exists(code), False)
+
+    def test_stored_code_is_accepted(self):
+        code = codes.create_verification_code(self.user).code
+
+        self.assertIs(codes.check_if_verification_code_exists(code), True)
+        codes.verify_email_by_code(code)
+
+        self.assertFalse(VerificationCode.objects.exists())
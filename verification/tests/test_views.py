@@ -88,3 +88,19 @@ class EmailVerificationAPIViewTestCase(APIViewTestCase):
             messages=["Verification code is invalid or expired"],
             fields_errors_dict_len=1
         )
+
+    def test_email_verification_with_too_large_user_id(self):
+        """
+        A code with an user id out of the integer range
+        should return a 400 error
+        """
+        payload = {
+            "code": "99999999999999999999999-AAAA"
+        }
+        response = self.client.post(self.url, payload)
+
+        self.client_error_response_test(
+            response,
+            messages=["Verification code is invalid or expired"],
+            fields_errors_dict_len=1
+        )
@@ -6,7 +6,7 @@ from utils.exceptions import Forbidden403
 from utils.shortcuts import raise_400_based_on_serializer
 
 from .serializers import VerificationCodeSerializer
-from .services.codes import remove_expired_codes, verify_email_by_code
+from .services.codes import verify_email_by_code
 
 
 class EmailVerificationAPIView(APIView):
@@ -18,7 +18,6 @@ class EmailVerificationAPIView(APIView):
         if request.user.is_authenticated:
             raise Forbidden403("You are already authenticated")
 
-        remove_expired_codes()
         serializer = VerificationCodeSerializer(data=request.data)
 
         if serializer.is_valid():